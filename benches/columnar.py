@@ -0,0 +1,77 @@
+import sys
+import resource
+import multiprocessing
+
+from util.util import transpose
+
+"""
+Benchmark: peak memory of the list-of-ZR dataset vs. a ColumnarTable.
+
+Each representation is built and set up (main.setup: column commitments, ESA
+accumulators and the committed inverted index) in a fresh process, after the
+keys are generated. The peak RSS growth is reported after building the
+dataset and after setup (the list variant holds dataset, transposed dataset
+and their ZR copies as main.run does; the columnar variant holds the integer
+arrays and releases its ZR columns once they are committed).
+
+Usage: python -m benches.columnar [n_row] [n_col]   (default: 10000 10)
+"""
+
+
+def _peak_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _keys(n_row: int):
+    import main
+    from charm.toolbox.pairinggroup import ZR
+    from util.util import group
+
+    # No aggregation is proven here, so any ESA minimum will do.
+    return main.generate_keys(n_row, group.init(ZR, 1))
+
+
+def _lists(n_col: int, n_row: int, result) -> None:
+    import main
+
+    sk, pk = _keys(n_row)
+    before = _peak_kb()
+    dataset_int = main.init_dataset(n_col, n_row)
+    transposed_dataset_int = transpose(dataset_int)
+    dataset = main.init_dataset_as_ZR(dataset_int)
+    transposed_dataset = transpose(dataset)
+    build = _peak_kb() - before
+    main.setup(sk, pk, transposed_dataset)
+    result.put((build, _peak_kb() - before))
+
+
+def _columnar(n_col: int, n_row: int, result) -> None:
+    import main
+    from table.columnar import ColumnarTable
+
+    sk, pk = _keys(n_row)
+    before = _peak_kb()
+    table = ColumnarTable.random(n_col, n_row)
+    build = _peak_kb() - before
+    main.setup(sk, pk, table)
+    result.put((build, _peak_kb() - before))
+
+
+def bench(variant, n_col: int, n_row: int) -> tuple[int, int]:
+    """Peak RSS growth in KiB after building the dataset and after main.setup."""
+    result = multiprocessing.Queue()
+    process = multiprocessing.Process(target=variant, args=(n_col, n_row, result))
+    process.start()
+    peaks = result.get()
+    process.join()
+    return peaks
+
+
+if __name__ == "__main__":
+    n_row = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_col = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("Representation, N Row, N Col, Build Peak KiB, Setup Peak KiB", flush=True)
+    for name, variant in [("lists", _lists), ("columnar", _columnar)]:
+        build, setup = bench(variant, n_col, n_row)
+        print(f"{name}, {n_row}, {n_col}, {build}, {setup}", flush=True)
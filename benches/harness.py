@@ -0,0 +1,126 @@
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+"""
+Benchmark harness shared by benches.micro and benches.scenarios.
+
+- Case: a callable with details (such as proof sizes) stored next to its
+  statistics.
+- measure: times a callable with time.perf_counter after warmup calls, over
+  repeated rounds, and summarizes the samples (median, p95, mean, ...).
+- write/read: JSON result files with the environment and run parameters.
+- compare: flags cases whose median moved by more than a threshold between two
+  result files.
+"""
+
+DEFAULT_WARMUP = 1
+DEFAULT_ROUNDS = 5
+# Relative change of the median above which compare reports a regression.
+DEFAULT_THRESHOLD = 0.10
+
+
+class Case:
+    """Zero-argument benchmark callable with details written next to its statistics."""
+    def __init__(self, function, details: dict):
+        self.function = function
+        self.details = details
+
+    def __call__(self):
+        return self.function()
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """q-th percentile (0 <= q <= 100) of samples, nearest-rank method."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "rounds": len(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def measure(
+    function, warmup: int = DEFAULT_WARMUP, rounds: int = DEFAULT_ROUNDS
+) -> dict[str, float]:
+    """Statistics, in seconds, of `rounds` timed calls of function() after `warmup` calls."""
+    for _ in range(warmup):
+        function()
+
+    samples = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start_time)
+    return summarize(samples)
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write(path: str, results: dict[str, dict], parameters: dict) -> None:
+    """Save results (case name -> statistics) with the environment and parameters."""
+    with open(path, "w") as results_file:
+        json.dump(
+            {"environment": environment(), "parameters": parameters, "results": results},
+            results_file,
+            indent=4,
+        )
+
+
+def read(path: str) -> dict[str, dict]:
+    """Results (case name -> statistics) of a file written by write()."""
+    with open(path) as results_file:
+        return json.load(results_file)["results"]
+
+
+def compare(
+    baseline: dict[str, dict],
+    current: dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[tuple[str, float, float, float, str]]:
+    """Compare the medians of two result sets.
+
+    Returns (name, baseline median, current median, relative change, status)
+    for every case, status being "regression", "improvement", "ok", "new"
+    (only in current) or "missing" (only in baseline).
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            rows.append((name, baseline[name]["median"], math.nan, math.nan, "missing"))
+            continue
+        if name not in baseline:
+            rows.append((name, math.nan, current[name]["median"], math.nan, "new"))
+            continue
+
+        before, after = baseline[name]["median"], current[name]["median"]
+        change = (after - before) / before if before else 0.0
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, before, after, change, status))
+    return rows
@@ -0,0 +1,126 @@
+import random
+from charm.toolbox.pairinggroup import ZR
+
+import main
+from util.util import group, transpose
+from vector_commitments import pointproofs
+from set_accumulator import esa, ptt
+from inverted_index import inverted_index, query
+
+"""
+Microbenchmarks of the primitives, one case per operation.
+
+cases(size) builds the inputs of every case once (untimed) and returns
+callables that only run the measured operation:
+
+- pointproofs: commit, generate_proof, aggregate_proofs, verify_proof,
+  verify_aggregate_proofs over a size-long vector (OPENED positions);
+- esa: compute_accumulator and the COUNT/SUM/MIN proofs and checks;
+- ptt: compute_accumulator, ProductTree, generate_proof (with and without the
+  tree) and verify_proof for a size/10 subset;
+- inverted_index: build and build_committed over a size x N_COL table, and
+  an equality predicate evaluated with query.select and query.scan.
+"""
+
+# Positions covered by the aggregated PointProofs cases.
+OPENED = 64
+N_COL = 5
+
+
+def cases(size: int) -> dict[str, object]:
+    """Name -> zero-argument callable for every primitive, on inputs of `size` elements."""
+    vc_sk, vc_pk = pointproofs.generate_keys(size)
+    messages = [group.random(ZR) for _ in range(size)]
+    v_commit = pointproofs.commit(vc_pk.g1, messages, vc_sk.sk)
+    indexes = sorted(random.sample(range(size), min(OPENED, size)))
+    selected = [messages[i] for i in indexes]
+    openings = [
+        pointproofs.generate_proof(vc_pk.pk_g1, vc_sk.sk, v_commit, i, messages[i])
+        for i in indexes
+    ]
+    aggregated = pointproofs.aggregate_proofs(v_commit, selected, indexes, openings)
+    i = indexes[0]
+
+    dataset_int = main.init_dataset(N_COL, size)
+    column = [group.init(ZR, row[0]) for row in dataset_int]
+    min_value = min(column, key=int)
+    esa_sk, esa_pk = esa.generate_keys(min_value)
+    acc = esa.compute_accumulator(esa_sk.sk, column)
+    count_proof, count = esa.generate_count_proof(esa_pk.g2, esa_sk.sk, acc, column)
+    sum_proof, sum_proof_2, total = esa.generate_sum_proof(esa_pk.g2, esa_sk.sk, acc, column)
+    min_proof, _ = esa.generate_min_proof(esa_pk.g2, esa_sk.sk, acc, min_value)
+
+    ptt_sk, ptt_pk = ptt.generate_keys()
+    subset = messages[: max(1, size // 10)]
+    tree = ptt.ProductTree(ptt_sk.sk, messages)
+    acc_dataset = ptt.compute_accumulator(ptt_sk.sk, ptt_pk.g1, messages)
+    acc_subset = ptt.compute_accumulator(ptt_sk.sk, ptt_pk.g1, subset)
+    subset_proof = ptt.generate_proof(ptt_sk.sk, ptt_pk.g2, messages, subset, tree)
+
+    transposed_dataset = transpose(main.init_dataset_as_ZR(dataset_int))
+    table = transpose(transposed_dataset)
+    inv_index = inverted_index.build(transposed_dataset, N_COL, size)
+    predicate = [query.Eq(0, table[0][0])]
+
+    return {
+        "pointproofs.commit": lambda: pointproofs.commit(vc_pk.g1, messages, vc_sk.sk),
+        "pointproofs.generate_proof": lambda: pointproofs.generate_proof(
+            vc_pk.pk_g1, vc_sk.sk, v_commit, i, messages[i]
+        ),
+        "pointproofs.aggregate_proofs": lambda: pointproofs.aggregate_proofs(
+            v_commit, selected, indexes, openings
+        ),
+        "pointproofs.verify_proof": lambda: pointproofs.verify_proof(
+            vc_pk.g2, vc_pk.pk_g2, vc_pk.pk_gt, v_commit, messages[i], i, openings[0]
+        ),
+        "pointproofs.verify_aggregate_proofs": lambda: pointproofs.verify_aggregate_proofs(
+            vc_pk.g2, vc_pk.pk_g2, vc_pk.pk_gt, v_commit, selected, indexes, aggregated
+        ),
+        "esa.compute_accumulator": lambda: esa.compute_accumulator(esa_sk.sk, column),
+        "esa.generate_count_proof": lambda: esa.generate_count_proof(
+            esa_pk.g2, esa_sk.sk, acc, column
+        ),
+        "esa.verify_count_proof": lambda: esa.verify_count_proof(
+            esa_pk.g1, esa_pk.g2, esa_pk.pk_count, acc, count_proof, count
+        ),
+        "esa.generate_sum_proof": lambda: esa.generate_sum_proof(
+            esa_pk.g2, esa_sk.sk, acc, column
+        ),
+        "esa.verify_sum_proof": lambda: esa.verify_sum_proof(
+            esa_pk.g1,
+            esa_pk.g2,
+            esa_pk.pk_sum,
+            esa_pk.pk_count,
+            acc,
+            sum_proof,
+            sum_proof_2,
+            total,
+        ),
+        "esa.generate_min_proof": lambda: esa.generate_min_proof(
+            esa_pk.g2, esa_sk.sk, acc, min_value
+        ),
+        "esa.verify_min_proof": lambda: esa.verify_min_proof(
+            esa_pk.g1, esa_pk.g2, esa_pk.pk_min, esa_pk.pk_min_2, acc, min_proof
+        ),
+        "ptt.compute_accumulator": lambda: ptt.compute_accumulator(
+            ptt_sk.sk, ptt_pk.g1, messages
+        ),
+        "ptt.ProductTree": lambda: ptt.ProductTree(ptt_sk.sk, messages),
+        "ptt.generate_proof": lambda: ptt.generate_proof(
+            ptt_sk.sk, ptt_pk.g2, messages, subset
+        ),
+        "ptt.generate_proof[tree]": lambda: ptt.generate_proof(
+            ptt_sk.sk, ptt_pk.g2, messages, subset, tree
+        ),
+        "ptt.verify_proof": lambda: ptt.verify_proof(
+            ptt_pk.g2, subset_proof, acc_subset, acc_dataset
+        ),
+        "inverted_index.build": lambda: inverted_index.build(
+            transposed_dataset, N_COL, size
+        ),
+        "inverted_index.build_committed": lambda: inverted_index.build_committed(
+            vc_pk, vc_sk, inv_index, ptt_sk, ptt_pk
+        ),
+        "query.select": lambda: query.select(table, inv_index, predicate),
+        "query.scan": lambda: query.scan(table, predicate),
+    }
@@ -0,0 +1,42 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR, G1, G2
+
+from util.util import group
+from util.msm import multi_exp, naive_multi_exp
+
+"""
+Benchmark: Pippenger multi-exponentiation vs. the per-term exponentiation loop.
+
+Usage: python -m benches.msm [size ...]   (default: 1000 10000 100000)
+"""
+
+
+def bench(group_type, size: int) -> tuple[float, float]:
+    """Time naive_multi_exp and multi_exp on `size` random bases of group_type."""
+    bases = [group.random(group_type) for _ in range(size)]
+    scalars = [group.random(ZR) for _ in range(size)]
+
+    start_time = time.perf_counter()
+    expected = naive_multi_exp(bases, scalars)
+    naive_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result = multi_exp(bases, scalars)
+    msm_time = time.perf_counter() - start_time
+
+    assert result == expected
+    return naive_time, msm_time
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+    print("Group, Size, Naive, MSM, Speedup", flush=True)
+    for name, group_type in [("G1", G1), ("G2", G2)]:
+        for size in sizes:
+            naive_time, msm_time = bench(group_type, size)
+            print(
+                f"{name}, {size}, {naive_time}, {msm_time}, {naive_time / msm_time:.2f}",
+                flush=True,
+            )
@@ -0,0 +1,76 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR, G1, G2, pair
+
+from util.util import group
+from util.pairing import pairing_product
+from vector_commitments import pointproofs
+
+"""
+Benchmark: product of pairings with one final exponentiation vs. independent pairings.
+
+Usage: python -m benches.pairing [rounds]   (default: 20)
+"""
+
+
+def bench_product(k: int, rounds: int) -> tuple[float, float]:
+    """Average time of ∏ e(a_i, b_i) for k pairs, pairing by pairing and as one product."""
+    lhs = [group.random(G1) for _ in range(k)]
+    rhs = [group.random(G2) for _ in range(k)]
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        expected = pair(lhs[0], rhs[0])
+        for a, b in zip(lhs[1:], rhs[1:]):
+            expected = expected * pair(a, b)
+    separate_time = (time.perf_counter() - start_time) / rounds
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        result = pairing_product(lhs, rhs)
+    product_time = (time.perf_counter() - start_time) / rounds
+
+    assert result == expected
+    return separate_time, product_time
+
+
+def bench_verify_proof(rounds: int) -> tuple[float, float]:
+    """Average time of pointproofs.verify_proof in its former and current form."""
+    messages = [group.random(ZR) for _ in range(4)]
+    sk, pk = pointproofs.generate_keys(len(messages))
+    v_commit = pointproofs.commit(pk.g1, messages, sk.sk)
+    proof = pointproofs.generate_proof(pk.pk_g1, sk.sk, v_commit, 1, messages[1])
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        assert pair(v_commit, pk.pk_g2[len(pk.pk_g2) - 2]) == pair(proof, pk.g2) * (
+            pk.pk_gt ** messages[1]
+        )
+    separate_time = (time.perf_counter() - start_time) / rounds
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        assert pointproofs.verify_proof(
+            pk.g2, pk.pk_g2, pk.pk_gt, v_commit, messages[1], 1, proof
+        )
+    product_time = (time.perf_counter() - start_time) / rounds
+
+    return separate_time, product_time
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print("Case, Separate, Product, Speedup", flush=True)
+    for k in [2, 3, 4, 8, 16]:
+        separate_time, product_time = bench_product(k, rounds)
+        print(
+            f"{k} pairings, {separate_time}, {product_time}, {separate_time / product_time:.2f}",
+            flush=True,
+        )
+
+    separate_time, product_time = bench_verify_proof(rounds)
+    print(
+        f"verify_proof, {separate_time}, {product_time}, {separate_time / product_time:.2f}",
+        flush=True,
+    )
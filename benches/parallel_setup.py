@@ -0,0 +1,38 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group, transpose
+from util import parallel
+from main import init_dataset, init_dataset_as_ZR, generate_keys, setup
+
+"""
+Benchmark: scaling of key generation and setup with the number of worker processes.
+
+Usage: python -m benches.parallel_setup [n_row] [n_col]   (default: 10000 10)
+"""
+
+
+if __name__ == "__main__":
+    n_row = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_col = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    dataset_int = init_dataset(n_col, n_row)
+    min_value = group.init(ZR, min(transpose(dataset_int)[0]))
+    transposed_dataset = transpose(init_dataset_as_ZR(dataset_int))
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= parallel.default_workers():
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print("Workers, Keygen, Setup", flush=True)
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        sk, pk = generate_keys(n_row, min_value, workers=workers)
+        keygen_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        setup(sk, pk, transposed_dataset, workers)
+        setup_time = time.perf_counter() - start_time
+
+        print(f"{workers}, {keygen_time}, {setup_time}", flush=True)
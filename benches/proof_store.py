@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import random
+import tempfile
+from charm.toolbox.pairinggroup import ZR
+
+import main
+from util.util import group, transpose
+from prover import prover, proof_store
+
+"""
+Benchmark: query-time proving with on-demand openings vs. a precomputed proof store.
+
+One table is committed; the store is written once (its cost is reported as
+setup), then random queries of each answer size are proven both ways
+(correctness in POINT mode and completeness) and the proofs are compared.
+
+Usage: python -m benches.proof_store [n_row] [n_col] [workers]   (default: 1000 5 1)
+"""
+
+
+def prove(sk, pk, vc_cols, committed_index, answer, store=None):
+    answer_inv_index, answer_indexes, transposed_answer = main.answer_index(answer)
+    correctness = prover.prove_correctness(
+        vc_pk=pk.vc_pk,
+        vc_sk=sk.vc_sk,
+        vc_cols=vc_cols,
+        transposed_answer=transposed_answer,
+        answer_indexes=answer_indexes,
+        cache=store,
+    )
+    completeness = prover.prove_completeness(
+        ptt_sk=sk.ptt_sk,
+        ptt_pk=pk.ptt_pk,
+        vc_sk=sk.vc_sk,
+        vc_pk=pk.vc_pk,
+        verified_inverted_index=committed_index,
+        answer_inverted_index=answer_inv_index,
+        store=store,
+    )
+    return correctness, completeness
+
+
+def timed(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    n_row = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    n_col = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    dataset = main.init_dataset_as_ZR(main.init_dataset(n_col, n_row))
+    transposed_dataset = transpose(dataset)
+    min_value = min(int(value) for value in transposed_dataset[0])
+    sk, pk = main.generate_keys(n_row, group.init(ZR, min_value), workers=workers)
+    vc_cols, _, committed_index, _ = main.setup(sk, pk, transposed_dataset, workers)
+
+    path = os.path.join(tempfile.mkdtemp(), "proofs.bin")
+    _, write_time = timed(
+        proof_store.write,
+        path,
+        pk.vc_pk,
+        sk.vc_sk,
+        vc_cols,
+        transposed_dataset,
+        committed_index,
+        workers,
+    )
+    store = proof_store.ProofStore(path, vc_cols, committed_index)
+    print(f"Proof store: {os.path.getsize(path)} bytes written in {write_time}s", flush=True)
+
+    print("N Row, N Filtered Row, On Demand, Store, Speedup", flush=True)
+    for answer_size in sorted({max(1, n_row // 100), max(1, n_row // 10), n_row // 3}):
+        rows = random.sample(range(n_row), answer_size)
+        answer = [[i] + dataset[i] for i in rows]
+
+        expected, on_demand_time = timed(prove, sk, pk, vc_cols, committed_index, answer)
+        result, store_time = timed(prove, sk, pk, vc_cols, committed_index, answer, store)
+        assert result[0] == expected[0]
+        assert all(
+            result[1][key]["proofs_2"] == expected[1][key]["proofs_2"] for key in expected[1]
+        )
+        print(
+            f"{n_row}, {answer_size}, {on_demand_time}, {store_time}, {on_demand_time / store_time:.2f}",
+            flush=True,
+        )
+    store.close()
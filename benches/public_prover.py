@@ -0,0 +1,56 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group
+from vector_commitments import pointproofs
+
+"""
+Benchmark: opening every position of a column from the public parameters.
+
+Compares the amortized PublicProver.open_all (FFT over G1) with one
+multi-exponentiation per row (PublicProver.open, timed on a sample of rows
+and extrapolated to the whole column) and with the secret-key openings.
+
+Usage: python -m benches.public_prover [size ...]   (default: 1000 10000)
+"""
+
+# Rows opened one by one to estimate the per-row MSM cost.
+SAMPLE_ROWS = 10
+
+
+def bench(size: int) -> tuple[float, float, float]:
+    """Seconds to open all `size` positions: secret key, per-row MSM, open_all."""
+    sk, pk = pointproofs.generate_keys(size)
+    messages = [group.random(ZR) for _ in range(size)]
+    v_commit = pointproofs.commit(pk.g1, messages, sk.sk)
+    public = pointproofs.PublicProver(pk, size)
+
+    start_time = time.perf_counter()
+    expected = [
+        pointproofs.generate_proof(pk.pk_g1, sk.sk, v_commit, i, message)
+        for i, message in enumerate(messages)
+    ]
+    sk_time = time.perf_counter() - start_time
+
+    sample = range(0, size, max(1, size // SAMPLE_ROWS))
+    start_time = time.perf_counter()
+    for i in sample:
+        assert public.open(messages, i) == expected[i]
+    msm_time = (time.perf_counter() - start_time) * size / len(sample)
+
+    start_time = time.perf_counter()
+    openings = public.open_all(messages)
+    all_time = time.perf_counter() - start_time
+
+    assert openings == expected
+    return sk_time, msm_time, all_time
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+
+    print("Size, Secret Key, Per-Row MSM (est.), All Openings", flush=True)
+    for size in sizes:
+        sk_time, msm_time, all_time = bench(size)
+        print(f"{size}, {sk_time}, {msm_time}, {all_time}", flush=True)
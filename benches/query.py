@@ -0,0 +1,62 @@
+import random
+import sys
+import time
+
+import main
+from util.util import transpose
+from inverted_index import inverted_index, query
+
+"""
+Benchmark: equality and IN predicates through the inverted index against a
+linear scan of the table.
+
+For each size, a size x N_COL table and its inverted index are built (untimed);
+every predicate is then evaluated with query.select and query.scan, which must
+return the same answer.
+
+Usage: python -m benches.query [size ...]   (default: 1000 10000 100000)
+"""
+
+N_COL = 5
+# Values listed by the IN predicate.
+IN_VALUES = 10
+
+
+def predicates(dataset: list[list], n_row: int) -> dict[str, list]:
+    """Name -> conjunction of predicates over values present in the table."""
+    row = dataset[random.randrange(n_row)]
+    sampled = [dataset[i][1] for i in random.sample(range(n_row), IN_VALUES)]
+    return {
+        "eq": [query.Eq(0, row[0])],
+        "in": [query.In(1, tuple(sampled))],
+        "eq_and_eq": [query.Eq(0, row[0]), query.Eq(2, row[2])],
+    }
+
+
+def timed(function, *args) -> tuple[float, object]:
+    start_time = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start_time, result
+
+
+def bench(size: int) -> list[tuple[str, int, float, float]]:
+    """(predicate, matched rows, index seconds, scan seconds) per predicate."""
+    dataset = main.init_dataset_as_ZR(main.init_dataset(N_COL, size))
+    inv_index = inverted_index.build(transpose(dataset), N_COL, size)
+
+    rows = []
+    for name, conjunction in predicates(dataset, size).items():
+        index_time, answer = timed(query.select, dataset, inv_index, conjunction)
+        scan_time, expected = timed(query.scan, dataset, conjunction)
+        assert answer == expected
+        rows.append((name, len(answer[0]), index_time, scan_time))
+    return rows
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+    print("Size, Predicate, Matched Rows, Index, Scan", flush=True)
+    for size in sizes:
+        for name, matched, index_time, scan_time in bench(size):
+            print(f"{size}, {name}, {matched}, {index_time}, {scan_time}", flush=True)
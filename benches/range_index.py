@@ -0,0 +1,90 @@
+import random
+import sys
+import time
+
+import main
+from util import wire
+from util.util import ProverMode
+from vector_commitments import pointproofs
+from inverted_index import sorted_index
+from prover import prover
+from verifier import verifier
+from benches import scenarios
+
+"""
+Benchmark: range predicates answered and proven with the sorted committed index.
+
+For each table size one column is indexed and committed (Build); ranges are
+then chosen to return the fractions of the rows the filtered scenarios of
+benches.scenarios use (n/1000, n/100, n/10, n/3), and for each we time the bisection lookup
+against a linear scan of the column, the range proof and its verification,
+and report the encoded proof size.
+
+Usage: python -m benches.range_index [size ...]   (default: 1000 10000 100000)
+"""
+
+SELECTIVITIES = [1 / divisor for divisor in scenarios.FILTERED_DIVISORS]
+
+
+def timed(function, *args) -> tuple[float, object]:
+    start_time = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start_time, result
+
+
+def bench(size: int, mode: ProverMode = ProverMode.POINT) -> list[tuple]:
+    """(selectivity, rows, build, lookup, scan, prove, verify, bytes) per selectivity."""
+    values = [row[0] for row in main.init_dataset(1, size)]
+    vc_sk, vc_pk = pointproofs.generate_keys(size)
+    build_time, index = timed(sorted_index.build_committed, vc_pk, vc_sk, values, 0)
+
+    rows = []
+    for selectivity in SELECTIVITIES:
+        k = max(1, int(size * selectivity))
+        first = random.randrange(size - k + 1)
+        low, high = index.values[first], index.values[first + k - 1]
+
+        lookup_time, (start, stop) = timed(index.range, low, high)
+        scan_time, expected = timed(
+            lambda: [i for i, value in enumerate(values) if low <= value <= high]
+        )
+        answer_indexes = index.rows[start:stop]
+        assert sorted(answer_indexes) == expected
+
+        prove_time, proof = timed(prover.prove_range, vc_pk, vc_sk, index, low, high, mode)
+        verify_time, check = timed(
+            verifier.verify_range,
+            vc_pk,
+            index.commitment,
+            size,
+            low,
+            high,
+            answer_indexes,
+            proof,
+        )
+        assert check
+        rows.append(
+            (
+                selectivity,
+                len(answer_indexes),
+                build_time,
+                lookup_time,
+                scan_time,
+                prove_time,
+                verify_time,
+                len(wire.encode_range(proof)),
+            )
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+    print(
+        "Size, Selectivity, Rows, Build, Lookup, Scan, Prove Range, Verify Range, Bytes",
+        flush=True,
+    )
+    for size in sizes:
+        for row in bench(size):
+            print(", ".join(map(str, (size,) + row)), flush=True)
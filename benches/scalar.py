@@ -0,0 +1,65 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR, G1, G2
+
+from util.util import group, ScalarBackend
+from vector_commitments import pointproofs
+from set_accumulator import esa, ptt
+
+"""
+Benchmark: ZR vs. native-integer scalar reductions on one table column.
+
+Usage: python -m benches.scalar [size ...]   (default: 100000)
+"""
+
+
+def timed(function, **kwargs):
+    start_time = time.perf_counter()
+    result = function(**kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def bench(size: int) -> list[tuple[str, float, float]]:
+    """Time each bulk reduction with both backends on a `size`-element column."""
+    sk = group.random(ZR)
+    g1 = group.random(G1)
+    g2 = group.random(G2)
+    column = [group.random(ZR) for _ in range(size)]
+    values = [group.init(ZR, value) for value in range(1, size + 1)]
+    powers = [sk**i for i in range(1, size + 1)]
+    acc = esa.compute_accumulator(sk=sk, dataset=values)
+
+    cases = [
+        ("esa.compute_accumulator", esa.compute_accumulator, dict(sk=sk, dataset=values)),
+        (
+            "esa.generate_sum_proof",
+            esa.generate_sum_proof,
+            dict(g2=g2, sk=sk, acc=acc, dataset=values),
+        ),
+        ("pointproofs.commit", pointproofs.commit, dict(g1=g1, messages=column, sk=powers)),
+        (
+            "ptt.compute_accumulator",
+            ptt.compute_accumulator,
+            dict(sk=sk, g1=g1, dataset=column),
+        ),
+    ]
+
+    results = []
+    for name, function, kwargs in cases:
+        expected, zr_time = timed(function, backend=ScalarBackend.ZR, **kwargs)
+        result, native_time = timed(function, backend=ScalarBackend.NATIVE, **kwargs)
+        assert result == expected
+        results.append((name, zr_time, native_time))
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000]
+
+    print("Operation, Size, ZR, Native, Speedup", flush=True)
+    for size in sizes:
+        for name, zr_time, native_time in bench(size):
+            print(
+                f"{name}, {size}, {zr_time}, {native_time}, {zr_time / native_time:.2f}",
+                flush=True,
+            )
@@ -0,0 +1,209 @@
+import os
+import random
+import tempfile
+from charm.toolbox.pairinggroup import ZR
+
+import main
+from util.util import group, transpose, Aggregation, ProverMode
+from util import wire
+from prover import prover, proof_store
+from verifier import verifier
+from benches.harness import Case
+
+"""
+End-to-end scenarios: the query types main.run demonstrates, phase by phase.
+
+For every table size the keys, data and commitments are built once; each
+scenario (a query shape: the number of rows returned and the aggregation)
+then gets one case per phase, whose inputs are prepared outside the timed
+call. keygen and setup are measured once per size. With ProverMode.PUBLIC the
+provers get no PointProofs secret key and read the openings they cannot
+compute publicly from a proof store written (untimed) for each size.
+
+Only the selected cases are prepared: the table and its commitments are built
+when any case of the size is selected, a scenario's inputs when one of its
+phases is. Prove cases carry the wire-encoded size of their proof ("bytes").
+"""
+
+N_COL = 5
+
+# A filtered query returns n_row // divisor rows: the filtered_row sweep of
+# the original experiments (n/1000, n/100, n/10, n/3).
+FILTERED_DIVISORS = [1000, 100, 10, 3]
+
+
+def _scenario_name(aggregation: Aggregation) -> str:
+    return "select" if aggregation == Aggregation.NONE else aggregation.value
+
+
+# Query shape: (divisor of the rows returned, aggregation). Every aggregation,
+# NONE included, runs over the whole table (<name>_all) and over each
+# filtered fraction (<name>_where_<divisor>).
+SCENARIOS = {
+    f"{_scenario_name(aggregation)}_all": (1, aggregation) for aggregation in Aggregation
+}
+SCENARIOS.update(
+    {
+        f"{_scenario_name(aggregation)}_where_{divisor}": (divisor, aggregation)
+        for aggregation in Aggregation
+        for divisor in FILTERED_DIVISORS
+    }
+)
+
+
+def _phases(n_row: int, divisor: int, aggregation: Aggregation) -> list[str]:
+    """Phases of a scenario on an n_row table, in the order main.run runs them."""
+    phases = []
+    # As in main.run, a full-table aggregation is not proven row by row.
+    if aggregation == Aggregation.NONE or max(1, n_row // divisor) != n_row:
+        phases += ["prove_correctness", "verify_correctness"]
+    if aggregation != Aggregation.NONE:
+        phases += ["prove_aggregation", "verify_aggregation"]
+    return phases + ["prove_completeness", "verify_completeness"]
+
+
+def _scenario_cases(
+    sk, pk, dataset, transposed_dataset, committed, divisor, aggregation, mode, store
+) -> dict[str, object]:
+    vc_cols, _, committed_index, esa_acc = committed
+    n_row = len(dataset)
+    filtered_row = max(1, n_row // divisor)
+    phases = _phases(n_row, divisor, aggregation)
+    answer = [[i] + dataset[i] for i in random.sample(range(n_row), filtered_row)]
+    answer_inv_index, answer_indexes, transposed_answer = main.answer_index(answer)
+    min_value = min(transposed_dataset[0], key=int)
+
+    vc_sk = None if mode == ProverMode.PUBLIC else sk.vc_sk
+
+    def prove_correctness():
+        return prover.prove_correctness(
+            pk.vc_pk,
+            vc_sk,
+            vc_cols,
+            transposed_answer,
+            answer_indexes,
+            mode,
+            cache=store,
+            columns=transposed_dataset,
+        )
+
+    def prove_aggregation():
+        return prover.prove_aggr_correctness(
+            aggregation, pk.esa_pk, sk.esa_sk, esa_acc[0], transposed_dataset[0], min_value
+        )
+
+    def prove_completeness():
+        return prover.prove_completeness(
+            sk.ptt_sk,
+            pk.ptt_pk,
+            vc_sk,
+            pk.vc_pk,
+            committed_index,
+            answer_inv_index,
+            store=store,
+            mode=mode,
+        )
+
+    cases = {}
+    if "prove_correctness" in phases:
+        correctness = prove_correctness()
+        cases["prove_correctness"] = Case(
+            prove_correctness, {"bytes": len(wire.encode_correctness(correctness))}
+        )
+        cases["verify_correctness"] = lambda: verifier.verify_correctness(
+            pk.vc_pk, vc_cols, transposed_answer, answer_indexes, correctness
+        )
+    if "prove_aggregation" in phases:
+        proof, proof_2, value = prove_aggregation()
+        cases["prove_aggregation"] = Case(
+            prove_aggregation,
+            {"bytes": len(wire.encode_aggregation(aggregation, [proof, proof_2], value))},
+        )
+        cases["verify_aggregation"] = lambda: verifier.verify_aggr_correctness(
+            aggregation, pk.esa_pk, esa_acc[0], [proof, proof_2], value
+        )
+    completeness = prove_completeness()
+    cases["prove_completeness"] = Case(
+        prove_completeness, {"bytes": len(wire.encode_completeness(completeness))}
+    )
+    cases["verify_completeness"] = lambda: verifier.verify_completeness(
+        pk.vc_pk, committed_index, answer_inv_index, completeness
+    )
+    return cases
+
+def _proof_store(sk, pk, transposed_dataset, committed) -> proof_store.ProofStore:
+    """PUBLIC-mode proof store of the committed table, mapped from an unlinked file."""
+    vc_cols, _, committed_index, _ = committed
+    handle, path = tempfile.mkstemp(suffix=".bin")
+    os.close(handle)
+    try:
+        proof_store.write(
+            path,
+            pk.vc_pk,
+            sk.vc_sk,
+            vc_cols,
+            transposed_dataset,
+            committed_index,
+            mode=ProverMode.PUBLIC,
+        )
+        return proof_store.ProofStore(path, vc_cols, committed_index)
+    finally:
+        os.unlink(path)
+
+
+def cases(
+    size: int, mode: ProverMode = ProverMode.POINT, selected=None
+) -> dict[str, object]:
+    """Name -> zero-argument callable for keygen, setup and every scenario phase.
+
+    selected(name), when given, picks the cases to prepare and return.
+    """
+    names = {"keygen": None, "setup": None}
+    for scenario, (divisor, aggregation) in SCENARIOS.items():
+        for phase in _phases(size, divisor, aggregation):
+            names[f"{scenario}/{phase}"] = scenario
+    names = {
+        name: scenario
+        for name, scenario in names.items()
+        if selected is None or selected(name)
+    }
+    if not names:
+        return {}
+
+    dataset_int = main.init_dataset(N_COL, size)
+    dataset = main.init_dataset_as_ZR(dataset_int)
+    transposed_dataset = transpose(dataset)
+    min_value = group.init(ZR, min(row[0] for row in dataset_int))
+
+    sk, pk = main.generate_keys(size, min_value)
+    result = {
+        "keygen": lambda: main.generate_keys(size, min_value),
+        "setup": lambda: main.setup(sk, pk, transposed_dataset),
+    }
+    scenarios = set(names.values()) - {None}
+    if not scenarios:
+        return {name: result[name] for name in names}
+
+    committed = main.setup(sk, pk, transposed_dataset)
+    store = None
+    if mode == ProverMode.PUBLIC:
+        store = _proof_store(sk, pk, transposed_dataset, committed)
+
+    for name in SCENARIOS:
+        if name not in scenarios:
+            continue
+        divisor, aggregation = SCENARIOS[name]
+        scenario = _scenario_cases(
+            sk,
+            pk,
+            dataset,
+            transposed_dataset,
+            committed,
+            divisor,
+            aggregation,
+            mode,
+            store,
+        )
+        for phase, function in scenario.items():
+            result[f"{name}/{phase}"] = function
+    return {name: result[name] for name in names}
@@ -0,0 +1,159 @@
+import sys
+import argparse
+
+from util.util import ProverMode
+from util import profiler
+from util.logger import Logger, PhaseRecorder
+from benches import harness
+
+"""
+Benchmark suite runner.
+
+    python -m benches.suite run [--suite micro scenarios] [--sizes 1000 10000]
+                                [--warmup 1] [--rounds 5] [--filter text]
+                                [--profile] [--track-memory] [--log]
+                                [--output results.json]
+    python -m benches.suite compare baseline.json results.json [--threshold 0.1]
+
+run measures every case of the selected suites (benches.micro,
+benches.scenarios) for each size and writes the statistics as JSON; cases are
+named "<suite>/<case>[n=<size>]". --filter is applied before the scenario
+inputs are prepared, so a filtered run only builds what it measures. Cases
+with details (the proof sizes of the scenario prove cases) store them next to
+their statistics; with --profile each case runs once more under util.profiler
+and its operation counters are stored as "counters", and with --track-memory
+it runs once under util.logger.PhaseRecorder(memory=True) and its tracemalloc
+and RSS peaks are stored as "memory". --log also appends one record per case
+to results.jsonl in a util.logger.Logger run directory. compare prints the change of every median and
+exits with status 1 if any case regressed by more than the threshold.
+"""
+
+SUITES = ["micro", "scenarios"]
+
+
+def suite_cases(
+    suite: str, size: int, mode: ProverMode, selected=None
+) -> dict[str, object]:
+    if suite == "micro":
+        from benches import micro
+
+        return micro.cases(size)
+
+    from benches import scenarios
+
+    return scenarios.cases(size, mode, selected)
+
+
+def profile(function, name: str) -> dict[str, float]:
+    """Operation counters of one call of function (util.profiler)."""
+    profiler.enable()
+    profiler.reset()
+    try:
+        with profiler.phase(name):
+            function()
+    finally:
+        profiler.disable()
+    return profiler.counters()[name]
+
+
+def track_memory(function, name: str) -> dict[str, float]:
+    """Time and tracemalloc/RSS peaks of one call of function (PhaseRecorder)."""
+    phases = PhaseRecorder(memory=True)
+    try:
+        phases.start(name)
+        function()
+        phases.stop()
+    finally:
+        phases.close()
+    return phases.results[name]
+
+
+def run(args) -> dict[str, dict]:
+    results = {}
+    logger = Logger() if args.log else None
+    for suite in args.suite:
+        for size in args.sizes:
+
+            def name_of(case: str) -> str:
+                return f"{suite}/{case}[n={size}]"
+
+            def selected(case: str) -> bool:
+                return not args.filter or args.filter in name_of(case)
+
+            cases = suite_cases(suite, size, args.prover_mode, selected)
+            for case, function in cases.items():
+                if not selected(case):
+                    continue
+                name = name_of(case)
+                results[name] = harness.measure(function, args.warmup, args.rounds)
+                results[name].update(getattr(function, "details", {}))
+                if args.profile:
+                    results[name]["counters"] = profile(function, case)
+                if args.track_memory:
+                    results[name]["memory"] = track_memory(function, case)
+                if logger is not None:
+                    logger.log_record(
+                        {"suite": suite, "case": case, "size": size, **results[name]}
+                    )
+                print(
+                    f"{name}, {results[name]['median']}, {results[name]['p95']}",
+                    flush=True,
+                )
+            if logger is not None:
+                logger.flush()
+    return results
+
+
+def compare(args) -> int:
+    rows = harness.compare(
+        harness.read(args.baseline), harness.read(args.current), args.threshold
+    )
+    print("Case, Baseline Median, Current Median, Change, Status", flush=True)
+    for name, before, after, change, status in rows:
+        print(f"{name}, {before}, {after}, {change:+.2%}, {status}", flush=True)
+    return 1 if any(row[-1] == "regression" for row in rows) else 0
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run or compare benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure the benchmark cases")
+    run_parser.add_argument("--suite", nargs="+", choices=SUITES, default=SUITES)
+    run_parser.add_argument("--sizes", nargs="+", type=int, default=[1_000])
+    run_parser.add_argument("--warmup", type=int, default=harness.DEFAULT_WARMUP)
+    run_parser.add_argument("--rounds", type=int, default=harness.DEFAULT_ROUNDS)
+    run_parser.add_argument("--filter", default=None, help="only cases containing this text")
+    run_parser.add_argument("--prover-mode", type=ProverMode, default=ProverMode.POINT)
+    run_parser.add_argument(
+        "--profile", action="store_true", help="store operation counters per case"
+    )
+    run_parser.add_argument(
+        "--track-memory", action="store_true", help="store memory peaks per case"
+    )
+    run_parser.add_argument(
+        "--log", action="store_true", help="also log one record per case (util.logger)"
+    )
+    run_parser.add_argument("--output", default="results.json")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare(args)
+
+    print("Case, Median, P95", flush=True)
+    results = run(args)
+    parameters = {
+        key: value for key, value in vars(args).items() if key not in ("command", "output")
+    }
+    harness.write(args.output, results, parameters)
+    print(f"Results written to {args.output}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import sys
+import time
+from charm.toolbox.pairinggroup import ZR
+
+import main
+from util.util import group
+from ingest import tpch
+
+"""
+Benchmark: streaming commitment of a TPC-H table from its .tbl file.
+
+Usage: python -m benches.tpch_ingest <table> <path/to/table.tbl> [key_path] [column ...]
+The listed columns are indexed (default: tpch.DEFAULT_INDEX_COLUMNS); pass
+"" as key_path to skip the key store.
+"""
+
+
+if __name__ == "__main__":
+    table, path = sys.argv[1], sys.argv[2]
+    key_path = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] else None
+    index_columns = sys.argv[4:] or None
+
+    start_time = time.time()
+    n_row = tpch.count_rows(path)
+    # Column keys cover the rows, index keys the distinct indexed values.
+    n_keys = tpch.count_index_keys(table, path, index_columns)
+    sk, pk = main.generate_keys(n_row, group.init(ZR, 0), key_path=key_path)
+    sk.index_sk, pk.index_pk = main.generate_index_keys(n_keys)
+    keys_time = time.time() - start_time
+
+    start_time = time.time()
+    ingested = tpch.ingest(table, path, sk, pk, index_columns=index_columns)
+    ingest_time = time.time() - start_time
+
+    print("Table, N Row, N Col, N Index Keys, Keys, Ingest", flush=True)
+    print(
+        f"{table}, {n_row}, {len(ingested.columns)}, {n_keys}, {keys_time}, {ingest_time}"
+    )
@@ -0,0 +1 @@
+from .tpch import *
@@ -0,0 +1,259 @@
+import os
+import re
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from collections import defaultdict
+from charm.toolbox.pairinggroup import ZR, G1
+
+from util.util import group, encode_pair, ScalarBackend
+from vector_commitments import pointproofs
+from set_accumulator import esa
+from inverted_index import inverted_index
+
+"""
+Streaming loader for the TPC-H .tbl files produced by data/generate_data.sh.
+
+- parse_schema: column names and types from data/schema.sql (the *_dummy
+  columns, which absorb the trailing '|' of every .tbl line, are dropped).
+- encode: one .tbl field as a non-negative integer, offset by the lower
+  bound of its type so that the order of values is kept (INT from -2^31,
+  DECIMAL(p,s) scaled by 10^s from -(10^p - 1), DATE as days since
+  0001-01-01, CHAR/VARCHAR hashed to ZR).
+- read_chunks: column-major chunks of encoded rows.
+- count_index_keys: number of distinct indexed values, i.e. committed-index
+  positions, counted in a pass over the file before the keys are generated.
+- ingest: column commitments, ESA accumulators and the inverted index fed one
+  chunk at a time, so only a chunk of the table is held as Python objects.
+"""
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "schema.sql")
+DEFAULT_CHUNK_SIZE = 10_000
+INT_MIN = -(2**31)
+
+# Low-cardinality columns the TPC-H queries filter on; ingest() indexes these
+# unless told otherwise, since every indexed cell keeps a posting in memory.
+DEFAULT_INDEX_COLUMNS = {
+    "nation": ["n_regionkey"],
+    "region": ["r_name"],
+    "supplier": ["s_nationkey"],
+    "customer": ["c_nationkey", "c_mktsegment"],
+    "part": ["p_brand", "p_size", "p_container"],
+    "partsupp": ["ps_suppkey"],
+    "orders": ["o_orderstatus", "o_orderpriority"],
+    "lineitem": ["l_returnflag", "l_linestatus", "l_shipmode"],
+}
+
+_TABLE = re.compile(r'CREATE TABLE IF NOT EXISTS "(\w+)"\s*\((.*?)\);', re.S)
+_COLUMN = re.compile(r'^\s*"(\w+)"\s+(\w+)(?:\((\d+)(?:,(\d+))?\))?', re.M)
+
+
+class Column:
+    """A schema column: name, SQL type and (for DECIMAL) precision and scale."""
+    def __init__(self, name: str, type: str, scale: int = 0, precision: int = 0):
+        self.name = name
+        self.type = type
+        self.scale = scale
+        self.precision = precision
+
+
+class IngestedTable:
+    """Authenticated structures built by ingest() for one table.
+
+    min_values holds the encoded minimum of every column, needed to generate
+    ESA keys for MIN proofs. inv_index and committed_index cover only the
+    indexed columns and are None when no column is indexed.
+    """
+    def __init__(
+        self,
+        columns: list[Column],
+        n_row: int,
+        vc_cols: list[G1],
+        esa_acc: list[ZR],
+        min_values: list[int],
+        inv_index: dict[ZR, list[int]],
+        committed_index: inverted_index.CommittedIndex,
+    ):
+        self.columns = columns
+        self.n_row = n_row
+        self.vc_cols = vc_cols
+        self.esa_acc = esa_acc
+        self.min_values = min_values
+        self.inv_index = inv_index
+        self.committed_index = committed_index
+
+
+def parse_schema(path: str = SCHEMA_PATH) -> dict[str, list[Column]]:
+    """Map each table of the schema to its (non-dummy) columns."""
+    with open(path) as schema_file:
+        schema = schema_file.read()
+
+    tables = {}
+    for table, body in _TABLE.findall(schema):
+        tables[table] = [
+            Column(name, type.upper(), int(scale or 0), int(precision or 0))
+            for name, type, precision, scale in _COLUMN.findall(body)
+            if not name.endswith("_dummy")
+        ]
+    return tables
+
+
+def encode(column: Column, field: str) -> int:
+    """Encode a .tbl field as a non-negative integer.
+
+    Numbers are shifted by the lower bound of their type rather than reduced
+    modulo the group order, so negative amounts (e.g. account balances) stay
+    below the positive ones and MIN/ESA proofs see small exponents.
+    """
+    if column.type == "INT":
+        return int(field) - INT_MIN
+    if column.type == "DECIMAL":
+        return int(Decimal(field).scaleb(column.scale)) + 10**column.precision - 1
+    if column.type == "DATE":
+        return (date.fromisoformat(field) - date.min).days
+    return int(group.hash(field, ZR))
+
+
+def count_rows(path: str) -> int:
+    """Number of lines in a .tbl file, counted without decoding it."""
+    with open(path, "rb") as tbl_file:
+        blocks = iter(lambda: tbl_file.read(1 << 20), b"")
+        return sum(block.count(b"\n") for block in blocks)
+
+
+def read_chunks(
+    path: str, columns: list[Column], chunk_size: int = DEFAULT_CHUNK_SIZE
+):
+    """Yield the encoded rows of a .tbl file as column-major chunks."""
+    with open(path) as tbl_file:
+        while True:
+            lines = list(islice(tbl_file, chunk_size))
+            if not lines:
+                return
+
+            rows = [line.rstrip("\n").split("|") for line in lines]
+            yield [
+                [encode(column, row[j]) for row in rows]
+                for j, column in enumerate(columns)
+            ]
+
+
+def indexed_columns(
+    columns: list[Column], index_columns: list[str]
+) -> list[int]:
+    """Positions of the columns named in index_columns."""
+    return [j for j, column in enumerate(columns) if column.name in index_columns]
+
+
+def count_index_keys(
+    table: str,
+    path: str,
+    index_columns: list[str] = None,
+    schema_path: str = SCHEMA_PATH,
+) -> int:
+    """Number of distinct values in the indexed columns of a .tbl file.
+
+    This is the number of positions of the committed index ingest() builds
+    with the same index_columns, so its keys can be sized before ingesting.
+    """
+    columns = parse_schema(schema_path)[table]
+    if index_columns is None:
+        index_columns = DEFAULT_INDEX_COLUMNS.get(table, [])
+    indexed = indexed_columns(columns, index_columns)
+
+    keys = set()
+    with open(path) as tbl_file:
+        for line in tbl_file:
+            row = line.rstrip("\n").split("|")
+            keys.update(encode(columns[j], row[j]) for j in indexed)
+    return len(keys)
+
+
+def ingest(
+    table: str,
+    path: str,
+    sk,
+    pk,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    index_columns: list[str] = None,
+    backend: ScalarBackend = ScalarBackend.NATIVE,
+    schema_path: str = SCHEMA_PATH,
+) -> IngestedTable:
+    """Commit a TPC-H table streamed from its .tbl file.
+
+    sk and pk are the main.SK / main.PK key bundles: the column keys
+    (vc_sk, vc_pk) must cover the number of rows (see count_rows), the index
+    keys (index_sk, index_pk) the number of distinct indexed values (see
+    count_index_keys). Each chunk contributes a partial commitment at its row
+    offset and a partial ESA accumulator, which are combined into the same
+    values main.setup computes on the whole columns. index_columns names the
+    columns of the inverted index (and its commitment), by default
+    DEFAULT_INDEX_COLUMNS[table]; every indexed cell keeps a posting in memory.
+    """
+    columns = parse_schema(schema_path)[table]
+    if index_columns is None:
+        index_columns = DEFAULT_INDEX_COLUMNS.get(table, [])
+    indexed = indexed_columns(columns, index_columns)
+
+    vc_cols = [None] * len(columns)
+    esa_acc = [group.init(ZR, 0)] * len(columns)
+    min_values = [None] * len(columns)
+    postings = defaultdict(list)
+
+    offset = 0
+    for chunk in read_chunks(path, columns, chunk_size):
+        n_chunk = len(chunk[0])
+        if offset + n_chunk > len(pk.vc_pk.pk_g2):
+            raise ValueError(
+                f"{table} has more rows than the vector length "
+                f"{len(pk.vc_pk.pk_g2)} of the PointProofs keys"
+            )
+        sk_chunk = sk.vc_sk.sk[offset : offset + n_chunk]
+
+        for j, values in enumerate(chunk):
+            messages = (
+                values
+                if backend == ScalarBackend.NATIVE
+                else [group.init(ZR, value) for value in values]
+            )
+            partial = pointproofs.commit(
+                g1=pk.vc_pk.g1, messages=messages, sk=sk_chunk, backend=backend
+            )
+            vc_cols[j] = partial if vc_cols[j] is None else vc_cols[j] * partial
+            esa_acc[j] = esa_acc[j] + esa.compute_accumulator(
+                sk=sk.esa_sk.sk, dataset=messages, backend=backend
+            )
+
+            chunk_min = min(values)
+            if min_values[j] is None or chunk_min < min_values[j]:
+                min_values[j] = chunk_min
+
+        # Same (column, row) posting encoding as main.setup.
+        for j in indexed:
+            for row, value in enumerate(chunk[j], start=offset):
+                postings[value].append(encode_pair(j, row))
+
+        offset += n_chunk
+
+    inv_index, committed_index = None, None
+    if indexed and postings:
+        if len(postings) > len(pk.index_pk.pk_g2):
+            raise ValueError(
+                f"{len(postings)} distinct indexed values exceed the vector "
+                f"length {len(pk.index_pk.pk_g2)} of the index keys"
+            )
+
+        inv_index = {group.init(ZR, value): posting for value, posting in postings.items()}
+        del postings
+        committed_index = inverted_index.build_committed(
+            vc_pk=pk.index_pk,
+            vc_sk=sk.index_sk,
+            inverted_index=inv_index,
+            ptt_sk=sk.ptt_sk,
+            ptt_pk=pk.ptt_pk,
+        )
+
+    return IngestedTable(
+        columns, offset, vc_cols, esa_acc, min_values, inv_index, committed_index
+    )
+
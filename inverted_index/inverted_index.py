@@ -1,17 +1,90 @@
 from collections import defaultdict
 from charm.toolbox.pairinggroup import ZR, G1
 
-from util.util import encode_pair, hash_to_ZR
+from util.util import group, encode_pair, hash_to_ZR
+from util import scalar
+from util.fixed_base import power
 
-from vector_commitments import pointproofs
+from vector_commitments import pointproofs, sharded
 from set_accumulator import ptt
 
 from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
+from vector_commitments.sharded import ShardedCommitment
 from set_accumulator.ptt import SK as PTT_SK, PK as PTT_PK
 
 
+class CommittedIndex:
+    """Top-level commitment to an inverted index, with the position of each key.
+
+    keys lists the index keys in commitment order; positions maps each key to
+    its position so provers and verifiers can look it up in O(1).
+    accumulators and messages keep, per position, the PTT accumulator of the
+    key's posting list and the committed hash of its [key, acc_hash] commitment,
+    so the index can be updated without recomputing it. trees keeps the PTT
+    ProductTree of each posting list, used for subset products and proofs.
+    commitment is a sharded.ShardedCommitment when the index was committed in
+    blocks (see locate).
+    """
+    def __init__(
+        self,
+        commitment: G1 | ShardedCommitment,
+        keys: list[ZR],
+        accumulators: list[G1] = None,
+        messages: list[ZR] = None,
+        trees: list[ptt.ProductTree] = None,
+    ):
+        self.commitment = commitment
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.accumulators = accumulators
+        self.messages = messages
+        self.trees = trees
+
+    def position(self, key: ZR) -> int:
+        """Position of key in the committed vector."""
+        return self.positions[key]
+
+    def locate(self, key: ZR) -> tuple[G1, int]:
+        """Commitment and position that open key: its block and offset when sharded."""
+        position = self.positions[key]
+        if isinstance(self.commitment, ShardedCommitment):
+            block, offset = self.commitment.locate(position)
+            return self.commitment.commits[block], offset
+        return self.commitment, position
+
+    def tree(self, key: ZR) -> ptt.ProductTree:
+        """Cached ProductTree of key's posting list, or None if there is none."""
+        position = self.positions.get(key)
+        if self.trees is None or position is None:
+            return None
+        return self.trees[position]
+
+    def append(
+        self, key: ZR, accumulator: G1, message: ZR, tree: ptt.ProductTree = None
+    ) -> int:
+        """Register a new key at the next free position and return the position."""
+        self.positions[key] = len(self.keys)
+        self.keys.append(key)
+        self.accumulators.append(accumulator)
+        self.messages.append(message)
+        if self.trees is not None:
+            self.trees.append(tree)
+        return self.positions[key]
+
+
 def build(data: list[list[ZR]], n_row: int, n_col: int) -> dict[ZR, list[int]]:
-    """Build an inverted index mapping value -> list of encoded (row, col) pairs."""
+    """Build an inverted index mapping value -> list of encoded (row, col) pairs.
+
+    data may also be a table.columnar.ColumnarTable (indexed as data[col][row]
+    by main.setup); its integer arrays are indexed directly and each distinct
+    value is converted to ZR once.
+    """
+    # Imported here: the table package imports this module.
+    from table.columnar import ColumnarTable
+
+    if isinstance(data, ColumnarTable):
+        return _build_columnar(data, n_row, n_col)
+
     inverted_index = defaultdict(list)
     for i in range(n_row):
         for j in range(n_col):
@@ -20,12 +93,28 @@ def build(data: list[list[ZR]], n_row: int, n_col: int) -> dict[ZR, list[int]]:
     return inverted_index
 
 
+def _build_columnar(table, n_row: int, n_col: int) -> dict[ZR, list[int]]:
+    postings = defaultdict(list)
+    for i in range(n_row):
+        for j, value in enumerate(table.array(i)[:n_col].tolist()):
+            postings[value].append(encode_pair(i, j))
+
+    inverted_index = defaultdict(list)
+    for value, posting in postings.items():
+        inverted_index[group.init(ZR, value)] = posting
+    return inverted_index
+
+
 def build_subset(subset: list[list[ZR]]) -> dict[ZR, list[int]]:
-    """Build the inverted index for a subset of rows (answer set)."""
+    """Build the inverted index for a subset of rows (answer set).
+
+    Postings use the (column, row) encoding main.setup gives the full index,
+    so each answer posting list is a subset of the committed one.
+    """
     subset_inverted_index = defaultdict(list)
     for row in subset:
         for idx, value in enumerate(row[1:]):
-            subset_inverted_index[value] += [encode_pair(row[0], idx)]
+            subset_inverted_index[value] += [encode_pair(idx, row[0])]
 
     return subset_inverted_index
 
@@ -36,14 +125,27 @@ def build_committed(
     inverted_index: dict[ZR, list[int]],
     ptt_sk: PTT_SK,
     ptt_pk: PTT_PK,
-) -> list[ZR]:
+    block_size: int = None,
+) -> CommittedIndex:
     """Commit to the inverted index: commit each [key, acc_hash], then commit the list.
 
-    Returns the top-level commitment to the list of per-key commitments.
+    Returns the top-level commitment to the list of per-key commitments,
+    together with the key order it was built with and the product tree of
+    every posting list (its root is the accumulator exponent). With
+    block_size the list is committed in blocks (sharded.commit), so the key
+    only has to cover one block rather than every index key.
     """
+    if len(vc_pk.pk_g2) < 2:
+        raise ValueError("the [key, acc_hash] pairs need a PointProofs key of length 2")
+
+    accs = []
+    trees = []
     vsa_pairs = []
     for key, value in inverted_index.items():
-        acc = ptt.compute_accumulator(sk=ptt_sk.sk, g1=ptt_pk.g1, dataset=value)
+        tree = ptt.ProductTree(ptt_sk.sk, value)
+        acc = power(ptt_pk.g1, scalar.to_ZR(tree.root()))
+        trees.append(tree)
+        accs.append(acc)
         vsa_pairs.append([key, hash_to_ZR(acc)])
 
     vsa_list = [
@@ -51,5 +153,8 @@ def build_committed(
         for pair in vsa_pairs
     ]
 
-    vsa = pointproofs.commit(g1=vc_pk.g1, messages=vsa_list, sk=vc_sk.sk)
-    return vsa
+    if block_size:
+        vsa = sharded.commit(vc_pk.g1, vsa_list, vc_sk.sk, block_size)
+    else:
+        vsa = pointproofs.commit(g1=vc_pk.g1, messages=vsa_list, sk=vc_sk.sk)
+    return CommittedIndex(vsa, list(inverted_index.keys()), accs, vsa_list, trees)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group, decode_pair
+
+"""
+Equality and IN predicates evaluated through the inverted index.
+
+The index built by inverted_index.build (as main.setup calls it) maps each
+value to the encode_pair(column, row) postings of the cells holding it, so a
+predicate only decodes the postings of the values it names instead of scanning
+the table. A conjunction intersects the row sets, smallest first.
+
+select returns the answer in main.query's format ([row] + values) together
+with answer_indexes and transposed_answer, as main.answer_index does; scan is
+the linear-scan baseline with the same result.
+"""
+
+
+@dataclass(frozen=True)
+class Eq:
+    """column = value"""
+    column: int
+    value: object
+
+
+@dataclass(frozen=True)
+class In:
+    """column IN (values)"""
+    column: int
+    values: tuple
+
+
+def _key(value) -> ZR:
+    return group.init(ZR, value) if isinstance(value, int) else value
+
+
+def _values(predicate) -> list:
+    if isinstance(predicate, Eq):
+        return [predicate.value]
+    return list(predicate.values)
+
+
+def matching_rows(inv_index: dict[ZR, list[int]], predicate) -> set[int]:
+    """Rows whose cell in predicate.column equals one of the predicate values."""
+    rows = set()
+    for key in {_key(value) for value in _values(predicate)}:
+        for posting in inv_index.get(key, ()):
+            column, row = decode_pair(posting)
+            if column == predicate.column:
+                rows.add(row)
+    return rows
+
+
+def evaluate(inv_index: dict[ZR, list[int]], predicates: list) -> list[int]:
+    """Sorted rows satisfying every predicate (a conjunction)."""
+    if not predicates:
+        raise ValueError("at least one predicate is needed to use the index")
+
+    row_sets = sorted((matching_rows(inv_index, p) for p in predicates), key=len)
+    rows = row_sets[0]
+    for other in row_sets[1:]:
+        rows &= other
+    return sorted(rows)
+
+
+def _columnar(dataset) -> bool:
+    # Imported here: the table package imports the inverted_index package.
+    from table.columnar import ColumnarTable
+
+    return isinstance(dataset, ColumnarTable)
+
+
+def _row(dataset, i: int) -> list[ZR]:
+    return dataset.row(i) if _columnar(dataset) else dataset[i]
+
+
+def _n_row(dataset) -> int:
+    return dataset.n_row if _columnar(dataset) else len(dataset)
+
+
+def build_answer(dataset, rows: list[int]):
+    """(answer, answer_indexes, transposed_answer) of the given rows, in order."""
+    answer = [[i] + _row(dataset, i) for i in rows]
+    if not answer:
+        return answer, [], []
+    answer_indexes = list(rows)
+    transposed_answer = [list(column) for column in zip(*(row[1:] for row in answer))]
+    return answer, answer_indexes, transposed_answer
+
+
+def select(dataset, inv_index: dict[ZR, list[int]], predicates: list):
+    """Evaluate the predicates with the index.
+
+    dataset is the row-major ZR table or a table.columnar.ColumnarTable.
+    Returns (answer, answer_indexes, transposed_answer).
+    """
+    return build_answer(dataset, evaluate(inv_index, predicates))
+
+
+def scan(dataset, predicates: list):
+    """Linear-scan baseline of select: checks every row against the predicates."""
+    accepted = [
+        (predicate.column, {_key(value) for value in _values(predicate)})
+        for predicate in predicates
+    ]
+    rows = [
+        i
+        for i in range(_n_row(dataset))
+        if all(_row(dataset, i)[column] in values for column, values in accepted)
+    ]
+    return build_answer(dataset, rows)
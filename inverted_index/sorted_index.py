@@ -0,0 +1,195 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from charm.toolbox.pairinggroup import ZR, G1
+
+from util.util import group
+from vector_commitments import pointproofs, sharded
+
+from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
+from vector_commitments.sharded import ShardedCommitment
+
+"""
+Sorted committed index of one column, for range predicates.
+
+The (value, row) cells of the column are sorted by value, then row, and each
+entry is committed as the scalar value * 2^ROW_BITS + row in one PointProofs
+vector. A range [low, high] is the contiguous run of entries found by bisection
+in O(log n), and its k rows are read off the entries. Values must stay below
+ORDER >> ROW_BITS, so that entries neither wrap around the group order nor
+lose their sort order.
+
+Since the data owner commits the entries in sorted order, opening the run
+together with the entry just before it (value < low) and the entry just after
+it (value > high) proves that no other row falls in the range: see
+prover.prove_range and verifier.verify_range.
+"""
+
+# Row ids are stored in the low bits of an entry.
+ROW_BITS = 32
+ORDER = group.order()
+
+
+@dataclass(frozen=True)
+class Range:
+    """low <= column <= high; a bound of None leaves that side open."""
+    column: int
+    low: int = None
+    high: int = None
+
+
+def encode_entry(value: int, row: int) -> int:
+    return (value << ROW_BITS) | row
+
+
+def decode_entry(entry: int) -> tuple[int, int]:
+    """(value, row) of an encoded entry."""
+    return entry >> ROW_BITS, entry & ((1 << ROW_BITS) - 1)
+
+
+class SortedIndex:
+    """Entries of one column in (value, row) order, with their commitment.
+
+    values and rows are the decoded entries, kept as plain integers so lookups
+    never touch ZR; messages are the committed entries. commitment is a
+    sharded.ShardedCommitment when the entries were committed in blocks.
+    """
+    def __init__(
+        self,
+        column: int,
+        values: list[int],
+        rows: list[int],
+        commitment: G1 | ShardedCommitment = None,
+    ):
+        self.column = column
+        self.values = values
+        self.rows = rows
+        self.messages = [
+            group.init(ZR, encode_entry(value, row)) for value, row in zip(values, rows)
+        ]
+        self.commitment = commitment
+
+    def __len__(self):
+        return len(self.values)
+
+    def range(self, low: int = None, high: int = None) -> tuple[int, int]:
+        """Positions [start, stop) of the entries with low <= value <= high."""
+        start = 0 if low is None else bisect_left(self.values, low)
+        stop = len(self.values) if high is None else bisect_right(self.values, high)
+        return start, max(start, stop)
+
+    def opened(self, start: int, stop: int) -> list[int]:
+        """Positions a range proof opens: the run plus its neighbouring entries."""
+        return list(range(max(start - 1, 0), min(stop + 1, len(self.values))))
+
+
+def build(column_values: list, column: int) -> SortedIndex:
+    """Sort the cells of column_values (ZR or integers) by value, then row.
+
+    Raises ValueError for values of ORDER >> ROW_BITS or more (e.g. hashed
+    strings), whose entries would wrap around the group order.
+    """
+    if len(column_values) >= 1 << ROW_BITS:
+        raise ValueError(f"a sorted index holds at most 2^{ROW_BITS} rows")
+
+    entries = sorted((int(value), row) for row, value in enumerate(column_values))
+    if entries and entries[-1][0] >= ORDER >> ROW_BITS:
+        raise ValueError(
+            f"column {column} holds a value of {ORDER >> ROW_BITS} or more, "
+            "which a sorted index entry cannot encode"
+        )
+    return SortedIndex(
+        column, [value for value, _ in entries], [row for _, row in entries]
+    )
+
+
+def build_committed(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    column_values: list,
+    column: int,
+    block_size: int = None,
+) -> SortedIndex:
+    """Build the sorted index of a column and commit to its entries.
+
+    With block_size the entries are committed in blocks (sharded.commit), as
+    main.setup commits the columns, so the key only covers one block.
+    """
+    index = build(column_values, column)
+    if block_size:
+        index.commitment = sharded.commit(vc_pk.g1, index.messages, vc_sk.sk, block_size)
+    else:
+        index.commitment = pointproofs.commit(
+            g1=vc_pk.g1, messages=index.messages, sk=vc_sk.sk
+        )
+    return index
+
+
+if __name__ == "__main__":
+    from prover import prover
+    from verifier import verifier
+
+    n = 16
+    vc_sk, vc_pk = pointproofs.generate_keys(n)
+    values = [(7 * row) % 5 + 1 for row in range(n)]
+    index = build_committed(vc_pk, vc_sk, values, 0)
+
+    def check(low, high, answer, proof) -> bool:
+        return verifier.verify_range(
+            vc_pk, index.commitment, n, low, high, answer, proof
+        )
+
+    def expected_rows(low, high) -> list[int]:
+        return [
+            row
+            for row, value in enumerate(values)
+            if (low is None or low <= value) and (high is None or value <= high)
+        ]
+
+    for low, high in [(2, 3), (None, 2), (4, None), (None, None), (6, 9), (3, 2)]:
+        proof = prover.prove_range(vc_pk, vc_sk, index, low, high)
+        assert check(low, high, expected_rows(low, high), proof)
+
+    low, high = 2, 3
+    proof = prover.prove_range(vc_pk, vc_sk, index, low, high)
+    start, stop = proof["start"], proof["stop"]
+    answer = index.rows[start:stop]
+    missing_row = next(row for row in range(n) if row not in answer)
+
+    # A row missing from the answer, or one that is not in the range.
+    assert not check(low, high, answer[1:], proof)
+    assert not check(low, high, answer + [missing_row], proof)
+
+    # Shifted start/stop: a matching entry is passed off as a boundary.
+    for shifted_start, shifted_stop in [(start + 1, stop), (start, stop - 1)]:
+        positions = index.opened(shifted_start, shifted_stop)
+        entries = [index.messages[i] for i in positions]
+        forged = {
+            "start": shifted_start,
+            "stop": shifted_stop,
+            "entries": entries,
+            "proof": pointproofs.generate_aggregate_proof(
+                vc_pk.g1, vc_sk.sk, index.commitment, entries, positions
+            ),
+        }
+        assert not check(low, high, index.rows[shifted_start:shifted_stop], forged)
+
+    # A boundary entry inside the range: the same proof for a wider range.
+    assert not check(index.values[start - 1], high, answer, proof)
+    assert not check(low, index.values[stop], answer, proof)
+
+    # Sharded entries: the run spans blocks of a key shorter than the column.
+    block_size = 4
+    block_sk, block_pk = pointproofs.generate_keys(block_size)
+    blocks = build_committed(block_pk, block_sk, values, 0, block_size)
+    proof = prover.prove_range(block_pk, block_sk, blocks, low, high)
+    assert verifier.verify_range(
+        block_pk, blocks.commitment, n, low, high, expected_rows(low, high), proof
+    )
+
+    # Values too large for an entry are rejected instead of wrapping.
+    try:
+        build([1, ORDER >> ROW_BITS], 0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an entry wrapped around the group order")
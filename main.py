@@ -1,18 +1,38 @@
+import os
+import sys
 import random
-import time
 from typing import TypedDict
 from charm.toolbox.pairinggroup import ZR
 
-from util.util import group, Aggregation, MAXINT, transpose
-from util.logger import Logger
-from vector_commitments import pointproofs
+from util.util import group, Aggregation, MAXINT, ProverMode, ScalarBackend, transpose
+from util.logger import Logger, PhaseRecorder
+from util import fixed_base, keystore, parallel, profiler, wire
+from table.columnar import ColumnarTable
+from vector_commitments import pointproofs, sharded
 from set_accumulator import ptt, esa
-from inverted_index import inverted_index
-from prover import prover
+from inverted_index import inverted_index, sorted_index, query as index_query
+from prover import prover, proof_store
 from verifier import verifier
 
 
-class Config(TypedDict):
+class ConfigOptions(TypedDict, total=False):
+    prover_mode: ProverMode
+    fixed_base_window: int
+    key_path: str
+    workers: int
+    batch_verify: bool
+    aggregate_columns: bool
+    scalar_backend: ScalarBackend
+    columnar: bool
+    block_size: int
+    proof_store: str
+    profile: bool
+    track_memory: bool
+    predicates: list
+    range_predicate: sorted_index.Range
+
+
+class Config(ConfigOptions):
     n_col: int
     n_row: int
     selected_column: int
@@ -21,17 +41,21 @@ class Config(TypedDict):
 
 
 class SK:
-    def __init__(self, ptt_sk, vc_sk, esa_sk):
+    def __init__(self, ptt_sk, vc_sk, esa_sk, index_sk=None):
         self.ptt_sk = ptt_sk
         self.vc_sk = vc_sk
         self.esa_sk = esa_sk
+        # PointProofs key of the committed inverted index (vc_sk unless given).
+        self.index_sk = index_sk or vc_sk
 
 
 class PK:
-    def __init__(self, ptt_pk, vc_pk, esa_pk):
+    def __init__(self, ptt_pk, vc_pk, esa_pk, index_pk=None):
         self.ptt_pk = ptt_pk
         self.vc_pk = vc_pk
         self.esa_pk = esa_pk
+        # PointProofs key of the committed inverted index (vc_pk unless given).
+        self.index_pk = index_pk or vc_pk
 
 
 def init_dataset(n_col, n_row):
@@ -46,15 +70,77 @@ def init_dataset_as_ZR(dataset: list[list[int]]) -> list[list["ZR"]]:
     return [[group.init(ZR, el) for el in row] for row in dataset]
 
 
-def generate_keys(n_row: int, min_value: ZR) -> tuple["SK", "PK"]:
+def generate_keys(
+    n_row: int,
+    min_value: ZR,
+    window: int = fixed_base.DEFAULT_WINDOW,
+    key_path: str = None,
+    workers: int = 1,
+) -> tuple["SK", "PK"]:
+    """Generate the keys of all schemes, or reopen them from a key store.
+
+    If key_path points to a key store of the current version whose PointProofs
+    parameters cover n_row, its keys are mapped lazily instead of regenerated
+    (ESA keys are regenerated only if they were made for a different minimum).
+    Freshly generated keys are written to key_path when it is given. With
+    workers > 1 the PointProofs key powers are computed on a process pool.
+    """
+    if key_path is not None and os.path.exists(key_path):
+        try:
+            store = keystore.KeyStore(key_path)
+        except ValueError:
+            store = None
+        if (
+            store is not None
+            and store.vector_length() >= n_row
+            and store.has_vc_sk()
+        ):
+            ptt_sk, ptt_pk = store.ptt_keys()
+            vc_sk, vc_pk = store.vc_keys()
+            if store.esa_min() == min_value:
+                esa_sk, esa_pk = store.esa_keys()
+            else:
+                esa_sk, esa_pk = esa.generate_keys(min_value)
+
+            return SK(ptt_sk, vc_sk, esa_sk), PK(ptt_pk, vc_pk, esa_pk)
+        if store is not None:
+            store.close()
+
     ptt_sk, ptt_pk = ptt.generate_keys()
-    vc_sk, vc_pk = pointproofs.generate_keys(N=n_row)
+    if workers > 1:
+        vc_sk, vc_pk = parallel.generate_vc_keys(N=n_row, window=window, workers=workers)
+    else:
+        vc_sk, vc_pk = pointproofs.generate_keys(N=n_row, window=window)
     esa_sk, esa_pk = esa.generate_keys(min_value)
 
+    if key_path is not None:
+        keystore.write(
+            key_path, ptt_sk, ptt_pk, vc_sk, vc_pk, esa_sk, esa_pk, min_value
+        )
+
     return SK(ptt_sk, vc_sk, esa_sk), PK(ptt_pk, vc_pk, esa_pk)
 
 
+def generate_index_keys(
+    n_keys: int, window: int = fixed_base.DEFAULT_WINDOW, workers: int = 1
+) -> tuple[pointproofs.SK, pointproofs.PK]:
+    """PointProofs keys for an index commitment of n_keys positions.
+
+    Used when the index has more keys than the column key has positions,
+    e.g. for the TPC-H ingest (benches.tpch_ingest). Index keys are also committed as [key, acc_hash] pairs, so the key
+    covers at least two positions.
+    """
+    N = max(2, n_keys)
+    if workers > 1:
+        return parallel.generate_vc_keys(N=N, window=window, workers=workers)
+    return pointproofs.generate_keys(N=N, window=window)
+
+
 def query(dataset, answer_size):
+    if isinstance(dataset, ColumnarTable):
+        rows = random.sample(range(dataset.n_row), answer_size)
+        return [[i] + dataset.row(i) for i in rows]
+
     answer = random.sample([[i] + dataset[i] for i in range(len(dataset))], answer_size)
     return answer
 
@@ -75,27 +161,83 @@ def answer_index(answer):
     )
 
 
-def setup(sk: SK, pk: PK, transposed_dataset: list[list[ZR]]):
+def column(
+    transposed_dataset: list[list[ZR]], j: int, backend: ScalarBackend = ScalarBackend.ZR
+):
+    """Column j in the form the scalar backend consumes.
+
+    transposed_dataset may be a ColumnarTable, whose integer arrays are used
+    as they are by the NATIVE backend.
+    """
+    if isinstance(transposed_dataset, ColumnarTable):
+        return transposed_dataset.values(j, backend)
+    return transposed_dataset[j]
+
+
+def setup(
+    sk: SK,
+    pk: PK,
+    transposed_dataset: list[list[ZR]],
+    workers: int = 1,
+    backend: ScalarBackend = ScalarBackend.ZR,
+    block_size: int = None,
+):
+    """Commit the columns and build the committed inverted index.
+
+    transposed_dataset is a list of ZR columns or a ColumnarTable. With
+    block_size, every column and the committed inverted index are committed
+    as sharded.ShardedCommitments under sk.vc_sk, a key of length block_size.
+    """
+    n_col = len(transposed_dataset)
+    n_row = len(column(transposed_dataset, 0, ScalarBackend.NATIVE))
+
     # Correctness
-    vc_cols = [
-        pointproofs.commit(g1=pk.vc_pk.g1, messages=dataset_col, sk=sk.vc_sk.sk)
-        for dataset_col in transposed_dataset
-    ]
-    esa_acc = [
-        esa.compute_accumulator(sk=sk.esa_sk.sk, dataset=dataset_col)
-        for dataset_col in transposed_dataset
-    ]
+    if workers > 1:
+        vc_cols, esa_acc = parallel.setup_columns(
+            vc_pk=pk.vc_pk,
+            vc_sk=sk.vc_sk,
+            esa_sk=sk.esa_sk,
+            transposed_dataset=[
+                column(transposed_dataset, j, ScalarBackend.NATIVE) for j in range(n_col)
+            ],
+            workers=workers,
+            block_size=block_size,
+        )
+    else:
+        dataset_cols = [column(transposed_dataset, j, backend) for j in range(n_col)]
+        if block_size:
+            vc_cols = [
+                sharded.commit(pk.vc_pk.g1, dataset_col, sk.vc_sk.sk, block_size, backend)
+                for dataset_col in dataset_cols
+            ]
+        else:
+            vc_cols = [
+                pointproofs.commit(
+                    g1=pk.vc_pk.g1, messages=dataset_col, sk=sk.vc_sk.sk, backend=backend
+                )
+                for dataset_col in dataset_cols
+            ]
+        esa_acc = [
+            esa.compute_accumulator(
+                sk=sk.esa_sk.sk, dataset=dataset_col, backend=backend
+            )
+            for dataset_col in dataset_cols
+        ]
+        del dataset_cols
+
+    # The committed columns no longer need their ZR copies.
+    if isinstance(transposed_dataset, ColumnarTable):
+        transposed_dataset.release()
 
     # Completeness
-    inv_index = inverted_index.build(
-        transposed_dataset, len(transposed_dataset), len(transposed_dataset[0])
-    )
+    inv_index = inverted_index.build(transposed_dataset, n_col, n_row)
     committed_inv_index = inverted_index.build_committed(
-        vc_pk=pk.vc_pk,
-        vc_sk=sk.vc_sk,
+        vc_pk=pk.index_pk,
+        vc_sk=sk.index_sk,
         inverted_index=inv_index,
         ptt_sk=sk.ptt_sk,
         ptt_pk=pk.ptt_pk,
+        block_size=block_size,
     )
 
     return vc_cols, inv_index, committed_inv_index, esa_acc
@@ -105,44 +247,165 @@ def run(config: Config, logger: Logger, round: int = None):
     """End-to-end demo run: keygen, commit, prove, and verify.
 
     This function is used in benchmarks and as a usage example; see README.
+    With config["profile"] the profiler's group wrappers are installed for
+    the run and removed afterwards, also when the run fails.
     """
-    dataset_int = init_dataset(config["n_col"], config["n_row"])
-    transposed_dataset_int = transpose(dataset_int)
-
+    profile = config.get("profile", False)
+    if profile:
+        profiler.enable()
+        profiler.reset()
+    try:
+        _run(config, logger, round)
+    finally:
+        if profile:
+            profiler.disable()
+
+
+def _run(config: Config, logger: Logger, round: int = None):
     selected_column = config["selected_column"]
+    block_size = config.get("block_size")
+    backend = config.get("scalar_backend", ScalarBackend.ZR)
+    mode = config.get("prover_mode", ProverMode.POINT)
+    if mode == ProverMode.PUBLIC and (
+        block_size or not config.get("proof_store")
+    ):
+        raise ValueError("prover_mode PUBLIC needs a proof_store and unsharded columns")
+    if block_size and config.get("proof_store"):
+        raise ValueError("proof_store and block_size cannot be combined")
 
-    min_value = min(transposed_dataset_int[selected_column])
-    min_value = group.init(ZR, min_value)
-
-    dataset = init_dataset_as_ZR(dataset_int)
-    transposed_dataset = transpose(dataset)
+    if config.get("columnar", False):
+        dataset = transposed_dataset = ColumnarTable.random(
+            config["n_col"], config["n_row"]
+        )
+        min_value = group.init(ZR, dataset.min(selected_column))
+    else:
+        dataset_int = init_dataset(config["n_col"], config["n_row"])
+        transposed_dataset_int = transpose(dataset_int)
+
+        min_value = min(transposed_dataset_int[selected_column])
+        min_value = group.init(ZR, min_value)
+
+        dataset = init_dataset_as_ZR(dataset_int)
+        transposed_dataset = transpose(dataset)
+
+    predicates = config.get("predicates")
+    range_predicate = config.get("range_predicate")
+    if predicates and range_predicate:
+        raise ValueError("predicates and range_predicate cannot be combined")
+    answer = (
+        None if predicates or range_predicate else query(dataset, config["filtered_row"])
+    )
 
-    answer = query(dataset, config["filtered_row"])
+    phases = PhaseRecorder(config.get("track_memory", False))
 
     # ------- Setup -------
-    start_time = time.time()
-    sk, pk = generate_keys(config["n_row"], min_value)
+    phases.start("setup")
+    profiler.start("setup")
+    window = config.get("fixed_base_window", fixed_base.DEFAULT_WINDOW)
+    # Sharded columns share one key of a block's length.
+    sk, pk = generate_keys(
+        block_size or config["n_row"],
+        min_value,
+        window or fixed_base.DEFAULT_WINDOW,
+        config.get("key_path"),
+        config.get("workers", 1),
+    )
+
+    fixed_base.clear()
+    if window:
+        fixed_base.precompute_keys(pk.vc_pk, pk.esa_pk, pk.ptt_pk, window=window)
 
     vc_cols, inv_index, verified_inverted_index, esa_acc = setup(
-        sk, pk, transposed_dataset
+        sk,
+        pk,
+        transposed_dataset,
+        config.get("workers", 1),
+        backend,
+        block_size,
     )
 
-    answer_inv_index, answer_indexes, transposed_answer = answer_index(answer)
-    setup_time = time.time() - start_time
+    store = None
+    if config.get("proof_store"):
+        proof_store.write(
+            config["proof_store"],
+            pk.vc_pk,
+            sk.vc_sk,
+            vc_cols,
+            [column(transposed_dataset, j) for j in range(config["n_col"])],
+            verified_inverted_index,
+            config.get("workers", 1),
+            mode,
+        )
+        store = proof_store.ProofStore(
+            config["proof_store"], vc_cols, verified_inverted_index
+        )
+    # The PUBLIC prover never sees the PointProofs secret key.
+    prover_vc_sk = None if mode == ProverMode.PUBLIC else sk.vc_sk
+    prover_index_sk = None if mode == ProverMode.PUBLIC else sk.index_sk
+
+    range_index = None
+    if range_predicate:
+        range_index = sorted_index.build_committed(
+            pk.vc_pk,
+            sk.vc_sk,
+            column(transposed_dataset, range_predicate.column),
+            range_predicate.column,
+            block_size,
+        )
+        start, stop = range_index.range(range_predicate.low, range_predicate.high)
+        answer, answer_indexes, transposed_answer = index_query.build_answer(
+            dataset, sorted(range_index.rows[start:stop])
+        )
+    elif predicates:
+        answer, answer_indexes, transposed_answer = index_query.select(
+            dataset, inv_index, predicates
+        )
+    if predicates or range_predicate:
+        if not answer:
+            raise ValueError("the query matches no row")
+        # Range answers are proven complete by the sorted index instead.
+        answer_inv_index = None
+        if range_index is None:
+            answer_inv_index = inverted_index.build_subset(subset=answer)
+    else:
+        answer_inv_index, answer_indexes, transposed_answer = answer_index(answer)
+    filtered_row = len(answer)
+    setup_time = phases.stop()
+    profiler.stop()
 
     # ------- Prover -------
-    start_time = time.time()
+    phases.start("prove_correctness")
+    profiler.start("prove_correctness")
     if (
         config["aggregation"] == Aggregation.NONE
-        or config["n_row"] != config["filtered_row"]
+        or config["n_row"] != filtered_row
     ):
-        correctness_proofs = prover.prove_correctness(
-            vc_pk=pk.vc_pk,
-            vc_sk=sk.vc_sk,
-            vc_cols=vc_cols,
-            transposed_answer=transposed_answer,
-            answer_indexes=answer_indexes,
-        )
+        if block_size:
+            correctness_proofs = prover.prove_correctness_sharded(
+                vc_pk=pk.vc_pk,
+                vc_sk=sk.vc_sk,
+                vc_cols=vc_cols,
+                transposed_answer=transposed_answer,
+                answer_indexes=answer_indexes,
+                mode=mode,
+                workers=config.get("workers", 1),
+                cross=config.get("aggregate_columns", False),
+            )
+        else:
+            prove = (
+                prover.prove_correctness_cross
+                if config.get("aggregate_columns", False)
+                else prover.prove_correctness
+            )
+            correctness_proofs = prove(
+                vc_pk=pk.vc_pk,
+                vc_sk=prover_vc_sk,
+                vc_cols=vc_cols,
+                transposed_answer=transposed_answer,
+                answer_indexes=answer_indexes,
+                mode=mode,
+                cache=store,
+            )
 
     if config["aggregation"] != Aggregation.NONE:
         correctness_aggr_proof, correctness_aggr_proof_2, aggr_value = (
@@ -151,38 +414,75 @@ def run(config: Config, logger: Logger, round: int = None):
                 esa_pk=pk.esa_pk,
                 esa_sk=sk.esa_sk,
                 acc=esa_acc[selected_column],
-                dataset=transposed_dataset[selected_column],
+                dataset=column(transposed_dataset, selected_column, backend),
                 min_value=min_value,
+                backend=backend,
             )
         )
 
-    prove_correctness_time = time.time() - start_time
+    prove_correctness_time = phases.stop()
+    profiler.stop()
 
-    start_time = time.time()
-    completeness_proofs = prover.prove_completeness(
-        ptt_sk=sk.ptt_sk,
-        ptt_pk=pk.ptt_pk,
-        vc_sk=sk.vc_sk,
-        vc_pk=pk.vc_pk,
-        verified_inverted_index=verified_inverted_index,
-        answer_inverted_index=answer_inv_index,
-        inverted_index=inv_index,
-    )
-    prove_completeness_time = time.time() - start_time
+    phases.start("prove_completeness")
+    profiler.start("prove_completeness")
+    if range_index is not None:
+        # The sorted index proves that no row outside the answer is in the range.
+        completeness_proofs = prover.prove_range(
+            vc_pk=pk.vc_pk,
+            vc_sk=prover_vc_sk,
+            index=range_index,
+            low=range_predicate.low,
+            high=range_predicate.high,
+            mode=mode,
+        )
+    else:
+        completeness_proofs = prover.prove_completeness(
+            ptt_sk=sk.ptt_sk,
+            ptt_pk=pk.ptt_pk,
+            vc_sk=prover_index_sk,
+            vc_pk=pk.index_pk,
+            verified_inverted_index=verified_inverted_index,
+            answer_inverted_index=answer_inv_index,
+            store=store,
+            mode=mode,
+        )
+    prove_completeness_time = phases.stop()
+    profiler.stop()
+    if store is not None:
+        store.close()
 
     # ------- Verifier -------
-    start_time = time.time()
+    phases.start("verify_correctness")
+    profiler.start("verify_correctness")
     if (
         config["aggregation"] == Aggregation.NONE
-        or config["n_row"] != config["filtered_row"]
+        or config["n_row"] != filtered_row
     ):
-        check = verifier.verify_correctness(
-            vc_pk=pk.vc_pk,
-            vc_cols=vc_cols,
-            transposed_answer=transposed_answer,
-            answer_indexes=answer_indexes,
-            proofs=correctness_proofs,
-        )
+        if block_size:
+            check = verifier.verify_correctness_sharded(
+                vc_pk=pk.vc_pk,
+                vc_cols=vc_cols,
+                transposed_answer=transposed_answer,
+                answer_indexes=answer_indexes,
+                proofs=correctness_proofs,
+                cross=config.get("aggregate_columns", False),
+            )
+        elif config.get("aggregate_columns", False):
+            check = verifier.verify_correctness_cross(
+                vc_pk=pk.vc_pk,
+                vc_cols=vc_cols,
+                transposed_answer=transposed_answer,
+                answer_indexes=answer_indexes,
+                proof=correctness_proofs,
+            )
+        else:
+            check = verifier.verify_correctness(
+                vc_pk=pk.vc_pk,
+                vc_cols=vc_cols,
+                transposed_answer=transposed_answer,
+                answer_indexes=answer_indexes,
+                proofs=correctness_proofs,
+            )
         assert check
 
     if config["aggregation"] != Aggregation.NONE:
@@ -194,21 +494,55 @@ def run(config: Config, logger: Logger, round: int = None):
             value=aggr_value,
         )
         assert check
-    verify_correctness_time = time.time() - start_time
+    verify_correctness_time = phases.stop()
+    profiler.stop()
 
-    start_time = time.time()
-    check = verifier.verify_completeness(
-        vc_pk=pk.vc_pk,
-        inverted_index=inv_index,
-        verified_inverted_index=verified_inverted_index,
-        answer_inverted_index=answer_inv_index,
-        proofs=completeness_proofs,
-    )
+    phases.start("verify_completeness")
+    profiler.start("verify_completeness")
+    if range_index is not None:
+        check = verifier.verify_range(
+            vc_pk=pk.vc_pk,
+            commitment=range_index.commitment,
+            n_row=config["n_row"],
+            low=range_predicate.low,
+            high=range_predicate.high,
+            answer_indexes=answer_indexes,
+            proof=completeness_proofs,
+        )
+    else:
+        check = verifier.verify_completeness(
+            vc_pk=pk.index_pk,
+            verified_inverted_index=verified_inverted_index,
+            answer_inverted_index=answer_inv_index,
+            proofs=completeness_proofs,
+            batch=config.get("batch_verify", False),
+        )
     assert check
-    verify_completeness_time = time.time() - start_time
+    verify_completeness_time = phases.stop()
+    profiler.stop()
+
+    # ------- Proof sizes (wire format) -------
+    correctness_bytes, aggregation_bytes = 0, 0
+    if (
+        config["aggregation"] == Aggregation.NONE
+        or config["n_row"] != filtered_row
+    ):
+        correctness_bytes = len(wire.encode_correctness(correctness_proofs))
+    if config["aggregation"] != Aggregation.NONE:
+        aggregation_bytes = len(
+            wire.encode_aggregation(
+                config["aggregation"],
+                [correctness_aggr_proof, correctness_aggr_proof_2],
+                aggr_value,
+            )
+        )
+    if range_index is not None:
+        completeness_bytes = len(wire.encode_range(completeness_proofs))
+    else:
+        completeness_bytes = len(wire.encode_completeness(completeness_proofs))
 
     print(
-        f"{config['n_row']}, {config['aggregation']}, {config['filtered_row']}, {round}, {setup_time}, {prove_correctness_time}, {prove_completeness_time}, {verify_correctness_time}, {verify_completeness_time}",
+        f"{config['n_row']}, {config['aggregation']}, {filtered_row}, {round}, {setup_time}, {prove_correctness_time}, {prove_completeness_time}, {verify_correctness_time}, {verify_completeness_time}, {correctness_bytes}, {aggregation_bytes}, {completeness_bytes}",
         flush=True,
     )
     logger.log_results(
@@ -218,106 +552,121 @@ def run(config: Config, logger: Logger, round: int = None):
                 [
                     config["n_row"],
                     config["aggregation"],
-                    config["filtered_row"],
+                    filtered_row,
                     round,
                     setup_time,
                     prove_correctness_time,
                     prove_completeness_time,
                     verify_correctness_time,
                     verify_completeness_time,
+                    correctness_bytes,
+                    aggregation_bytes,
+                    completeness_bytes,
                 ],
             )
         )
     )
+    if profiler.enabled():
+        logger.log_counters(
+            {
+                "N Row": config["n_row"],
+                "Aggregation": config["aggregation"],
+                "N Filtered Row": filtered_row,
+                "Round": round,
+            },
+            profiler.counters(),
+        )
 
-
-if __name__ == "__main__":
-    config: Config
-
-    config = {
-        "n_col": 10,
-        "n_row": 0,
-        "selected_column": 0,
-        "aggregation": Aggregation.NONE,
-        "filtered_row": 0,
-    }
-
-    logger = Logger(
-        list(
-            map(
-                str,
-                [
-                    "N Row",
-                    "Aggregation",
-                    "N Filtered Row",
-                    "Round",
-                    "Setup",
-                    "Prove Correctness",
-                    "Prove Completeness",
-                    "Verify Correctness",
-                    "Verify Completeness",
-                ],
-            )
-        ),
+    phases.close()
+    logger.log_record(
+        {
+            "config": config,
+            "round": round,
+            "phases": phases.results,
+            "bytes": {
+                "correctness": correctness_bytes,
+                "aggregation": aggregation_bytes,
+                "completeness": completeness_bytes,
+            },
+        }
     )
+    logger.flush()
+
+
+# Columns of results.csv, one row per run() round.
+RESULTS_HEADER = [
+    "N Row",
+    "Aggregation",
+    "N Filtered Row",
+    "Round",
+    "Setup",
+    "Prove Correctness",
+    "Prove Completeness",
+    "Verify Correctness",
+    "Verify Completeness",
+    "Correctness Bytes",
+    "Aggregation Bytes",
+    "Completeness Bytes",
+]
+EXPERIMENT_SIZES = [1_000, 10_000, 30_000, 50_000, 75_000, 100_000]
+
+
+def experiments(
+    sizes: list[int] = EXPERIMENT_SIZES, rounds: int = 3, options: ConfigOptions = None
+):
+    """The original experiments: run() rounds of every query shape, logged by a Logger.
+
+    Every aggregation (NONE included) runs over the whole table and over the
+    filtered fractions of benches.scenarios; options (e.g. profile,
+    track_memory) are added to every configuration.
+    """
+    from benches.scenarios import FILTERED_DIVISORS
 
-    # Query Type: SELECT * FROM x
-    # filtered_data == data
-    # no aggr proof
-    for size in [1_000, 10_000, 30_000, 50_000, 75_000, 100_000]:
-        config["n_row"] = size
-        config["filtered_row"] = size
-        config["aggregation"] = Aggregation.NONE
-
-        for round in range(0, 3):
-            logger.log_configuration(config)
-            run(config, logger, round)
-
-    # Query Type: SELECT AGGR(*) FROM x
-    # filtered_data == data
-    for size in [1_000, 10_000, 30_000, 50_000, 75_000, 100_000]:
-        for aggregation in Aggregation:
-            config["n_row"] = size
-            config["filtered_row"] = size
-            config["aggregation"] = aggregation
-
-            for round in range(0, 3):
-                logger.log_configuration(config)
-                run(config, logger, round)
-
-    # Query Type: SELECT * FROM x WHERE z
-    # filtered_data < data
-    # no aggr proof
-    for size in [1_000, 10_000, 30_000, 50_000, 75_000, 100_000]:
-        for filtered_size in [
-            size // 1000,
-            size // 100,
-            size // 100,
-            size // 10,
-            size // 3,
-        ]:
-            config["n_row"] = size
-            config["filtered_row"] = filtered_size
-
-            for round in range(0, 3):
-                logger.log_configuration(config)
-                run(config, logger, round)
-
-    # Query Type: SELECT AGGR(*) FROM x WHERE z
-    # filtered_data < data
-    for size in [1_000, 10_000, 30_000, 50_000, 75_000, 100_000]:
-        for filtered_size in [
-            size // 1000,
-            size // 100,
-            size // 100,
-            size // 10,
-            size // 3,
-        ]:
+    logger = Logger(RESULTS_HEADER)
+    for size in sizes:
+        for divisor in [1] + FILTERED_DIVISORS:
             for aggregation in Aggregation:
-                config["n_row"] = size
-                config["filtered_row"] = filtered_size
-                config["aggregation"] = aggregation
-
-                for round in range(0, 3):
+                config: Config = {
+                    "n_col": 10,
+                    "n_row": size,
+                    "selected_column": 0,
+                    "aggregation": aggregation,
+                    "filtered_row": max(1, size // divisor),
+                    **(options or {}),
+                }
+                for round in range(rounds):
                     logger.log_configuration(config)
                     run(config, logger, round)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["experiments"]:
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            prog="main.py experiments",
+            description="run() over the original query shapes, logged to time_experiments.",
+        )
+        parser.add_argument("--sizes", nargs="+", type=int, default=EXPERIMENT_SIZES)
+        parser.add_argument("--rounds", type=int, default=3)
+        parser.add_argument("--profile", action="store_true")
+        parser.add_argument("--track-memory", action="store_true")
+        args = parser.parse_args(sys.argv[2:])
+        experiments(
+            args.sizes,
+            args.rounds,
+            {"profile": args.profile, "track_memory": args.track_memory},
+        )
+        sys.exit(0)
+
+    from benches import suite
+
+    # End-to-end scenarios over the table sizes of the original experiments;
+    # extra arguments are passed on (see python -m benches.suite run --help).
+    sys.exit(
+        suite.main(
+            ["run", "--suite", "scenarios", "--sizes"]
+            + [str(size) for size in EXPERIMENT_SIZES]
+            + sys.argv[1:]
+        )
+    )
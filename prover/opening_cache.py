@@ -0,0 +1,145 @@
+from collections import OrderedDict, defaultdict
+from charm.toolbox.pairinggroup import ZR, G1
+
+from util.util import group
+from vector_commitments import pointproofs
+from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
+
+"""
+Bounded LRU cache of single-position PointProofs openings.
+
+Openings are keyed by (commitment id, column, row), where the commitment id
+is the serialized commitment. A cache registers itself with
+pointproofs.add_update_listener, so when update_commit replaces a commitment
+every opening of the old commitment (all of them depend on the whole vector)
+is dropped.
+"""
+
+DEFAULT_CAPACITY = 100_000
+
+
+class OpeningCache:
+    """LRU cache of pointproofs.generate_proof results with hit/miss metrics."""
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.by_commit = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        pointproofs.add_update_listener(self.invalidate)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def commit_id(v_commit: G1) -> bytes:
+        return group.serialize(v_commit)
+
+    def proof(
+        self,
+        vc_pk: VC_PK,
+        vc_sk: VC_SK,
+        v_commit: G1,
+        column: int,
+        row: int,
+        message: ZR,
+        commit_id: bytes = None,
+    ) -> G1:
+        """Opening of v_commit at row, generated on a miss.
+
+        commit_id may be passed when the caller opens many rows of one commitment.
+        """
+        key = (commit_id or self.commit_id(v_commit), column, row)
+        proof = self.entries.get(key)
+        if proof is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return proof
+
+        self.misses += 1
+        proof = pointproofs.generate_proof(
+            pk_g1=vc_pk.pk_g1, sk=vc_sk.sk, v_commit=v_commit, index=row, message=message
+        )
+        self._put(key, proof)
+        return proof
+
+    def _put(self, key: tuple, proof: G1) -> None:
+        self.entries[key] = proof
+        self.by_commit[key[0]].add(key)
+        while len(self.entries) > self.capacity:
+            old_key, _ = self.entries.popitem(last=False)
+            self._forget(old_key)
+            self.evictions += 1
+
+    def _forget(self, key: tuple) -> None:
+        keys = self.by_commit[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.by_commit[key[0]]
+
+    def invalidate(self, v_commit: G1, new_commit: G1 = None) -> None:
+        """Drop every opening of v_commit (update listener)."""
+        keys = self.by_commit.pop(self.commit_id(v_commit), ())
+        for key in keys:
+            del self.entries[key]
+        self.invalidations += len(keys)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def close(self) -> None:
+        """Stop listening for commitment updates."""
+        pointproofs.remove_update_listener(self.invalidate)
+
+
+if __name__ == "__main__":
+    N = 8
+    vc_sk, vc_pk = pointproofs.generate_keys(N)
+    messages = [group.random(ZR) for _ in range(N)]
+    v_commit = pointproofs.commit(vc_pk.g1, messages, vc_sk.sk)
+
+    cache = OpeningCache(capacity=4)
+    for row in [0, 1, 2, 0, 1]:
+        proof = cache.proof(vc_pk, vc_sk, v_commit, 0, row, messages[row])
+        assert pointproofs.verify_proof(
+            vc_pk.g2, vc_pk.pk_g2, vc_pk.pk_gt, v_commit, messages[row], row, proof
+        )
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    for row in [3, 4]:
+        cache.proof(vc_pk, vc_sk, v_commit, 0, row, messages[row])
+    assert len(cache) == 4 and cache.evictions == 1
+
+    new_message = group.random(ZR)
+    new_commit = pointproofs.update_commit(
+        vc_pk.g1, v_commit, vc_sk.sk, [1], [messages[1]], [new_message]
+    )
+    messages[1] = new_message
+    assert len(cache) == 0 and cache.invalidations == 4
+
+    proof = cache.proof(vc_pk, vc_sk, new_commit, 0, 1, messages[1])
+    assert pointproofs.verify_proof(
+        vc_pk.g2, vc_pk.pk_g2, vc_pk.pk_gt, new_commit, messages[1], 1, proof
+    )
+    cache.close()
+
+    # The update listener does not keep an unclosed cache alive.
+    import gc
+    import weakref
+
+    unclosed = OpeningCache()
+    collected = weakref.ref(unclosed)
+    del unclosed
+    gc.collect()
+    assert collected() is None
+    pointproofs.update_commit(
+        vc_pk.g1, new_commit, vc_sk.sk, [0], [messages[0]], [messages[0]]
+    )
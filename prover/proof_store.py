@@ -0,0 +1,205 @@
+import mmap
+from charm.toolbox.pairinggroup import ZR, G1
+
+from util.util import group, ProverMode
+from util import keystore, parallel
+from vector_commitments import pointproofs
+from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
+from inverted_index.inverted_index import CommittedIndex
+
+"""
+Persistent store of precomputed PointProofs openings.
+
+write() opens every row of every column commitment, and the committed
+inverted index at every key position (the "proofs_2" openings of
+prover.prove_completeness), once at setup. The file uses the key-store layout
+(util.keystore.write_sections) with three sections of fixed-width records:
+
+- "commits": the column commitments followed by the index commitment;
+- "openings": column-major single-row openings, record column * n_row + row;
+- "index": index openings, record = key position.
+
+ProofStore maps the file and hands out openings by position, so query-time
+proving is lookups plus aggregation. It is opened for the commitments it must
+belong to and rejects a store written for other ones (e.g. a stale file). It has the OpeningCache.proof interface
+and can be passed as the cache of prover.prove_correctness.
+"""
+
+MAGIC = b"ZKVSPRFS"
+
+
+def write(
+    path: str,
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    vc_cols: list[G1],
+    transposed_dataset: list[list[ZR]],
+    committed_index: CommittedIndex,
+    workers: int = 1,
+    mode: ProverMode = ProverMode.POINT,
+) -> None:
+    """Compute every column and index opening and write them to path.
+
+    transposed_dataset holds the committed ZR columns. With workers > 1 the
+    column openings are computed on a process pool. With mode=ProverMode.PUBLIC
+    they are computed from the public parameters (pointproofs.PublicProver);
+    the index openings always use vc_sk (see prover.prove_completeness).
+    """
+    if mode == ProverMode.PUBLIC:
+        public = pointproofs.PublicProver(vc_pk, len(transposed_dataset[0]))
+        column_openings = [public.open_all(col) for col in transposed_dataset]
+    elif workers > 1:
+        column_openings = parallel.openings(
+            vc_pk, vc_sk, vc_cols, transposed_dataset, workers
+        )
+    else:
+        column_openings = [
+            [
+                pointproofs.generate_proof(
+                    pk_g1=vc_pk.pk_g1, sk=vc_sk.sk, v_commit=vc, index=row, message=value
+                )
+                for row, value in enumerate(col)
+            ]
+            for vc, col in zip(vc_cols, transposed_dataset)
+        ]
+
+    index_openings = [
+        pointproofs.generate_proof(
+            pk_g1=vc_pk.pk_g1,
+            sk=vc_sk.sk,
+            v_commit=committed_index.commitment,
+            index=position,
+            message=key,
+        )
+        for position, key in enumerate(committed_index.keys)
+    ]
+
+    keystore.write_sections(
+        path,
+        {
+            "commits": list(vc_cols) + [committed_index.commitment],
+            "openings": [opening for col in column_openings for opening in col],
+            "index": index_openings,
+        },
+        MAGIC,
+    )
+
+
+class ProofStore:
+    """Memory-mapped view over a proof-store file written by write().
+
+    Raises ValueError if the file was not written for vc_cols and
+    committed_index, whose openings it would otherwise hand out.
+    """
+    def __init__(self, path: str, vc_cols: list[G1], committed_index: CommittedIndex):
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        sections = keystore.read_sections(self.buffer, path, MAGIC)
+
+        self.commits = sections["commits"]
+        self.openings = sections["openings"]
+        self.index = sections["index"]
+        self.n_col = len(self.commits) - 1
+        self.n_row = len(self.openings) // self.n_col if self.n_col else 0
+
+        if not self.matches(vc_cols, committed_index):
+            self.close()
+            raise ValueError(f"proof store {path} was written for other commitments")
+
+    def matches(self, vc_cols: list[G1], committed_index: CommittedIndex) -> bool:
+        """True if the store was written for these commitments."""
+        return (
+            len(vc_cols) == self.n_col
+            and all(vc == self.commits[j] for j, vc in enumerate(vc_cols))
+            and committed_index.commitment == self.commits[self.n_col]
+        )
+
+    def opening(self, column: int, row: int) -> G1:
+        return self.openings[column * self.n_row + row]
+
+    def index_opening(self, position: int) -> G1:
+        """Opening of the committed inverted index at a key position."""
+        return self.index[position]
+
+    @staticmethod
+    def commit_id(v_commit: G1) -> None:
+        """Openings are looked up by column, so no commitment id is needed."""
+        return None
+
+    def proof(
+        self,
+        vc_pk: VC_PK,
+        vc_sk: VC_SK,
+        v_commit: G1,
+        column: int,
+        row: int,
+        message: ZR,
+        commit_id: bytes = None,
+    ) -> G1:
+        """Stored opening of v_commit at row (OpeningCache.proof interface)."""
+        if v_commit != self.commits[column]:
+            raise ValueError(f"proof store does not match the commitment of column {column}")
+        return self.opening(column, row)
+
+    def close(self) -> None:
+        self.openings = self.index = self.commits = None
+        self.buffer.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from inverted_index import inverted_index
+    from set_accumulator import ptt
+    from util.util import transpose
+
+    n_row, n_col = 6, 2
+    vc_sk, vc_pk = pointproofs.generate_keys(n_row * n_col)
+    ptt_sk, ptt_pk = ptt.generate_keys()
+    transposed_dataset = [[group.random(ZR) for _ in range(n_row)] for _ in range(n_col)]
+    vc_cols = [pointproofs.commit(vc_pk.g1, col, vc_sk.sk) for col in transposed_dataset]
+    committed_index = inverted_index.build_committed(
+        vc_pk,
+        vc_sk,
+        inverted_index.build(transpose(transposed_dataset), n_row, n_col),
+        ptt_sk,
+        ptt_pk,
+    )
+
+    path = os.path.join(tempfile.mkdtemp(), "proofs.bin")
+    write(path, vc_pk, vc_sk, vc_cols, transposed_dataset, committed_index)
+    store = ProofStore(path, vc_cols, committed_index)
+    assert (store.n_col, store.n_row) == (n_col, n_row)
+
+    # A store is only opened for the commitments it was written for.
+    try:
+        ProofStore(path, vc_cols[::-1], committed_index)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a proof store was opened for other commitments")
+
+    for j, (vc, col) in enumerate(zip(vc_cols, transposed_dataset)):
+        for row, value in enumerate(col):
+            assert pointproofs.verify_proof(
+                vc_pk.g2, vc_pk.pk_g2, vc_pk.pk_gt, vc, value, row, store.opening(j, row)
+            )
+    key = committed_index.keys[3]
+    assert store.index_opening(3) == pointproofs.generate_proof(
+        vc_pk.pk_g1, vc_sk.sk, committed_index.commitment, 3, key
+    )
+    store.close()
+
+    public_path = os.path.join(tempfile.mkdtemp(), "proofs.bin")
+    write(
+        public_path,
+        vc_pk,
+        vc_sk,
+        vc_cols,
+        transposed_dataset,
+        committed_index,
+        mode=ProverMode.PUBLIC,
+    )
+    with open(path, "rb") as store_file, open(public_path, "rb") as public_file:
+        assert store_file.read() == public_file.read()
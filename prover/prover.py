@@ -1,14 +1,21 @@
 from collections import defaultdict
 from charm.toolbox.pairinggroup import ZR, G1
 
-from vector_commitments import pointproofs
+from vector_commitments import pointproofs, sharded
 from set_accumulator import ptt, esa
 
 from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
 from set_accumulator.esa import PK as ESA_PK, SK as ESA_SK
 from set_accumulator.ptt import PK as PTT_PK, SK as PTT_SK
+from vector_commitments.sharded import ShardedCommitment
+from inverted_index.inverted_index import CommittedIndex
+from inverted_index.sorted_index import SortedIndex
 
-from util.util import hash_to_ZR, group, Aggregation
+from util.util import hash_to_ZR, group, Aggregation, ProverMode, ScalarBackend
+from util import scalar
+from util.fixed_base import power
+from util import parallel
+from prover.proof_store import ProofStore
 
 """
 Prover module: builds non-interactive proofs.
@@ -16,6 +23,7 @@ Prover module: builds non-interactive proofs.
 - Value correctness (PointProofs aggregated proofs for selected rows)
 - Aggregation correctness (ESA: COUNT, SUM, MIN)
 - Completeness via inverted index (commit [key, acc_hash] and link to top commit)
+- Completeness of range predicates via a sorted committed index
 """
 
 def prove_correctness(
@@ -24,24 +32,72 @@ def prove_correctness(
     vc_cols: list[G1],
     transposed_answer: list[list[ZR]],
     answer_indexes: list[int],
+    mode: ProverMode = ProverMode.POINT,
+    cache: "OpeningCache" = None,
+    columns: list[list[ZR]] = None,
 ) -> list[G1]:
     """Generate aggregate proofs of value-correctness for each column.
 
     Returns a list of aggregated proofs (one per column) covering answer_indexes.
+    With mode=ProverMode.SCALAR the per-row openings are never materialized:
+    each column costs two exponentiations regardless of the answer size.
+    In POINT mode a prover.opening_cache.OpeningCache supplies (and keeps)
+    the per-row openings, so rows shared by overlapping queries are opened once;
+    a prover.proof_store.ProofStore can be passed instead to read them from disk.
+    With mode=ProverMode.PUBLIC vc_sk is not used: the openings are read from
+    a proof store written in PUBLIC mode or, without one, computed from the
+    public parameters over the full committed columns, which must be given;
+    an OpeningCache, which opens with the secret key, is rejected.
     """
-    proofs_col = [
-        [
-            pointproofs.generate_proof(
-                pk_g1=vc_pk.pk_g1,
+    if mode == ProverMode.PUBLIC and cache is None and columns is None:
+        raise ValueError("ProverMode.PUBLIC needs a proof store or the committed columns")
+    # A ProofStore only reads openings; an OpeningCache computes them with vc_sk.
+    public_cache = cache is not None and mode == ProverMode.PUBLIC
+    if public_cache and not isinstance(cache, ProofStore):
+        raise ValueError("ProverMode.PUBLIC takes a proof store, not an opening cache")
+    if mode == ProverMode.SCALAR:
+        return [
+            pointproofs.generate_aggregate_proof(
+                g1=vc_pk.g1,
                 sk=vc_sk.sk,
                 v_commit=vc,
-                index=answer_index,
-                message=col_value,
+                messages=col,
+                indexes=answer_indexes,
             )
-            for answer_index, col_value in zip(answer_indexes, col)
+            for vc, col in zip(vc_cols, transposed_answer)
+        ]
+
+    if cache is not None:
+        proofs_col = []
+        for column, (vc, col) in enumerate(zip(vc_cols, transposed_answer)):
+            commit_id = cache.commit_id(vc)
+            proofs_col.append(
+                [
+                    cache.proof(vc_pk, vc_sk, vc, column, answer_index, col_value, commit_id)
+                    for answer_index, col_value in zip(answer_indexes, col)
+                ]
+            )
+    elif mode == ProverMode.PUBLIC:
+        public = None
+        proofs_col = []
+        for column in columns:
+            if public is None or public.n != len(column):
+                public = pointproofs.public_prover(vc_pk, len(column))
+            proofs_col.append(public.open_many(column, answer_indexes))
+    else:
+        proofs_col = [
+            [
+                pointproofs.generate_proof(
+                    pk_g1=vc_pk.pk_g1,
+                    sk=vc_sk.sk,
+                    v_commit=vc,
+                    index=answer_index,
+                    message=col_value,
+                )
+                for answer_index, col_value in zip(answer_indexes, col)
+            ]
+            for vc, col in zip(vc_cols, transposed_answer)
         ]
-        for vc, col in zip(vc_cols, transposed_answer)
-    ]
 
     return [
         pointproofs.aggregate_proofs(
@@ -51,6 +107,103 @@ def prove_correctness(
     ]
 
 
+def prove_correctness_cross(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    vc_cols: list[G1],
+    transposed_answer: list[list[ZR]],
+    answer_indexes: list[int],
+    mode: ProverMode = ProverMode.POINT,
+    cache: "OpeningCache" = None,
+    columns: list[list[ZR]] = None,
+) -> G1:
+    """Generate a single proof of value-correctness covering every column.
+
+    The per-column aggregated proofs are aggregated across the column
+    commitments (in SCALAR mode directly, with one multi-exponentiation).
+    """
+    if mode == ProverMode.PUBLIC and cache is None and columns is None:
+        raise ValueError("ProverMode.PUBLIC needs a proof store or the committed columns")
+    indexes = [answer_indexes] * len(vc_cols)
+    if mode == ProverMode.SCALAR:
+        return pointproofs.generate_cross_aggregate_proof(
+            g1=vc_pk.g1,
+            sk=vc_sk.sk,
+            v_commits=vc_cols,
+            messages=transposed_answer,
+            indexes=indexes,
+        )
+
+    return pointproofs.aggregate_across_commits(
+        v_commits=vc_cols,
+        messages=transposed_answer,
+        indexes=indexes,
+        proofs=prove_correctness(
+            vc_pk, vc_sk, vc_cols, transposed_answer, answer_indexes, mode, cache, columns
+        ),
+    )
+
+
+def sharded_statements(
+    vc_cols: list[ShardedCommitment],
+    transposed_answer: list[list[ZR]],
+    answer_indexes: list[int],
+) -> list[tuple[list[G1], list[list[ZR]], list[list[int]]]]:
+    """Per column: the touched block commitments, their messages and offsets."""
+    statements = []
+    for vc, col in zip(vc_cols, transposed_answer):
+        blocks, messages, offsets = sharded.split(vc, col, answer_indexes)
+        statements.append(([vc.commits[block] for block in blocks], messages, offsets))
+    return statements
+
+
+def prove_correctness_sharded(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    vc_cols: list[ShardedCommitment],
+    transposed_answer: list[list[ZR]],
+    answer_indexes: list[int],
+    mode: ProverMode = ProverMode.POINT,
+    workers: int = 1,
+    cross: bool = False,
+):
+    """Value-correctness proofs over block-sharded column commitments.
+
+    Every touched block gets an aggregated proof (computed on a process pool
+    when workers > 1); the block proofs are aggregated across blocks into one
+    proof per column, or into a single proof for all columns with cross=True.
+    """
+    statements = sharded_statements(vc_cols, transposed_answer, answer_indexes)
+    v_commits = [v_commit for commits, _, _ in statements for v_commit in commits]
+    messages = [messages_b for _, messages, _ in statements for messages_b in messages]
+    offsets = [offsets_b for _, _, offsets in statements for offsets_b in offsets]
+
+    if workers > 1:
+        proofs = parallel.block_proofs(
+            vc_pk, vc_sk, v_commits, messages, offsets, mode, workers
+        )
+    else:
+        proofs = [
+            sharded.generate_block_proof(vc_pk, vc_sk, v_commit, messages_b, offsets_b, mode)
+            for v_commit, messages_b, offsets_b in zip(v_commits, messages, offsets)
+        ]
+
+    if cross:
+        return pointproofs.aggregate_across_commits(v_commits, messages, offsets, proofs)
+
+    column_proofs = []
+    start = 0
+    for commits, messages_c, offsets_c in statements:
+        stop = start + len(commits)
+        column_proofs.append(
+            pointproofs.aggregate_across_commits(
+                commits, messages_c, offsets_c, proofs[start:stop]
+            )
+        )
+        start = stop
+    return column_proofs
+
+
 def prove_aggr_correctness(
     aggregation: Aggregation,
     esa_pk: ESA_PK,
@@ -58,6 +211,7 @@ def prove_aggr_correctness(
     acc: ZR,
     dataset: list[ZR],
     min_value: ZR,
+    backend: ScalarBackend = ScalarBackend.ZR,
 ):
     """Generate aggregation proof and the aggregated value.
 
@@ -68,11 +222,11 @@ def prove_aggr_correctness(
     value = min_value
     if aggregation == Aggregation.COUNT:
         proof, value = esa.generate_count_proof(
-            g2=esa_pk.g2, sk=esa_sk.sk, acc=acc, dataset=dataset
+            g2=esa_pk.g2, sk=esa_sk.sk, acc=acc, dataset=dataset, backend=backend
         )
     elif aggregation == Aggregation.SUM:
         proof, proof_2, value = esa.generate_sum_proof(
-            g2=esa_pk.g2, sk=esa_sk.sk, acc=acc, dataset=dataset
+            g2=esa_pk.g2, sk=esa_sk.sk, acc=acc, dataset=dataset, backend=backend
         )
     elif aggregation == Aggregation.MIN:
         proof, _ = esa.generate_min_proof(
@@ -82,42 +236,75 @@ def prove_aggr_correctness(
     return proof, proof_2, value
 
 
+def _answer_accumulator(
+    ptt_sk: PTT_SK,
+    ptt_pk: PTT_PK,
+    verified_inverted_index: CommittedIndex,
+    key: ZR,
+    postings: list[int],
+) -> G1:
+    """PTT accumulator of an answer posting list, using the cached product tree.
+
+    A posting list equal to the committed one reuses its accumulator.
+    """
+    tree = verified_inverted_index.tree(key)
+    if tree is None or not tree.contains(postings):
+        return ptt.compute_accumulator(sk=ptt_sk.sk, g1=ptt_pk.g1, dataset=postings)
+
+    if len(set(postings)) == len(tree):
+        return verified_inverted_index.accumulators[verified_inverted_index.position(key)]
+    return power(ptt_pk.g1, scalar.to_ZR(tree.subset_product(postings)))
+
+
 def prove_completeness(
     ptt_sk: PTT_SK,
     ptt_pk: PTT_PK,
     vc_sk: VC_SK,
     vc_pk: VC_PK,
-    verified_inverted_index: G1,
+    verified_inverted_index: CommittedIndex,
     answer_inverted_index: dict[ZR, list[int]],
-    inverted_index: dict[ZR, list[int]],
+    store: ProofStore = None,
+    mode: ProverMode = ProverMode.POINT,
 ) -> dict[ZR, dict[str, object]]:
     """Create proofs that every returned key appears in the committed inverted index.
 
     Returns a dict keyed by ZR keys with components needed by the verifier.
+    With a prover.proof_store.ProofStore the openings of the committed index
+    ("proofs_2") are read from the store. With mode=ProverMode.PUBLIC the
+    [key, acc_hash] commitments and their openings use the public parameters
+    only; "proofs_2" open the index to the key rather than to its committed
+    entry, which needs the secret key, so they must come from the store.
     """
+    if mode == ProverMode.PUBLIC and store is None:
+        raise ValueError("ProverMode.PUBLIC completeness proofs need a proof store")
+    public = pointproofs.public_prover(vc_pk, 2) if mode == ProverMode.PUBLIC else None
+
     proofs = defaultdict(tuple)
     for key, value in answer_inverted_index.items():
-        acc = ptt.compute_accumulator(sk=ptt_sk.sk, g1=ptt_pk.g1, dataset=value)
+        acc = _answer_accumulator(ptt_sk, ptt_pk, verified_inverted_index, key, value)
         acc_hash = hash_to_ZR(acc)
 
         vsa_pair = [key, acc_hash]
-        vsa = pointproofs.commit(g1=vc_pk.g1, messages=vsa_pair, sk=vc_sk.sk)
         vsa_indexes = [0, 1]
-
-        proof_key = pointproofs.generate_proof(
-            pk_g1=vc_pk.pk_g1,
-            sk=vc_sk.sk,
-            v_commit=vsa,
-            index=vsa_indexes[0],
-            message=vsa_pair[0],
-        )
-        proof_sa = pointproofs.generate_proof(
-            pk_g1=vc_pk.pk_g1,
-            sk=vc_sk.sk,
-            v_commit=vsa,
-            index=vsa_indexes[1],
-            message=vsa_pair[1],
-        )
+        if public is not None:
+            vsa = public.commit(vsa_pair)
+            proof_key, proof_sa = public.open_all(vsa_pair)
+        else:
+            vsa = pointproofs.commit(g1=vc_pk.g1, messages=vsa_pair, sk=vc_sk.sk)
+            proof_key = pointproofs.generate_proof(
+                pk_g1=vc_pk.pk_g1,
+                sk=vc_sk.sk,
+                v_commit=vsa,
+                index=vsa_indexes[0],
+                message=vsa_pair[0],
+            )
+            proof_sa = pointproofs.generate_proof(
+                pk_g1=vc_pk.pk_g1,
+                sk=vc_sk.sk,
+                v_commit=vsa,
+                index=vsa_indexes[1],
+                message=vsa_pair[1],
+            )
 
         proofs_1 = pointproofs.aggregate_proofs(
             v_commit=vsa,
@@ -126,13 +313,17 @@ def prove_completeness(
             proofs=[proof_key, proof_sa],
         )
 
-        proofs_2 = pointproofs.generate_proof(
-            pk_g1=vc_pk.pk_g1,
-            sk=vc_sk.sk,
-            v_commit=verified_inverted_index,
-            index=list(inverted_index.keys()).index(key),
-            message=key,
-        )
+        if store is not None:
+            proofs_2 = store.index_opening(verified_inverted_index.position(key))
+        else:
+            index_commit, position = verified_inverted_index.locate(key)
+            proofs_2 = pointproofs.generate_proof(
+                pk_g1=vc_pk.pk_g1,
+                sk=vc_sk.sk,
+                v_commit=index_commit,
+                index=position,
+                message=key,
+            )
 
         proofs[key] = {
             "acc_hash": acc_hash,
@@ -142,3 +333,59 @@ def prove_completeness(
         }
 
     return proofs
+
+
+def prove_range(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    index: SortedIndex,
+    low: int = None,
+    high: int = None,
+    mode: ProverMode = ProverMode.POINT,
+) -> dict[str, object]:
+    """Prove which rows of index.column lie in [low, high].
+
+    The matching entries form the run [start, stop) of the sorted index; one
+    aggregated opening covers the run and the entries just outside it, which
+    show that the run cannot be extended. Costs O(log n) to locate the run and
+    O(k) openings (or two exponentiations with mode=ProverMode.SCALAR).
+    The answer rows are index.rows[start:stop]. A sharded index is opened
+    block by block and the block proofs aggregated (sharded.generate_proof).
+    """
+    start, stop = index.range(low, high)
+    positions = index.opened(start, stop)
+    entries = [index.messages[i] for i in positions]
+
+    if isinstance(index.commitment, ShardedCommitment):
+        proof = sharded.generate_proof(
+            vc_pk, vc_sk, index.commitment, entries, positions, mode
+        )
+    elif mode == ProverMode.SCALAR:
+        proof = pointproofs.generate_aggregate_proof(
+            g1=vc_pk.g1,
+            sk=vc_sk.sk,
+            v_commit=index.commitment,
+            messages=entries,
+            indexes=positions,
+        )
+    else:
+        if mode == ProverMode.PUBLIC:
+            openings = pointproofs.public_prover(vc_pk, len(index)).open_many(
+                index.messages, positions
+            )
+        else:
+            openings = [
+                pointproofs.generate_proof(
+                    pk_g1=vc_pk.pk_g1,
+                    sk=vc_sk.sk,
+                    v_commit=index.commitment,
+                    index=position,
+                    message=entry,
+                )
+                for position, entry in zip(positions, entries)
+            ]
+        proof = pointproofs.aggregate_proofs(
+            v_commit=index.commitment, messages=entries, indexes=positions, proofs=openings
+        )
+
+    return {"start": start, "stop": stop, "entries": entries, "proof": proof}
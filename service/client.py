@@ -0,0 +1,136 @@
+import math
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from util.util import Aggregation
+from util import wire
+from service import protocol
+
+"""
+Client and load generator for service.server.
+
+- ServiceClient: one connection; info() and query() return decoded results.
+- load: run n_requests queries over `concurrency` connections and collect
+  per-request latencies.
+
+Usage: python -m service.client <socket> [--requests 100] [--concurrency 4] ...
+"""
+
+
+class ServiceClient:
+    """A connection to the prover service."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, path: str) -> "ServiceClient":
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def call(self, request: dict) -> bytes:
+        protocol.write_frame(self.writer, protocol.encode_request(request))
+        await self.writer.drain()
+        response = await protocol.read_frame(self.reader)
+        if response[0] != protocol.OK:
+            raise RuntimeError(bytes(response[1:]).decode())
+        return response[1:]
+
+    async def info(self) -> dict:
+        return json.loads(await self.call({"op": "info"}))
+
+    async def query(
+        self, rows: list[int], aggregation: Aggregation = Aggregation.NONE
+    ) -> bytes:
+        """Raw response of a query; see decode_response."""
+        return await self.call(
+            {"op": "query", "rows": rows, "aggregation": aggregation.value}
+        )
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def decode_response(payload) -> dict:
+    """Decode a query response into the answer and its proofs."""
+    answer, correctness, aggregation, completeness = protocol.unpack_parts(payload)
+    answer_indexes, transposed_answer = wire.decode_answer(answer)
+    return {
+        "answer_indexes": answer_indexes,
+        "transposed_answer": transposed_answer,
+        "correctness": wire.decode_correctness(correctness),
+        "aggregation": wire.decode_aggregation(aggregation) if len(aggregation) else None,
+        "completeness": wire.decode_completeness(completeness),
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of values (q in [0, 100])."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def load(
+    path: str,
+    n_requests: int,
+    concurrency: int,
+    filtered_row: int,
+    aggregation: Aggregation = Aggregation.NONE,
+) -> tuple[list[float], list[int], float]:
+    """Issue n_requests random queries over concurrency connections.
+
+    Returns (latencies in seconds, response sizes in bytes, wall time).
+    """
+    client = await ServiceClient.connect(path)
+    n_row = (await client.info())["n_row"]
+    await client.close()
+
+    latencies, sizes = [], []
+    remaining = iter(range(n_requests))
+
+    async def worker() -> None:
+        client = await ServiceClient.connect(path)
+        try:
+            for _ in remaining:
+                rows = random.sample(range(n_row), filtered_row)
+                start_time = time.perf_counter()
+                response = await client.query(rows, aggregation)
+                latencies.append(time.perf_counter() - start_time)
+                sizes.append(len(response))
+        finally:
+            await client.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, sizes, time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the prover service.")
+    parser.add_argument("socket")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--filtered-row", type=int, default=10)
+    parser.add_argument("--aggregation", type=Aggregation, default=Aggregation.NONE)
+    args = parser.parse_args()
+
+    latencies, sizes, elapsed = asyncio.run(
+        load(
+            args.socket,
+            args.requests,
+            args.concurrency,
+            args.filtered_row,
+            args.aggregation,
+        )
+    )
+
+    print("Requests, Concurrency, Filtered Row, Aggregation, Throughput, p50, p99, Mean Bytes")
+    print(
+        f"{len(latencies)}, {args.concurrency}, {args.filtered_row}, {args.aggregation}, "
+        f"{len(latencies) / elapsed}, {percentile(latencies, 50)}, "
+        f"{percentile(latencies, 99)}, {sum(sizes) / len(sizes)}",
+        flush=True,
+    )
@@ -0,0 +1,59 @@
+import json
+import struct
+
+"""
+Framing shared by the service and its clients.
+
+Every message is a frame: a big-endian uint32 length followed by the payload.
+- Requests are JSON objects: {"op": "info"} or
+  {"op": "query", "rows": [...], "aggregation": "none" | "count" | "sum" | "min"}.
+- Responses start with a status byte. OK is followed by the result: a JSON
+  object for "info", or for "query" the wire-format messages (answer,
+  correctness, aggregation, completeness) packed with pack_parts; an empty
+  part stands for a proof that was not requested. ERROR is followed by a
+  UTF-8 message.
+"""
+
+OK = 0
+ERROR = 1
+
+_FRAME = struct.Struct(">I")
+
+
+async def read_frame(reader) -> bytes:
+    """Read one frame from an asyncio StreamReader (raises IncompleteReadError at EOF)."""
+    (length,) = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    return await reader.readexactly(length)
+
+
+def write_frame(writer, payload: bytes) -> None:
+    writer.write(_FRAME.pack(len(payload)) + payload)
+
+
+def encode_request(request: dict) -> bytes:
+    return json.dumps(request).encode()
+
+
+def decode_request(payload: bytes) -> dict:
+    return json.loads(payload)
+
+
+def pack_parts(parts: list[bytes]) -> bytes:
+    """Concatenate byte strings, each prefixed by its length."""
+    return _FRAME.pack(len(parts)) + b"".join(
+        _FRAME.pack(len(part)) + part for part in parts
+    )
+
+
+def unpack_parts(data) -> list[memoryview]:
+    """Split the output of pack_parts into memoryview slices (no copies)."""
+    view = memoryview(data)
+    (count,) = _FRAME.unpack_from(view, 0)
+    offset = _FRAME.size
+    parts = []
+    for _ in range(count):
+        (length,) = _FRAME.unpack_from(view, offset)
+        offset += _FRAME.size
+        parts.append(view[offset : offset + length])
+        offset += length
+    return parts
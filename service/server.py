@@ -0,0 +1,396 @@
+import os
+import stat
+import json
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from charm.toolbox.pairinggroup import ZR
+
+import main
+from util.util import group, Aggregation, ProverMode, transpose
+from util import fixed_base, keystore, parallel, wire
+from inverted_index import inverted_index
+from inverted_index.inverted_index import CommittedIndex
+from set_accumulator import esa, ptt
+from prover import prover, proof_store
+from prover.opening_cache import OpeningCache
+from service import protocol
+
+"""
+Long-running prover service over a Unix socket.
+
+The table is generated and committed once (main.generate_keys + main.setup).
+Queries (a row selection and an aggregation) are answered by a process pool:
+each worker reopens the key store and restores the committed state exported
+by the server, and returns the serialized answer and proofs (see
+service.protocol for the framing and util.wire for the encoding). In
+ProverMode.PUBLIC the workers open a public-only copy of the key store
+(public_key_path), written without the PointProofs secret key.
+
+Usage: python -m service.server <socket> [--key-path keys.bin] [--n-row 1000] ...
+"""
+
+
+def public_key_path(key_path: str) -> str:
+    """Key store of the PUBLIC-mode workers: key_path without the PointProofs secret key."""
+    return key_path + ".public"
+
+
+class ServiceState:
+    """Keys, table and committed structures needed to answer queries.
+
+    column is the column aggregation proofs are given for (the ESA keys are
+    generated for its minimum). In ProverMode.PUBLIC the state holds no
+    PointProofs secret key: openings come from the public parameters and from
+    a proof store written at creation (store_path).
+    """
+    def __init__(
+        self,
+        sk,
+        pk,
+        dataset_int: list[list[int]],
+        column: int,
+        mode: ProverMode,
+        store_path: str = None,
+    ):
+        self.sk = sk
+        self.pk = pk
+        self.dataset_int = dataset_int
+        self.column = column
+        self.mode = mode
+        self.dataset = main.init_dataset_as_ZR(dataset_int)
+        self.transposed_dataset = transpose(self.dataset)
+        self.min_value = group.init(ZR, min(row[column] for row in dataset_int))
+
+        self.vc_cols = None
+        self.inv_index = None
+        self.committed_index = None
+        self.esa_acc = None
+        self.cache = None
+        self.store_path = store_path
+        self.store = None
+
+    @property
+    def n_row(self) -> int:
+        return len(self.dataset)
+
+    @property
+    def n_col(self) -> int:
+        return len(self.transposed_dataset)
+
+    @classmethod
+    def create(
+        cls,
+        key_path: str,
+        n_row: int,
+        n_col: int,
+        column: int = 0,
+        window: int = fixed_base.DEFAULT_WINDOW,
+        mode: ProverMode = ProverMode.POINT,
+        store_path: str = None,
+    ) -> "ServiceState":
+        """Generate a random table, load (or create) its keys and commit it.
+
+        With mode=ProverMode.PUBLIC every opening is precomputed into a proof
+        store at store_path, the keys without the PointProofs secret key are
+        written to public_key_path(key_path) for the workers, and the secret
+        key is dropped.
+        """
+        if mode == ProverMode.PUBLIC and not store_path:
+            raise ValueError("ProverMode.PUBLIC needs a proof store path")
+
+        dataset_int = main.init_dataset(n_col, n_row)
+        min_value = group.init(ZR, min(row[column] for row in dataset_int))
+        sk, pk = main.generate_keys(n_row, min_value, window, key_path)
+        state = cls(sk, pk, dataset_int, column, mode, store_path)
+
+        fixed_base.clear()
+        fixed_base.precompute_keys(pk.vc_pk, pk.esa_pk, pk.ptt_pk, window=window)
+        state.vc_cols, state.inv_index, state.committed_index, state.esa_acc = main.setup(
+            sk, pk, state.transposed_dataset
+        )
+        if mode == ProverMode.PUBLIC:
+            proof_store.write(
+                store_path,
+                pk.vc_pk,
+                sk.vc_sk,
+                state.vc_cols,
+                state.transposed_dataset,
+                state.committed_index,
+                mode=mode,
+            )
+            keystore.write(
+                public_key_path(key_path),
+                sk.ptt_sk,
+                pk.ptt_pk,
+                None,
+                pk.vc_pk,
+                sk.esa_sk,
+                pk.esa_pk,
+                min_value,
+            )
+            state.open_store()
+        return state
+
+    def open_store(self) -> None:
+        """Map the proof store and forget the PointProofs secret key (PUBLIC mode).
+
+        The store must belong to the committed state (proof_store.ProofStore
+        raises ValueError otherwise), so it is opened after the commitments.
+        """
+        self.store = proof_store.ProofStore(
+            self.store_path, self.vc_cols, self.committed_index
+        )
+        self.sk = main.SK(self.sk.ptt_sk, None, self.sk.esa_sk)
+
+    def export(self) -> dict:
+        """Picklable committed state for restore(); the PTT and PointProofs
+        keys are not included and are read from the key store instead."""
+        esa_sk, esa_pk = self.sk.esa_sk, self.pk.esa_pk
+        return {
+            "dataset": self.dataset_int,
+            "column": self.column,
+            "mode": self.mode.value,
+            "store_path": self.store_path,
+            "esa_keys": [
+                group.serialize(element)
+                for element in (
+                    esa_sk.sk,
+                    esa_pk.g1,
+                    esa_pk.g2,
+                    esa_pk.pk_count,
+                    esa_pk.pk_sum,
+                    esa_pk.pk_min,
+                    esa_pk.pk_min_2,
+                )
+            ],
+            "vc_cols": wire.encode_commitments(self.vc_cols),
+            "esa_acc": parallel.to_ints(self.esa_acc),
+            "index_commitment": group.serialize(self.committed_index.commitment),
+            "index_keys": parallel.to_ints(self.committed_index.keys),
+            "index_accumulators": [
+                group.serialize(acc) for acc in self.committed_index.accumulators
+            ],
+        }
+
+    @classmethod
+    def restore(
+        cls, key_path: str, exported: dict, window: int = fixed_base.DEFAULT_WINDOW
+    ) -> "ServiceState":
+        """Rebuild a state from the key store and the output of export().
+
+        A PUBLIC-mode state must be restored from a public-only key store
+        (public_key_path), so the PointProofs secret key is never read.
+        """
+        mode = ProverMode(exported["mode"])
+        store = keystore.KeyStore(key_path)
+        if mode == ProverMode.PUBLIC and store.has_vc_sk():
+            store.close()
+            raise ValueError(
+                f"{key_path} holds the PointProofs secret key; PUBLIC workers "
+                "need a public-only key store"
+            )
+        ptt_sk, ptt_pk = store.ptt_keys()
+        vc_sk, vc_pk = store.vc_keys()
+        esa_key = [group.deserialize(element) for element in exported["esa_keys"]]
+        esa_sk, esa_pk = esa.SK(esa_key[0]), esa.PK(*esa_key[1:])
+
+        state = cls(
+            main.SK(ptt_sk, vc_sk, esa_sk),
+            main.PK(ptt_pk, vc_pk, esa_pk),
+            exported["dataset"],
+            exported["column"],
+            mode,
+            exported["store_path"],
+        )
+
+        fixed_base.clear()
+        fixed_base.precompute_keys(vc_pk, esa_pk, ptt_pk, window=window)
+        state.vc_cols = wire.decode_commitments(exported["vc_cols"])
+        state.esa_acc = parallel.from_ints(exported["esa_acc"])
+        state.inv_index = inverted_index.build(
+            state.transposed_dataset, state.n_col, state.n_row
+        )
+        keys = parallel.from_ints(exported["index_keys"])
+        state.committed_index = CommittedIndex(
+            group.deserialize(exported["index_commitment"]),
+            keys,
+            [group.deserialize(acc) for acc in exported["index_accumulators"]],
+            trees=[ptt.ProductTree(ptt_sk.sk, state.inv_index[key]) for key in keys],
+        )
+        if state.mode == ProverMode.PUBLIC:
+            state.open_store()
+        return state
+
+    def prove(self, rows: list[int], aggregation: Aggregation) -> bytes:
+        """Answer a query: the selected rows and their proofs, wire-encoded."""
+        if not rows or not all(0 <= row < self.n_row for row in rows):
+            raise ValueError(f"rows must be a non-empty selection of 0..{self.n_row - 1}")
+
+        answer = [[row] + self.dataset[row] for row in rows]
+        answer_inv_index, answer_indexes, transposed_answer = main.answer_index(answer)
+
+        correctness = prover.prove_correctness(
+            vc_pk=self.pk.vc_pk,
+            vc_sk=self.sk.vc_sk,
+            vc_cols=self.vc_cols,
+            transposed_answer=transposed_answer,
+            answer_indexes=answer_indexes,
+            mode=self.mode,
+            cache=self.store if self.store is not None else self.cache,
+            columns=self.transposed_dataset,
+        )
+
+        aggregation_proof = b""
+        if aggregation != Aggregation.NONE:
+            proof, proof_2, value = prover.prove_aggr_correctness(
+                aggregation=aggregation,
+                esa_pk=self.pk.esa_pk,
+                esa_sk=self.sk.esa_sk,
+                acc=self.esa_acc[self.column],
+                dataset=self.transposed_dataset[self.column],
+                min_value=self.min_value,
+            )
+            aggregation_proof = wire.encode_aggregation(aggregation, [proof, proof_2], value)
+
+        completeness = prover.prove_completeness(
+            ptt_sk=self.sk.ptt_sk,
+            ptt_pk=self.pk.ptt_pk,
+            vc_sk=self.sk.vc_sk,
+            vc_pk=self.pk.vc_pk,
+            verified_inverted_index=self.committed_index,
+            answer_inverted_index=answer_inv_index,
+            store=self.store,
+            mode=self.mode,
+        )
+
+        return protocol.pack_parts(
+            [
+                wire.encode_answer(answer_indexes, transposed_answer),
+                wire.encode_correctness(correctness),
+                aggregation_proof,
+                wire.encode_completeness(completeness),
+            ]
+        )
+
+
+_worker_state = None
+
+
+def _init_worker(key_path: str, exported: dict, window: int, cache_size: int) -> None:
+    global _worker_state
+    _worker_state = ServiceState.restore(key_path, exported, window)
+    if cache_size:
+        _worker_state.cache = OpeningCache(cache_size)
+
+
+def _prove(rows: list[int], aggregation: str) -> bytes:
+    return _worker_state.prove(rows, Aggregation(aggregation))
+
+
+class ProverService:
+    """asyncio front end dispatching query requests to a pool of provers.
+
+    With cache_size > 0 every worker keeps an OpeningCache of that many
+    single-row openings (POINT mode only: the cache opens with the secret key,
+    so it is rejected in PUBLIC mode).
+    """
+    def __init__(
+        self,
+        state: ServiceState,
+        key_path: str,
+        workers: int = None,
+        window: int = fixed_base.DEFAULT_WINDOW,
+        cache_size: int = 0,
+    ):
+        if cache_size and state.mode == ProverMode.PUBLIC:
+            raise ValueError("the opening cache needs the secret key (not in PUBLIC mode)")
+        self.state = state
+        if state.mode == ProverMode.PUBLIC:
+            key_path = public_key_path(key_path)
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers or parallel.default_workers(),
+            initializer=_init_worker,
+            initargs=(key_path, state.export(), window, cache_size),
+        )
+
+    async def respond(self, payload: bytes) -> bytes:
+        """Response frame to a request frame; any failure becomes an ERROR response."""
+        try:
+            request = protocol.decode_request(payload)
+            if request["op"] == "info":
+                info = {"n_row": self.state.n_row, "n_col": self.state.n_col}
+                return bytes([protocol.OK]) + json.dumps(info).encode()
+            if request["op"] == "query":
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.pool,
+                    _prove,
+                    list(request["rows"]),
+                    request.get("aggregation", Aggregation.NONE.value),
+                )
+                return bytes([protocol.OK]) + result
+            raise ValueError(f"unknown op {request['op']!r}")
+        except Exception as error:
+            return bytes([protocol.ERROR]) + str(error).encode()
+
+    async def handle(self, reader, writer) -> None:
+        """Serve the requests of one connection in order until it is closed."""
+        try:
+            while True:
+                try:
+                    payload = await protocol.read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                response = await self.respond(payload)
+                protocol.write_frame(writer, response)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, path: str) -> None:
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+
+        server = await asyncio.start_unix_server(self.handle, path=path)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self.pool.shutdown()
+        if self.state.store is not None:
+            self.state.store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve proofs over a Unix socket.")
+    parser.add_argument("socket")
+    parser.add_argument("--key-path", default="keys.bin")
+    parser.add_argument("--n-row", type=int, default=1000)
+    parser.add_argument("--n-col", type=int, default=5)
+    parser.add_argument("--column", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=fixed_base.DEFAULT_WINDOW)
+    parser.add_argument("--prover-mode", type=ProverMode, default=ProverMode.POINT)
+    parser.add_argument("--cache-size", type=int, default=0)
+    parser.add_argument("--proof-store", default=None, help="needed by --prover-mode public")
+    args = parser.parse_args()
+
+    state = ServiceState.create(
+        args.key_path,
+        args.n_row,
+        args.n_col,
+        args.column,
+        args.window,
+        args.prover_mode,
+        args.proof_store,
+    )
+    service = ProverService(
+        state, args.key_path, args.workers, args.window, args.cache_size
+    )
+    print(f"Serving {args.n_row}x{args.n_col} table on {args.socket}", flush=True)
+    try:
+        asyncio.run(service.serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
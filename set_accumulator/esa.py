@@ -1,8 +1,11 @@
 import random
 
-from charm.toolbox.pairinggroup import ZR, G1, G2, pair
+from charm.toolbox.pairinggroup import ZR, G1, G2
 
-from util.util import group, MAXINT
+from util.util import group, MAXINT, ScalarBackend
+from util import scalar
+from util.fixed_base import power
+from util.pairing import pairing_product_is_one
 
 """
 ESA: An expressive zero-knowledge set accumulator and simple aggregation proofs.
@@ -45,20 +48,35 @@ def generate_keys(min: ZR) -> tuple[SK, PK]:
     return SK(sk), PK(g1, g2, pk_count, pk_sum, pk_min, pk_min_2)
 
 
-def compute_accumulator(sk: ZR, dataset: list[ZR]) -> ZR:
+def compute_accumulator(
+    sk: ZR, dataset: list[ZR], backend: ScalarBackend = ScalarBackend.ZR
+) -> ZR:
     """Compute polynomial accumulator A(sk) = Σ sk^i for i in dataset."""
+    if backend == ScalarBackend.NATIVE:
+        return scalar.to_ZR(scalar.sum_of_powers(sk, dataset))
     return sum([sk**i for i in dataset])
 
 
+def update_accumulator(
+    sk: ZR, acc: ZR, added: list[ZR], removed: list[ZR]
+) -> ZR:
+    """Update A(sk) = Σ sk^i after adding and removing elements of the dataset."""
+    return acc + sum([sk**i for i in added]) - sum([sk**i for i in removed])
+
+
 def generate_count_proof(
-    g2: G2, sk: ZR, acc: ZR, dataset: list[ZR]
+    g2: G2,
+    sk: ZR,
+    acc: ZR,
+    dataset: list[ZR],
+    backend: ScalarBackend = ScalarBackend.ZR,
 ) -> tuple[G2, ZR]:
     """Prove COUNT over the set equals acc evaluated at 1.
 
     Returns (proof, count_value=acc).
     """
-    acc_1 = compute_accumulator(1, dataset)
-    proof = g2 ** ((acc - acc_1) / (sk - 1))
+    acc_1 = compute_accumulator(1, dataset, backend)
+    proof = power(g2, (acc - acc_1) / (sk - 1))
     return proof, acc_1
 
 
@@ -66,24 +84,31 @@ def verify_count_proof(
     g1: G1, g2: G2, pk_count: G1, acc: ZR, proof: G2, count: ZR
 ) -> bool:
     """Check e(g1^acc / g1^count, g2) == e(pk_count, proof)."""
-    p1 = pair(g1**acc / g1**count, g2)
-    p2 = pair(pk_count, proof)
-    return p1 == p2
+    return pairing_product_is_one(
+        [power(g1, acc) / power(g1, count), pk_count**-1], [g2, proof]
+    )
 
 
 def generate_sum_proof(
-    g2: G2, sk: ZR, acc: ZR, dataset: list[ZR]
+    g2: G2,
+    sk: ZR,
+    acc: ZR,
+    dataset: list[ZR],
+    backend: ScalarBackend = ScalarBackend.ZR,
 ) -> tuple[G2, ZR, ZR]:
     """Prove SUM over the set by evaluating derivatives at 1.
 
     Returns (proof_1, proof_2=acc, sum_value=acc').
     """
-    acc_1 = compute_accumulator(1, dataset)
-    acc_1d = sum([i * sk ** (i - 1) for i in dataset])
+    acc_1 = compute_accumulator(1, dataset, backend)
+    if backend == ScalarBackend.NATIVE:
+        acc_1d = scalar.to_ZR(scalar.sum_of_derivatives(sk, dataset))
+    else:
+        acc_1d = sum([i * sk ** (i - 1) for i in dataset])
     b_x = (acc - acc_1 - acc_1d * (sk - group.init(ZR, 1))) / (
         (sk - group.init(ZR, 1)) ** 2
     )
-    proof_1 = g2**b_x
+    proof_1 = power(g2, b_x)
     proof_2 = acc_1
     return proof_1, proof_2, acc_1d
 
@@ -92,14 +117,15 @@ def verify_sum_proof(
     g1: G1, g2: G2, pk_sum: G1, pk_count: G1, acc: ZR, proof_1: G2, proof_2: ZR, sum: ZR
 ) -> bool:
     """Check e(g1^acc, g2) == e(pk_sum, proof_1) * e(pk_count^sum * g1^{acc(1)}, g2)."""
-    p1 = pair(g1**acc, g2)
-    p2 = pair(pk_sum, proof_1) * pair((pk_count**sum) * (g1**proof_2), g2)
-    return p1 == p2
+    return pairing_product_is_one(
+        [power(g1, acc) / ((pk_count**sum) * power(g1, proof_2)), pk_sum**-1],
+        [g2, proof_1],
+    )
 
 
 def generate_min_proof(g2: G2, sk: ZR, acc: ZR, min: ZR) -> tuple[G2, ZR]:
     """Prove MIN equals the provided min by showing (acc - sk^min)/(sk^{min+1})."""
-    proof = g2 ** ((acc - sk**min) / sk ** (min + group.init(ZR, 1)))
+    proof = power(g2, (acc - sk**min) / sk ** (min + group.init(ZR, 1)))
     return proof, min
 
 
@@ -107,9 +133,9 @@ def verify_min_proof(
     g1: G1, g2: G2, pk_min: G1, pk_min_2: G1, acc: ZR, proof: G2
 ) -> bool:
     """Check e(g1^acc, g2) == e(pk_min, g2) * e(proof, pk_min_2)."""
-    p1 = pair(g1**acc, g2)
-    p2 = pair(pk_min, g2) * pair(proof, pk_min_2)
-    return p1 == p2
+    return pairing_product_is_one(
+        [power(g1, acc) / pk_min, pk_min_2**-1], [g2, proof]
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,10 @@
 import math
-from charm.toolbox.pairinggroup import ZR, G1, G2, pair
+from charm.toolbox.pairinggroup import ZR, G1, G2
 
-from util.util import group
+from util.util import group, ScalarBackend
+from util import scalar
+from util.fixed_base import power
+from util.pairing import pairing_product_is_one
 
 """
 PTT set accumulator used for subset proofs.
@@ -29,20 +32,100 @@ def generate_keys() -> tuple[SK, PK]:
     return SK(sk), PK(g1, g2)
 
 
-def compute_accumulator(sk: ZR, g1: G1, dataset: list[ZR]) -> G1:
+def compute_accumulator(
+    sk: ZR, g1: G1, dataset: list[ZR], backend: ScalarBackend = ScalarBackend.ZR
+) -> G1:
     """Compute accumulator A = g1^{∏(sk + x)} for all x in dataset."""
-    return g1 ** math.prod(sk + x for x in dataset)
+    if backend == ScalarBackend.NATIVE:
+        return power(g1, scalar.to_ZR(scalar.shifted_product(sk, dataset)))
+    return power(g1, math.prod(sk + x for x in dataset))
+
+
+def update_accumulator(
+    sk: ZR, acc: G1, added: list[ZR], removed: list[ZR]
+) -> G1:
+    """Update A = g1^{∏(sk + x)} after adding and removing elements of the set."""
+    one = group.init(ZR, 1)
+    return acc ** (
+        math.prod((sk + x for x in added), start=one)
+        / math.prod((sk + x for x in removed), start=one)
+    )
+
+
+class ProductTree:
+    """Subproduct tree over (sk + x) for the elements x of one set.
+
+    levels[0] holds the leaves (sk + x) and every node of levels[h + 1] is the
+    product of its two children in levels[h] (an unpaired last node is carried
+    up unchanged). Values are integers mod the group order (see util.scalar).
+    The product over the complement of a k-element subset is assembled from
+    the clean siblings of the subset's leaf-to-root paths: O(k log n) nodes.
+    """
+    def __init__(self, sk: ZR, dataset: list[ZR]):
+        sk = scalar.to_int(sk)
+        self.leaves = {x: i for i, x in enumerate(dataset)}
+        self.levels = [[(sk + scalar.to_int(x)) % scalar.ORDER for x in dataset]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            self.levels.append(
+                [
+                    level[i] * level[i + 1] % scalar.ORDER
+                    if i + 1 < len(level)
+                    else level[i]
+                    for i in range(0, len(level), 2)
+                ]
+            )
+
+    def __len__(self):
+        return len(self.leaves)
+
+    def root(self) -> int:
+        """∏(sk + x) over the whole set."""
+        return self.levels[-1][0] if self.leaves else 1
+
+    def contains(self, subset: list[ZR]) -> bool:
+        return all(x in self.leaves for x in subset)
+
+    def subset_product(self, subset: list[ZR]) -> int:
+        """∏(sk + x) for x in subset; every x must belong to the set."""
+        product = 1
+        for x in subset:
+            product = product * self.levels[0][self.leaves[x]] % scalar.ORDER
+        return product
+
+    def complement_product(self, subset: list[ZR]) -> int:
+        """∏(sk + x) for x in (set \\ subset); elements outside the set are ignored."""
+        dirty = {self.leaves[x] for x in subset if x in self.leaves}
+        if not dirty:
+            return self.root()
+
+        product = 1
+        for level in self.levels[:-1]:
+            for i in dirty:
+                sibling = i ^ 1
+                if sibling < len(level) and sibling not in dirty:
+                    product = product * level[sibling] % scalar.ORDER
+            dirty = {i >> 1 for i in dirty}
+        return product
+
+
+def generate_proof(
+    sk: ZR, g2: G2, dataset: list[ZR], subset: list[ZR], tree: ProductTree = None
+) -> G2:
+    """Generate subset proof π = g2^{∏(sk + x) for x in (dataset \ subset)}.
+
+    With the ProductTree of dataset, the exponent is read from cached nodes.
+    """
+    if tree is not None:
+        return power(g2, scalar.to_ZR(tree.complement_product(subset)))
 
-
-def generate_proof(sk: ZR, g2: G2, dataset: list[ZR], subset: list[ZR]) -> G2:
-    """Generate subset proof π = g2^{∏(sk + x) for x in (dataset \ subset)}."""
     dataset_dif = list(set(dataset) - set(subset))
-    return g2 ** math.prod(sk + x for x in dataset_dif)
+    return power(g2, math.prod(sk + x for x in dataset_dif))
 
 
 def verify_proof(g2: G2, proof: G2, acc_subset: G1, acc_dataset: G1) -> bool:
     """Check e(proof, acc_subset) == e(acc_dataset, g2)."""
-    return pair(proof, acc_subset) == pair(acc_dataset, g2)
+    return pairing_product_is_one([acc_subset, acc_dataset**-1], [proof, g2])
 
 
 if __name__ == "__main__":
@@ -59,3 +142,10 @@ if __name__ == "__main__":
     proof = generate_proof(sk.sk, pk.g2, dataset, subset)
     check = verify_proof(pk.g2, proof, acc_subset, acc_dataset)
     assert check
+
+    tree = ProductTree(sk.sk, dataset)
+    assert power(pk.g1, scalar.to_ZR(tree.root())) == acc_dataset
+    assert generate_proof(sk.sk, pk.g2, dataset, subset, tree) == proof
+    for subset in [[], dataset[:3], dataset[1:], dataset]:
+        expected = generate_proof(sk.sk, pk.g2, dataset, subset)
+        assert generate_proof(sk.sk, pk.g2, dataset, subset, tree) == expected
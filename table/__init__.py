@@ -0,0 +1,2 @@
+from .committed_table import *
+from .columnar import *
@@ -0,0 +1,71 @@
+from collections.abc import Sequence
+import numpy as np
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group, MAXINT, ScalarBackend
+
+"""
+Column-oriented table backed by one NumPy integer array per column.
+
+Cells stay machine integers; a column is converted to Charm ZR elements only
+the first time the crypto asks for it (table[j]), and the conversion is cached.
+Code that can work on integers (the NATIVE scalar backend, inverted index
+construction) reads the arrays directly and never materializes ZR cells.
+"""
+
+
+class ColumnarTable(Sequence):
+    """A table as a sequence of columns, indexed like the transposed dataset.
+
+    table[j] is column j as a list of ZR; table.array(j) is the raw column.
+    """
+    def __init__(self, columns: list[np.ndarray]):
+        self.columns = columns
+        self.cache = {}
+
+    @classmethod
+    def random(cls, n_col: int, n_row: int) -> "ColumnarTable":
+        """Same distribution as main.init_dataset: cells drawn from n_row random values."""
+        rng = np.random.default_rng()
+        values = rng.integers(1, MAXINT, size=n_row, dtype=np.int64, endpoint=True)
+        return cls([rng.choice(values, size=n_row) for _ in range(n_col)])
+
+    @classmethod
+    def from_rows(cls, dataset: list[list[int]]) -> "ColumnarTable":
+        """Build a table from a row-major list of integers (int64, as random uses)."""
+        return cls([np.array(column, dtype=np.int64) for column in zip(*dataset)])
+
+    @property
+    def n_row(self) -> int:
+        return len(self.columns[0])
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[k] for k in range(*j.indices(len(self)))]
+
+        column = self.cache.get(j)
+        if column is None:
+            column = [group.init(ZR, value) for value in self.columns[j].tolist()]
+            self.cache[j] = column
+        return column
+
+    def array(self, j: int) -> np.ndarray:
+        return self.columns[j]
+
+    def values(self, j: int, backend: ScalarBackend = ScalarBackend.ZR):
+        """Column j in the form the given scalar backend consumes."""
+        return self.columns[j] if backend == ScalarBackend.NATIVE else self[j]
+
+    def row(self, i: int) -> list[ZR]:
+        """Row i as ZR elements, converted without touching the column cache."""
+        return [group.init(ZR, int(column[i])) for column in self.columns]
+
+    def min(self, j: int) -> int:
+        return int(self.columns[j].min())
+
+    def release(self) -> None:
+        """Drop the cached ZR columns."""
+        self.cache.clear()
@@ -0,0 +1,322 @@
+from collections import defaultdict
+from charm.toolbox.pairinggroup import ZR, G1
+
+from vector_commitments import pointproofs
+from set_accumulator import ptt, esa
+from inverted_index.inverted_index import CommittedIndex
+from prover import prover
+
+from util.util import group, encode_pair, hash_to_ZR, Aggregation
+
+"""
+Committed table with incremental maintenance of its authenticated structures.
+
+Row inserts, updates and deletes are applied to the column commitments
+(pointproofs.update_commit), the ESA accumulators, the inverted index postings
+and the committed inverted index, so a single-row change costs O(n_col) group
+operations instead of a full setup.
+"""
+
+
+class CommittedTable:
+    """A table together with the structures built by main.setup.
+
+    sk and pk are the main.SK / main.PK key bundles. Deleted rows keep their
+    position: their cells are committed as 0 and their postings are removed.
+    Keys whose posting list becomes empty keep their position in the committed
+    index. esa_acc only accumulates live rows, so aggregations must be proven
+    over live_column (see prove_aggregation). ESA keys depend on the column
+    minimum (esa_min, the value esa.generate_keys was called with) and are
+    not refreshed here: MIN can only be proven while a column's live minimum
+    is esa_min.
+
+    Rows and index keys can be added up to the length N of the PointProofs key;
+    beyond it the commitments would need the excluded power α^{N+1}.
+    """
+    def __init__(
+        self,
+        sk,
+        pk,
+        transposed_dataset: list[list[ZR]],
+        vc_cols: list[G1],
+        inv_index: dict[ZR, list[int]],
+        committed_index: CommittedIndex,
+        esa_acc: list[ZR],
+        esa_min: ZR = None,
+    ):
+        self.sk = sk
+        self.pk = pk
+        self.transposed_dataset = transposed_dataset
+        self.vc_cols = vc_cols
+        self.inv_index = inv_index
+        self.committed_index = committed_index
+        self.esa_acc = esa_acc
+        self.esa_min = esa_min
+        self.deleted = set()
+
+    @property
+    def n_row(self) -> int:
+        return len(self.transposed_dataset[0])
+
+    @property
+    def capacity(self) -> int:
+        """Length N of the vectors the PointProofs key can commit."""
+        return len(self.pk.vc_pk.pk_g2)
+
+    def row(self, row: int) -> list[ZR]:
+        return [col[row] for col in self.transposed_dataset]
+
+    def live_column(self, j: int) -> list[ZR]:
+        """Values of column j in the rows that have not been deleted."""
+        return [
+            value
+            for row, value in enumerate(self.transposed_dataset[j])
+            if row not in self.deleted
+        ]
+
+    def prove_aggregation(self, aggregation: Aggregation, j: int):
+        """prover.prove_aggr_correctness of column j over its live rows.
+
+        MIN raises ValueError when the live minimum of column j is not the
+        minimum the ESA keys were generated for: its proof would not verify.
+        """
+        values = self.live_column(j)
+        min_value = min(values, key=int)
+        if aggregation == Aggregation.MIN and min_value != self.esa_min:
+            raise ValueError(
+                f"the live minimum of column {j} is not the ESA key minimum {self.esa_min}"
+            )
+        return prover.prove_aggr_correctness(
+            aggregation=aggregation,
+            esa_pk=self.pk.esa_pk,
+            esa_sk=self.sk.esa_sk,
+            acc=self.esa_acc[j],
+            dataset=values,
+            min_value=min_value,
+        )
+
+    def insert_row(self, values: list[ZR]) -> int:
+        """Append a row and return its index."""
+        row = self.n_row
+        if row >= self.capacity:
+            raise ValueError(
+                f"the PointProofs key commits at most {self.capacity} rows"
+            )
+        zero = group.init(ZR, 0)
+        for col in self.transposed_dataset:
+            col.append(zero)
+
+        self._apply(row, [zero] * len(values), values, old_present=False)
+        return row
+
+    def update_row(self, row: int, values: list[ZR]) -> None:
+        """Replace the values of an existing row."""
+        self._check_live(row)
+        self._apply(row, self.row(row), values)
+
+    def delete_row(self, row: int) -> None:
+        """Delete a row, leaving an empty (zero) slot at its position."""
+        self._check_live(row)
+        values = self.row(row)
+        self._apply(row, values, [group.init(ZR, 0)] * len(values), new_present=False)
+        self.deleted.add(row)
+
+    def _check_live(self, row: int) -> None:
+        if row in self.deleted:
+            raise ValueError(f"row {row} has been deleted")
+
+    def _apply(
+        self,
+        row: int,
+        old_values: list[ZR],
+        new_values: list[ZR],
+        old_present: bool = True,
+        new_present: bool = True,
+    ) -> None:
+        if new_present:
+            self._check_index_capacity(
+                new
+                for old, new in zip(old_values, new_values)
+                if old != new or not old_present
+            )
+
+        added = defaultdict(list)
+        removed = defaultdict(list)
+
+        for j, (old, new) in enumerate(zip(old_values, new_values)):
+            if old == new and old_present == new_present:
+                continue
+
+            self.vc_cols[j] = pointproofs.update_commit(
+                g1=self.pk.vc_pk.g1,
+                v_commit=self.vc_cols[j],
+                sk=self.sk.vc_sk.sk,
+                idxs=[row],
+                messages=[old],
+                new_messages=[new],
+            )
+            self.esa_acc[j] = esa.update_accumulator(
+                sk=self.sk.esa_sk.sk,
+                acc=self.esa_acc[j],
+                added=[new] if new_present else [],
+                removed=[old] if old_present else [],
+            )
+            self.transposed_dataset[j][row] = new
+
+            # main.setup indexes the transposed table: postings are (column, row).
+            posting = encode_pair(j, row)
+            if old_present:
+                self.inv_index[old].remove(posting)
+                removed[old].append(posting)
+            if new_present:
+                self.inv_index[new].append(posting)
+                added[new].append(posting)
+
+        self._update_committed_index(added, removed)
+
+    def _check_index_capacity(self, keys) -> None:
+        """Reject a change that would append index keys beyond the key length."""
+        new_keys = {key for key in keys if key not in self.committed_index.positions}
+        if len(self.committed_index.keys) + len(new_keys) > self.capacity:
+            raise ValueError(
+                f"the PointProofs key commits at most {self.capacity} index keys"
+            )
+
+    def _update_committed_index(
+        self, added: dict[ZR, list[int]], removed: dict[ZR, list[int]]
+    ) -> None:
+        """Refresh the committed entries of the keys whose postings changed."""
+        index = self.committed_index
+        positions, old_messages, new_messages = [], [], []
+
+        # New keys are appended in the order they entered the inverted index.
+        for key in dict.fromkeys([*removed, *added]):
+            if key in index.positions:
+                position = index.position(key)
+                acc = index.accumulators[position]
+                old_message = index.messages[position]
+            else:
+                position = None
+                acc = self.pk.ptt_pk.g1
+                old_message = group.init(ZR, 0)
+
+            acc = ptt.update_accumulator(
+                sk=self.sk.ptt_sk.sk,
+                acc=acc,
+                added=added.get(key, []),
+                removed=removed.get(key, []),
+            )
+            message = hash_to_ZR(
+                pointproofs.commit(
+                    g1=self.pk.vc_pk.g1,
+                    messages=[key, hash_to_ZR(acc)],
+                    sk=self.sk.vc_sk.sk,
+                )
+            )
+            tree = ptt.ProductTree(self.sk.ptt_sk.sk, self.inv_index[key])
+
+            if position is None:
+                position = index.append(key, acc, message, tree)
+            else:
+                index.accumulators[position] = acc
+                index.messages[position] = message
+                if index.trees is not None:
+                    index.trees[position] = tree
+
+            positions.append(position)
+            old_messages.append(old_message)
+            new_messages.append(message)
+
+        if positions:
+            index.commitment = pointproofs.update_commit(
+                g1=self.pk.vc_pk.g1,
+                v_commit=index.commitment,
+                sk=self.sk.vc_sk.sk,
+                idxs=positions,
+                messages=old_messages,
+                new_messages=new_messages,
+            )
+
+
+if __name__ == "__main__":
+    import main
+    from inverted_index import inverted_index
+    from verifier import verifier
+    from util.util import transpose
+
+    def ZRs(values):
+        return [group.init(ZR, value) for value in values]
+
+    # Few distinct values, so the index keys fit the key length like the rows.
+    n_col, n_row, capacity = 3, 8, 12
+    dataset = [ZRs([(3 * i + j) % 5 + 1 for j in range(n_col)]) for i in range(n_row)]
+    esa_min = group.init(ZR, 1)
+    sk, pk = main.generate_keys(capacity, esa_min)
+    structures = main.setup(sk, pk, transpose(dataset))
+    table = CommittedTable(sk, pk, transpose(dataset), *structures, esa_min)
+
+    table.insert_row(ZRs([2, 9, 4]))
+    table.update_row(0, ZRs([7, 1, 3]))
+    table.delete_row(2)
+    table.delete_row(5)
+
+    # Column commitments are recomputed over the table, deleted slots being 0.
+    vc_cols, _, _, _ = main.setup(sk, pk, table.transposed_dataset)
+    assert table.vc_cols == vc_cols
+
+    # Accumulators and the committed index are recomputed over the live rows;
+    # the index keeps its key order, with empty posting lists for dropped keys.
+    live = [table.live_column(j) for j in range(n_col)]
+    assert table.esa_acc == [
+        esa.compute_accumulator(sk.esa_sk.sk, values) for values in live
+    ]
+    postings = {key: [] for key in table.committed_index.keys}
+    for j, column in enumerate(table.transposed_dataset):
+        for row, value in enumerate(column):
+            if row not in table.deleted:
+                postings[value].append(encode_pair(j, row))
+    committed = inverted_index.build_committed(
+        pk.vc_pk, sk.vc_sk, postings, sk.ptt_sk, pk.ptt_pk
+    )
+    assert table.committed_index.commitment == committed.commitment
+
+    # COUNT and MIN ignore the deleted rows.
+    proof, proof_2, count = table.prove_aggregation(Aggregation.COUNT, 0)
+    assert int(count) == n_row + 1 - 2
+    assert verifier.verify_aggr_correctness(
+        Aggregation.COUNT, pk.esa_pk, table.esa_acc[0], [proof, proof_2], count
+    )
+    proof, proof_2, minimum = table.prove_aggregation(Aggregation.MIN, 1)
+    assert int(minimum) == min(map(int, live[1]))
+    assert verifier.verify_aggr_correctness(
+        Aggregation.MIN, pk.esa_pk, table.esa_acc[1], [proof, proof_2], minimum
+    )
+    # Column 0 lost its minimum row: its MIN no longer matches the ESA keys.
+    try:
+        table.prove_aggregation(Aggregation.MIN, 0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("MIN proven against a stale ESA key minimum")
+
+    # Rows and index keys cannot go beyond the key length; a rejected change
+    # leaves the table untouched.
+    while table.n_row < capacity:
+        table.insert_row(ZRs([1, 2, 3]))
+    try:
+        table.insert_row(ZRs([1, 2, 3]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("row capacity not enforced")
+
+    for k in range(1, capacity):
+        values = table.row(1)
+        try:
+            table.update_row(1, ZRs([100 + n_col * k + j for j in range(n_col)]))
+        except ValueError:
+            assert table.row(1) == values
+            assert len(table.committed_index.keys) <= capacity
+            break
+    else:
+        raise AssertionError("index capacity not enforced")
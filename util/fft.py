@@ -0,0 +1,101 @@
+from util import scalar
+
+"""
+Radix-2 FFT over the scalar field and over G1/G2.
+
+The scalar field of BN254 has a multiplicative subgroup of order 2^TWO_ADICITY,
+so transforms of any power-of-two size up to that are available.
+
+- root_of_unity: primitive size-th root of unity, or None if there is none.
+- fft: transform of a list of integers mod the group order.
+- group_fft: the same transform "in the exponent" of a list of group elements,
+  i.e. out_k = ∏_j values_j^{root^{jk}}.
+"""
+
+
+def _two_adicity(n: int) -> int:
+    return (n & -n).bit_length() - 1
+
+
+TWO_ADICITY = _two_adicity(int(scalar.ORDER) - 1)
+
+
+def _two_adic_generator() -> int:
+    """Generator of the subgroup of order 2^TWO_ADICITY."""
+    order = int(scalar.ORDER)
+    odd = (order - 1) >> TWO_ADICITY
+    for candidate in range(2, 1000):
+        # A quadratic non-residue raised to the odd part has full 2-power order.
+        if pow(candidate, (order - 1) // 2, order) == order - 1:
+            return pow(candidate, odd, order)
+    raise ValueError("no quadratic non-residue found")
+
+
+_generator = None
+
+
+def root_of_unity(size: int) -> int:
+    """Primitive size-th root of unity (size a power of two), or None if none exists."""
+    global _generator
+    log_size = size.bit_length() - 1
+    if size != 1 << log_size or log_size > TWO_ADICITY:
+        return None
+    if _generator is None:
+        _generator = _two_adic_generator()
+    return pow(_generator, 1 << (TWO_ADICITY - log_size), int(scalar.ORDER))
+
+
+def _bit_reverse(values: list) -> list:
+    n = len(values)
+    bits = n.bit_length() - 1
+    return [values[int(format(i, f"0{bits}b")[::-1], 2) if bits else 0] for i in range(n)]
+
+
+def _twiddles(root: int, n: int) -> list[int]:
+    twiddles = [1] * (n // 2)
+    for i in range(1, n // 2):
+        twiddles[i] = twiddles[i - 1] * root % scalar.ORDER
+    return twiddles
+
+
+def fft(values: list[int], root: int) -> list[int]:
+    """out_k = Σ_j values_j root^{jk} mod the group order; len(values) is a power of two."""
+    n = len(values)
+    values = _bit_reverse([value % scalar.ORDER for value in values])
+    twiddles = _twiddles(root, n)
+
+    size = 2
+    while size <= n:
+        half, step = size // 2, n // size
+        for start in range(0, n, size):
+            for k in range(half):
+                u = values[start + k]
+                v = values[start + k + half] * twiddles[k * step] % scalar.ORDER
+                values[start + k] = (u + v) % scalar.ORDER
+                values[start + k + half] = (u - v) % scalar.ORDER
+        size *= 2
+    return values
+
+
+def group_fft(values: list, root: int) -> list:
+    """out_k = ∏_j values_j^{root^{jk}}; len(values) is a power of two.
+
+    Costs (n / 2) log n exponentiations and n log n multiplications.
+    """
+    n = len(values)
+    values = _bit_reverse(list(values))
+    twiddles = [scalar.to_ZR(twiddle) for twiddle in _twiddles(root, n)]
+
+    size = 2
+    while size <= n:
+        half, step = size // 2, n // size
+        for start in range(0, n, size):
+            for k in range(half):
+                u = values[start + k]
+                v = values[start + k + half]
+                if k:
+                    v = v ** twiddles[k * step]
+                values[start + k] = u * v
+                values[start + k + half] = u / v
+        size *= 2
+    return values
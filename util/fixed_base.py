@@ -0,0 +1,151 @@
+import math
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group
+
+"""
+Fixed-base exponentiation with windowed precomputation tables.
+
+- FixedBaseTable: powers base^{d * 2^{w*j}} for every w-bit digit d, so that
+  base^e costs ceil(bits / w) multiplications instead of a full exponentiation.
+- precompute/precompute_keys: build tables and register them for power().
+- power: base ** exponent, served from a registered table when there is one.
+- dump/load: persist the registered tables next to the keys; loaded tables
+  are picked up by precompute() instead of being rebuilt.
+
+Tables are registered by the identity of their base object, so power() on a
+base without a table costs one dictionary lookup and no serialization.
+Callers keep using the same key objects (key stores cache the elements they
+deserialize), and every table holds its base, so a registered id is never
+reused by another object.
+
+The window size w is the memory/speed knob: each table holds
+ceil(bits / w) * (2^w - 1) group elements.
+"""
+
+DEFAULT_WINDOW = 4
+
+_tables = {}
+# Tables read by load(), by serialized base, until precompute() registers them.
+_loaded = {}
+
+
+class FixedBaseTable:
+    """Windowed precomputation table for a single fixed base."""
+    def __init__(self, base, window: int = DEFAULT_WINDOW, rows: list = None):
+        self.base = base
+        self.window = window
+        self.rows = rows if rows is not None else self._build()
+
+    def _build(self) -> list[list]:
+        n_rows = math.ceil(group.order().bit_length() / self.window)
+        rows = []
+        row_base = self.base
+        for _ in range(n_rows):
+            row = [row_base]
+            for _ in range(2, 1 << self.window):
+                row.append(row[-1] * row_base)
+            rows.append(row)
+            row_base = row[-1] * row_base
+        return rows
+
+    def pow(self, exponent):
+        """Return base^exponent for a ZR or integer exponent."""
+        exponent = int(exponent) % group.order()
+        mask = (1 << self.window) - 1
+
+        result = None
+        for row in self.rows:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = row[digit - 1] if result is None else result * row[digit - 1]
+            exponent >>= self.window
+
+        if result is None:
+            return self.base ** group.init(ZR, 0)
+        return result
+
+
+def precompute(base, window: int = DEFAULT_WINDOW) -> FixedBaseTable:
+    """Build (or reuse) the table for base and register it for power()."""
+    table = _tables.get(id(base))
+    if table is None or table.window != window:
+        table = _loaded.pop(group.serialize(base), None) if _loaded else None
+        if table is None or table.window != window:
+            table = FixedBaseTable(base, window)
+        table.base = base
+        _tables[id(base)] = table
+    return table
+
+
+def precompute_keys(
+    vc_pk=None, esa_pk=None, ptt_pk=None, window: int = DEFAULT_WINDOW, hot: int = 2
+) -> None:
+    """Register tables for the generators of each PK and the hot PointProofs elements.
+
+    hot is the number of leading positions whose pk_g1/pk_g2 elements get a
+    table (positions 0 and 1 are opened for every key by the completeness proofs).
+    """
+    bases = []
+    if vc_pk is not None:
+        bases += [vc_pk.g1, vc_pk.g2, vc_pk.pk_gt]
+        bases += vc_pk.pk_g1[:hot]
+        bases += [vc_pk.pk_g2[len(vc_pk.pk_g2) - (i + 1)] for i in range(hot)]
+    if esa_pk is not None:
+        bases += [esa_pk.g1, esa_pk.g2]
+    if ptt_pk is not None:
+        bases += [ptt_pk.g1, ptt_pk.g2]
+
+    for base in bases:
+        precompute(base, window)
+
+
+def power(base, exponent):
+    """Compute base ** exponent, using a registered fixed-base table if available."""
+    table = _tables.get(id(base))
+    if table is None:
+        return base**exponent
+    return table.pow(exponent)
+
+
+def clear() -> None:
+    """Drop every registered (and loaded) table."""
+    _tables.clear()
+    _loaded.clear()
+
+
+def dump(path: str) -> None:
+    """Persist the registered tables (one serialized element per line)."""
+    with open(path, "wb") as table_file:
+        for table in _tables.values():
+            table_file.write(b"%d %d\n" % (table.window, len(table.rows)))
+            table_file.write(group.serialize(table.base) + b"\n")
+            for row in table.rows:
+                for element in row:
+                    table_file.write(group.serialize(element) + b"\n")
+
+
+def load(path: str) -> None:
+    """Read the tables previously written by dump().
+
+    They are registered by the precompute() (or precompute_keys()) call for
+    their base, which then skips building them.
+    """
+    with open(path, "rb") as table_file:
+        lines = table_file.read().split(b"\n")
+
+    pos = 0
+    while pos < len(lines) and lines[pos]:
+        window, n_rows = map(int, lines[pos].split())
+        base = group.deserialize(lines[pos + 1])
+        pos += 2
+
+        row_len = (1 << window) - 1
+        rows = []
+        for _ in range(n_rows):
+            rows.append([group.deserialize(line) for line in lines[pos : pos + row_len]])
+            pos += row_len
+
+        _loaded[group.serialize(base)] = FixedBaseTable(base, window, rows)
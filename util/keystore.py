@@ -0,0 +1,185 @@
+import mmap
+import struct
+from collections.abc import Sequence
+
+from util.util import group
+
+from vector_commitments import pointproofs
+from set_accumulator import ptt, esa
+
+"""
+Binary key store for the PointProofs, PTT and ESA parameters.
+
+Layout (little endian):
+- header: magic, version, number of sections;
+- section table: name, element count, record width, data offset;
+- sections: fixed-width records, each a serialized element padded with NUL bytes.
+
+Keys are written once with write() and reopened with KeyStore, which maps the
+file and deserializes each element the first time it is accessed.
+"""
+
+MAGIC = b"ZKVSKEYS"
+VERSION = 2
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<16sQIQ")
+
+
+class LazyElements(Sequence):
+    """Read-only list of group elements backed by fixed-width records in a buffer."""
+    def __init__(self, buffer, offset: int, count: int, width: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.width = width
+        self.cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("key store index out of range")
+
+        element = self.cache.get(index)
+        if element is None:
+            start = self.offset + index * self.width
+            record = bytes(self.buffer[start : start + self.width]).rstrip(b"\0")
+            element = group.deserialize(record)
+            self.cache[index] = element
+        return element
+
+
+def write(
+    path: str,
+    ptt_sk: ptt.SK,
+    ptt_pk: ptt.PK,
+    vc_sk: pointproofs.SK,
+    vc_pk: pointproofs.PK,
+    esa_sk: esa.SK,
+    esa_pk: esa.PK,
+    esa_min,
+) -> None:
+    """Serialize the keys of all three schemes into a single key-store file.
+
+    With vc_sk=None the PointProofs secret powers are left out: the file then
+    only serves provers that work from the public parameters.
+    """
+    sections = {
+        "ptt.sk": [ptt_sk.sk],
+        "ptt.g1": [ptt_pk.g1],
+        "ptt.g2": [ptt_pk.g2],
+        "vc.sk": vc_sk.sk if vc_sk is not None else [],
+        "vc.g1": [vc_pk.g1],
+        "vc.g2": [vc_pk.g2],
+        "vc.pk_g1": vc_pk.pk_g1,
+        "vc.pk_g2": vc_pk.pk_g2,
+        "vc.pk_gt": [vc_pk.pk_gt],
+        "esa.sk": [esa_sk.sk],
+        "esa.min": [esa_min],
+        "esa.g1": [esa_pk.g1],
+        "esa.g2": [esa_pk.g2],
+        "esa.pk_count": [esa_pk.pk_count],
+        "esa.pk_sum": [esa_pk.pk_sum],
+        "esa.pk_min": [esa_pk.pk_min],
+        "esa.pk_min_2": [esa_pk.pk_min_2],
+    }
+
+    write_sections(path, sections)
+
+
+def write_sections(path: str, sections: dict[str, list], magic: bytes = MAGIC) -> None:
+    """Write named lists of group elements as sections of fixed-width records."""
+    records = {
+        name: [group.serialize(element) for element in elements]
+        for name, elements in sections.items()
+    }
+
+    offset = _HEADER.size + _SECTION.size * len(records)
+    table = []
+    for name, serialized in records.items():
+        width = max((len(record) for record in serialized), default=0)
+        table.append((name, len(serialized), width, offset))
+        offset += len(serialized) * width
+
+    with open(path, "wb") as key_file:
+        key_file.write(_HEADER.pack(magic, VERSION, len(table)))
+        for name, count, width, offset in table:
+            key_file.write(_SECTION.pack(name.encode(), count, width, offset))
+        for (_, _, width, _), serialized in zip(table, records.values()):
+            key_file.write(b"".join(record.ljust(width, b"\0") for record in serialized))
+
+
+def read_sections(buffer, path: str, magic: bytes = MAGIC) -> dict[str, LazyElements]:
+    """Sections of a file written by write_sections, keyed by name."""
+    file_magic, version, n_sections = _HEADER.unpack_from(buffer, 0)
+    if file_magic != magic or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} {magic.decode()} file")
+
+    sections = {}
+    for i in range(n_sections):
+        name, count, width, offset = _SECTION.unpack_from(
+            buffer, _HEADER.size + i * _SECTION.size
+        )
+        sections[name.rstrip(b"\0").decode()] = LazyElements(buffer, offset, count, width)
+    return sections
+
+
+class KeyStore:
+    """Memory-mapped view over a key-store file written by write()."""
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.sections = read_sections(self.buffer, path)
+
+    def _one(self, name: str):
+        return self.sections[name][0]
+
+    def vector_length(self) -> int:
+        """Largest vector length N the PointProofs parameters support."""
+        return len(self.sections["vc.pk_g2"])
+
+    def esa_min(self):
+        """Minimum domain value the ESA parameters were generated for."""
+        return self._one("esa.min")
+
+    def ptt_keys(self) -> tuple[ptt.SK, ptt.PK]:
+        return ptt.SK(self._one("ptt.sk")), ptt.PK(
+            self._one("ptt.g1"), self._one("ptt.g2")
+        )
+
+    def has_vc_sk(self) -> bool:
+        """False for a file written without the PointProofs secret powers."""
+        return len(self.sections["vc.sk"]) > 0
+
+    def vc_keys(self) -> tuple[pointproofs.SK, pointproofs.PK]:
+        """PointProofs keys; the secret key is None in a public-only file."""
+        sk = pointproofs.SK(self.sections["vc.sk"]) if self.has_vc_sk() else None
+        return sk, pointproofs.PK(
+            self._one("vc.g1"),
+            self._one("vc.g2"),
+            self.sections["vc.pk_g1"],
+            self.sections["vc.pk_g2"],
+            self._one("vc.pk_gt"),
+        )
+
+    def esa_keys(self) -> tuple[esa.SK, esa.PK]:
+        return esa.SK(self._one("esa.sk")), esa.PK(
+            self._one("esa.g1"),
+            self._one("esa.g2"),
+            self._one("esa.pk_count"),
+            self._one("esa.pk_sum"),
+            self._one("esa.pk_min"),
+            self._one("esa.pk_min_2"),
+        )
+
+    def close(self) -> None:
+        self.buffer.close()
+        self.file.close()
@@ -1,5 +1,10 @@
 import os
 import json
+import time
+import atexit
+import resource
+import tracemalloc
+from collections import defaultdict
 
 """
 Lightweight file logger for experiment runs.
@@ -7,6 +12,14 @@ Lightweight file logger for experiment runs.
 - Creates a new run directory under time_experiments (run_0, run_1, ...).
 - Optionally writes a CSV header on initialization.
 - Provides helpers to persist configuration (JSON) and append results rows.
+- Appends per-phase operation counters (util.profiler) to counters.csv.
+- Appends one JSON-lines record per round (its configuration, phase timings
+  and memory peaks) to results.jsonl.
+
+Rows and records are buffered in memory and written by flush(), so callers
+can keep file I/O out of timed sections; the buffer is also flushed at exit.
+PhaseRecorder measures the phases of a round with perf_counter and, when
+asked to, their tracemalloc and RSS peaks.
 """
 
 class Logger:
@@ -30,6 +43,9 @@ class Logger:
 
         print("Experiments will be saved to: ", self.savepath, flush=True)
 
+        self.buffer = defaultdict(list)
+        atexit.register(self.flush)
+
         if header is not None:
             info = header
             with open(os.path.join(self.savepath, "results.csv"), "a") as results_file:
@@ -42,6 +58,105 @@ class Logger:
             json.dump(config, config_file, sort_keys=True, indent=4)
 
     def log_results(self, info, file_name: str = "results.csv") -> None:
-        info = ",".join(info) + "\n"
-        with open(os.path.join(self.savepath, file_name), "a") as results_file:
-            results_file.write(info)
+        self.buffer[file_name].append(",".join(info) + "\n")
+
+    def log_record(self, record: dict, file_name: str = "results.jsonl") -> None:
+        """Buffer one JSON-lines record (e.g. a round with its configuration).
+
+        Values JSON cannot encode (such as query predicates) are written as str.
+        """
+        self.buffer[file_name].append(
+            json.dumps(record, sort_keys=True, default=str) + "\n"
+        )
+
+    def flush(self) -> None:
+        """Write every buffered row and record to its file."""
+        for file_name, lines in self.buffer.items():
+            with open(os.path.join(self.savepath, file_name), "a") as log_file:
+                log_file.writelines(lines)
+        self.buffer.clear()
+
+    def log_counters(
+        self, info: dict, counters: dict, file_name: str = "counters.csv"
+    ) -> None:
+        """Append one row per phase: the info columns, the phase and its counters.
+
+        The header (info keys, "Phase", counter names) is written with the first rows.
+        """
+        path = os.path.join(self.savepath, file_name)
+        rows = []
+        if not os.path.exists(path) and not self.buffer[file_name] and counters:
+            first = next(iter(counters.values()))
+            rows.append(list(info) + ["Phase"] + list(first))
+        for phase, values in counters.items():
+            rows.append(
+                [str(value) for value in info.values()]
+                + [phase]
+                + [str(value) for value in values.values()]
+            )
+
+        self.buffer[file_name].extend(",".join(row) + "\n" for row in rows)
+
+
+def _rss_peak_kib() -> int:
+    """Peak resident set size in KiB (since the last _reset_rss_peak on Linux)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _reset_rss_peak() -> None:
+    # Linux resets VmHWM to the current RSS when "5" is written to clear_refs.
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+class PhaseRecorder:
+    """perf_counter timings of named phases, with optional memory peaks.
+
+    With memory=True each phase also records the peak of Python allocations
+    above the phase start (tracemalloc; Charm elements live in C memory and
+    are not traced) and the peak RSS of the process during the phase.
+    tracemalloc slows allocation-heavy code, so timings taken with
+    memory=True are not comparable with timings taken without it.
+    """
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.results = {}
+        self.name = None
+        self.start_time = 0.0
+        self.traced = 0
+        self.owns_tracing = memory and not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start()
+
+    def start(self, name: str) -> None:
+        self.name = name
+        if self.memory:
+            tracemalloc.reset_peak()
+            self.traced = tracemalloc.get_traced_memory()[0]
+            _reset_rss_peak()
+        self.start_time = time.perf_counter()
+
+    def stop(self) -> float:
+        """End the current phase and return its duration in seconds."""
+        elapsed = time.perf_counter() - self.start_time
+        result = {"time": elapsed}
+        if self.memory:
+            result["tracemalloc_peak"] = tracemalloc.get_traced_memory()[1] - self.traced
+            result["rss_peak_kib"] = _rss_peak_kib()
+        self.results[self.name] = result
+        self.name = None
+        return elapsed
+
+    def close(self) -> None:
+        if self.owns_tracing:
+            tracemalloc.stop()
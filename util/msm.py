@@ -0,0 +1,73 @@
+import math
+
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group
+from util.fixed_base import power
+
+"""
+Multi-scalar multiplication (multi-exponentiation) over G1/G2.
+
+- multi_exp: computes ∏ base_i^{scalar_i} with the Pippenger bucket method,
+  falling back to independent exponentiations for small inputs.
+- naive_multi_exp: the reference ∏ base_i^{scalar_i} loop.
+"""
+
+# Below this many terms the bucket bookkeeping costs more than it saves.
+NAIVE_THRESHOLD = 32
+
+
+def naive_multi_exp(bases: list, scalars: list):
+    """Compute ∏ base_i^{scalar_i} with one exponentiation per term."""
+    return math.prod(power(base, scalar) for base, scalar in zip(bases, scalars))
+
+
+def window_size(n: int) -> int:
+    """Pick the Pippenger window width (in bits) for n terms."""
+    return max(2, n.bit_length() - 3)
+
+
+def multi_exp(bases: list, scalars: list, window: int = None):
+    """Compute ∏ base_i^{scalar_i} for group elements in G1 or G2.
+
+    Scalars may be ZR elements or Python integers. Each window of `window`
+    bits is handled by dropping every base into the bucket of its digit and
+    combining the buckets with a running product, so the cost is roughly
+    (bits / window) * (n + 2^window) group multiplications instead of n
+    full exponentiations.
+    """
+    if len(bases) < NAIVE_THRESHOLD:
+        return naive_multi_exp(bases, scalars)
+
+    order = group.order()
+    scalars = [int(scalar) % order for scalar in scalars]
+    c = window or window_size(len(bases))
+    mask = (1 << c) - 1
+    bits = max(scalar.bit_length() for scalar in scalars)
+
+    result = None
+    for shift in reversed(range(0, bits, c)):
+        if result is not None:
+            result = result ** (1 << c)
+
+        buckets = [None] * mask
+        for base, scalar in zip(bases, scalars):
+            digit = (scalar >> shift) & mask
+            if digit:
+                bucket = buckets[digit - 1]
+                buckets[digit - 1] = base if bucket is None else bucket * base
+
+        # ∏ bucket_d^d as a running product from the highest digit down.
+        running, window_sum = None, None
+        for bucket in reversed(buckets):
+            if bucket is not None:
+                running = bucket if running is None else running * bucket
+            if running is not None:
+                window_sum = running if window_sum is None else window_sum * running
+
+        if window_sum is not None:
+            result = window_sum if result is None else result * window_sum
+
+    if result is None:
+        return bases[0] ** group.init(ZR, 0)
+    return result
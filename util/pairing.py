@@ -0,0 +1,24 @@
+from charm.toolbox.pairinggroup import G1, G2, GT
+
+from util.util import group
+
+"""
+Products of pairings with a shared final exponentiation.
+
+- pairing_product: ∏ e(lhs_i, rhs_i), accumulating the Miller loops and
+  running a single final exponentiation.
+- pairing_product_is_one: check ∏ e(lhs_i, rhs_i) == 1.
+
+Verifiers move every pairing of an equation to one side (inverting the G1
+argument) so the whole equation costs one final exponentiation.
+"""
+
+
+def pairing_product(lhs: list[G1], rhs: list[G2]) -> GT:
+    """Compute ∏ e(lhs_i, rhs_i) with a single final exponentiation."""
+    return group.pair_prod(lhs, rhs)
+
+
+def pairing_product_is_one(lhs: list[G1], rhs: list[G2]) -> bool:
+    """Check ∏ e(lhs_i, rhs_i) == 1 in GT."""
+    return pairing_product(lhs, rhs) == group.init(GT, 1)
@@ -0,0 +1,284 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from charm.toolbox.pairinggroup import ZR, G1, G2
+
+from util.util import group, ProverMode
+from util.fixed_base import FixedBaseTable, DEFAULT_WINDOW
+
+from vector_commitments import pointproofs, sharded
+from set_accumulator import esa
+
+from vector_commitments.pointproofs import PK as VC_PK, SK as VC_SK
+from set_accumulator.esa import SK as ESA_SK
+
+"""
+Process-pool parallel setup.
+
+Charm elements cannot be pickled, so ZR values cross process boundaries as
+Python integers and group elements as group.serialize() bytes.
+
+- fixed_base_powers: base^e for many exponents, sharded across workers.
+- generate_vc_keys: PointProofs key generation with sharded key powers.
+- setup_columns: column commitments and ESA accumulators, sharded by row range.
+- block_proofs: aggregated proofs of many sharded-commitment blocks.
+- openings: every single-position opening of many commitments, sharded by row range.
+"""
+
+
+def default_workers() -> int:
+    """Number of worker processes to use when none is configured."""
+    return os.cpu_count() or 1
+
+
+def to_ints(values: list[ZR]) -> list[int]:
+    return [int(value) for value in values]
+
+
+def from_ints(values: list[int]) -> list[ZR]:
+    return [group.init(ZR, value) for value in values]
+
+
+def chunks(n: int, n_chunks: int) -> list[tuple[int, int]]:
+    """Split range(n) into at most n_chunks contiguous (start, stop) ranges."""
+    size = -(-n // max(1, n_chunks)) or 1
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+_worker_table = None
+_worker_sk = None
+
+
+def _init_powers_worker(base: bytes, window: int) -> None:
+    global _worker_table
+    _worker_table = FixedBaseTable(group.deserialize(base), window)
+
+
+def _powers(exponents: list[int]) -> list[bytes]:
+    return [group.serialize(_worker_table.pow(exponent)) for exponent in exponents]
+
+
+def fixed_base_powers(
+    base, exponents: list[ZR], window: int = DEFAULT_WINDOW, workers: int = None
+) -> list:
+    """Compute [base^e for e in exponents] on a pool of worker processes."""
+    workers = workers or default_workers()
+    exponents = to_ints(exponents)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_powers_worker,
+        initargs=(group.serialize(base), window),
+    ) as pool:
+        futures = [
+            pool.submit(_powers, exponents[start:stop])
+            for start, stop in chunks(len(exponents), workers)
+        ]
+        return [group.deserialize(e) for future in futures for e in future.result()]
+
+
+def generate_vc_keys(
+    N: int, window: int = DEFAULT_WINDOW, workers: int = None
+) -> tuple[VC_SK, VC_PK]:
+    """Same as pointproofs.generate_keys, with the 3N key powers computed in parallel."""
+    g1 = group.random(G1)
+    g2 = group.random(G2)
+    alpha = group.random(ZR)
+
+    sk = [(alpha**i) for i in range(1, 2 * N + 1)]
+    return pointproofs.assemble_keys(
+        N,
+        g1,
+        g2,
+        sk,
+        fixed_base_powers(g1, sk, window, workers),
+        fixed_base_powers(g2, sk[:N], window, workers),
+    )
+
+
+def _init_setup_worker(vc_sk: list[int]) -> None:
+    global _worker_sk
+    _worker_sk = from_ints(vc_sk)
+
+
+def _commit(g1: bytes, messages: list[int], start: int) -> bytes:
+    """Commit to messages placed at positions start, start+1, ..."""
+    return group.serialize(
+        pointproofs.commit(
+            g1=group.deserialize(g1),
+            messages=from_ints(messages),
+            sk=_worker_sk[start : start + len(messages)],
+        )
+    )
+
+
+def _accumulator(sk: int, dataset: list[int]) -> int:
+    return int(esa.compute_accumulator(sk=group.init(ZR, sk), dataset=from_ints(dataset)))
+
+
+def setup_columns(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    esa_sk: ESA_SK,
+    transposed_dataset: list[list[ZR]],
+    workers: int = None,
+    block_size: int = None,
+) -> tuple[list[G1], list[ZR]]:
+    """Commit every column and compute its ESA accumulator on a process pool.
+
+    Each column is split into row ranges; partial commitments are multiplied
+    and partial accumulators summed, which gives the same values as
+    pointproofs.commit and esa.compute_accumulator over the whole column.
+    With block_size, the ranges are the blocks of a sharded.ShardedCommitment
+    and each column commitment is returned as one.
+    """
+    workers = workers or default_workers()
+    n_row = len(transposed_dataset[0])
+    if block_size:
+        if block_size > len(vc_pk.pk_g2):
+            raise ValueError(
+                f"block_size {block_size} exceeds the PointProofs key length {len(vc_pk.pk_g2)}"
+            )
+        ranges = [
+            (start, min(start + block_size, n_row)) for start in range(0, n_row, block_size)
+        ]
+    else:
+        ranges = chunks(n_row, workers)
+    g1 = group.serialize(vc_pk.g1)
+    columns = [to_ints(col) for col in transposed_dataset]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_setup_worker,
+        initargs=(to_ints(vc_sk.sk[: block_size or n_row]),),
+    ) as pool:
+        commit_futures = [
+            [
+                pool.submit(_commit, g1, col[start:stop], 0 if block_size else start)
+                for start, stop in ranges
+            ]
+            for col in columns
+        ]
+        acc_futures = [
+            [
+                pool.submit(_accumulator, int(esa_sk.sk), col[start:stop])
+                for start, stop in ranges
+            ]
+            for col in columns
+        ]
+
+        vc_cols = []
+        for futures in commit_futures:
+            partials = [group.deserialize(future.result()) for future in futures]
+            if block_size:
+                vc_cols.append(sharded.ShardedCommitment(partials, block_size, n_row))
+                continue
+
+            vc = partials[0]
+            for partial in partials[1:]:
+                vc = vc * partial
+            vc_cols.append(vc)
+
+        esa_acc = [
+            group.init(ZR, sum(future.result() for future in futures) % group.order())
+            for futures in acc_futures
+        ]
+
+    return vc_cols, esa_acc
+
+
+_worker_keys = None
+
+
+def _init_proof_worker(g1: bytes, pk_g1: list[bytes], vc_sk: list[int]) -> None:
+    global _worker_keys
+    pk = VC_PK(group.deserialize(g1), None, [group.deserialize(e) for e in pk_g1], None, None)
+    _worker_keys = (pk, VC_SK(from_ints(vc_sk)))
+
+
+def _block_proof(
+    v_commit: bytes, messages: list[int], offsets: list[int], mode: ProverMode
+) -> bytes:
+    pk, sk = _worker_keys
+    return group.serialize(
+        sharded.generate_block_proof(
+            pk, sk, group.deserialize(v_commit), from_ints(messages), offsets, mode
+        )
+    )
+
+
+def block_proofs(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    offsets: list[list[int]],
+    mode: ProverMode = ProverMode.POINT,
+    workers: int = None,
+) -> list[G1]:
+    """sharded.generate_block_proof for every block statement, on a process pool."""
+    workers = workers or default_workers()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_proof_worker,
+        initargs=(
+            group.serialize(vc_pk.g1),
+            [group.serialize(e) for e in vc_pk.pk_g1],
+            to_ints(vc_sk.sk),
+        ),
+    ) as pool:
+        futures = [
+            pool.submit(
+                _block_proof, group.serialize(v_commit), to_ints(messages_b), offsets_b, mode
+            )
+            for v_commit, messages_b, offsets_b in zip(v_commits, messages, offsets)
+        ]
+        return [group.deserialize(future.result()) for future in futures]
+
+
+def _openings(v_commit: bytes, messages: list[int], start: int) -> list[bytes]:
+    pk, sk = _worker_keys
+    v_commit = group.deserialize(v_commit)
+    return [
+        group.serialize(
+            pointproofs.generate_proof(
+                pk_g1=pk.pk_g1, sk=sk.sk, v_commit=v_commit, index=index, message=message
+            )
+        )
+        for index, message in enumerate(from_ints(messages), start)
+    ]
+
+
+def openings(
+    vc_pk: VC_PK,
+    vc_sk: VC_SK,
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    workers: int = None,
+) -> list[list[G1]]:
+    """pointproofs.generate_proof at every position of every committed vector.
+
+    Each vector is split into row ranges that are opened on a process pool.
+    """
+    workers = workers or default_workers()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_proof_worker,
+        initargs=(
+            group.serialize(vc_pk.g1),
+            [group.serialize(e) for e in vc_pk.pk_g1],
+            to_ints(vc_sk.sk),
+        ),
+    ) as pool:
+        futures = [
+            [
+                pool.submit(_openings, group.serialize(v_commit), values[start:stop], start)
+                for start, stop in chunks(len(values), workers)
+            ]
+            for v_commit, values in zip(v_commits, map(to_ints, messages))
+        ]
+        return [
+            [group.deserialize(e) for future in futures_v for e in future.result()]
+            for futures_v in futures
+        ]
@@ -0,0 +1,153 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from charm.toolbox.pairinggroup import ZR, G1, G2, GT
+
+from util.util import group
+
+"""
+Opt-in counters of cryptographic operations, tagged by phase.
+
+While enabled, every phase (start/stop or the phase context manager) records:
+- pairings, and exponentiations and multiplications per group (ZR, G1, G2, GT),
+  from Charm's benchmark counters (group.InitBenchmark / StartBenchmark);
+- calls of group.hash and group.serialize and the time spent in them, and
+  calls of group.init / group.random that create a ZR element (zr_init; ZR
+  results of arithmetic such as alpha**i are not counted), through wrappers
+  installed on the shared util.util.group;
+- the wall-clock time of the phase (perf_counter).
+
+Phases are not nested; repeated phases with the same name add up. When the
+profiler is disabled nothing is wrapped and start/stop return immediately.
+"""
+
+GROUPS = {ZR: "ZR", G1: "G1", G2: "G2", GT: "GT"}
+
+COUNTERS = (
+    ["time", "pair"]
+    + [f"{op}_{name}" for op in ("exp", "mul") for name in GROUPS.values()]
+    + ["hash", "hash_time", "serialize", "serialize_time", "zr_init"]
+)
+
+_enabled = False
+_phase = None
+_phase_start = 0.0
+_counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+
+def _timed(name: str, function):
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if _phase is not None:
+                counters = _counters[_phase]
+                counters[name] += 1
+                counters[name + "_time"] += time.perf_counter() - start_time
+
+    return wrapper
+
+
+def _zr_counted(function):
+    def wrapper(group_type, *args, **kwargs):
+        if _phase is not None and group_type == ZR:
+            _counters[_phase]["zr_init"] += 1
+        return function(group_type, *args, **kwargs)
+
+    return wrapper
+
+
+def enable() -> None:
+    """Install the group wrappers and start recording phases."""
+    global _enabled
+    if _enabled:
+        return
+    group.hash = _timed("hash", group.hash)
+    group.serialize = _timed("serialize", group.serialize)
+    group.init = _zr_counted(group.init)
+    group.random = _zr_counted(group.random)
+    _enabled = True
+
+
+def disable() -> None:
+    """Remove the group wrappers; counters recorded so far are kept."""
+    global _enabled, _phase
+    for name in ("hash", "serialize", "init", "random"):
+        group.__dict__.pop(name, None)
+    _enabled = False
+    _phase = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    _counters.clear()
+
+
+def start(phase: str) -> None:
+    """Start recording `phase` (no-op when disabled)."""
+    global _phase, _phase_start
+    if not _enabled:
+        return
+    _phase = phase
+    group.InitBenchmark()
+    group.StartBenchmark(["Pair", "Exp", "Mul", "Granular"])
+    _phase_start = time.perf_counter()
+
+
+def stop() -> None:
+    """Stop the current phase and add Charm's operation counts to it."""
+    global _phase
+    if not _enabled or _phase is None:
+        return
+    elapsed = time.perf_counter() - _phase_start
+    group.EndBenchmark()
+
+    counters = _counters[_phase]
+    counters["time"] += elapsed
+    counters["pair"] += group.GetGeneralBenchmarks().get("Pair", 0)
+    # Charm reports each granular operation as a [ZR, G1, G2, GT] list of counts.
+    for op, counts in group.GetGranularBenchmarks().items():
+        for name, count in zip(GROUPS.values(), counts):
+            counter = f"{op.lower()}_{name}"
+            if counter in counters:
+                counters[counter] += count
+    _phase = None
+
+
+@contextmanager
+def phase(name: str):
+    start(name)
+    try:
+        yield
+    finally:
+        stop()
+
+
+def counters() -> dict[str, dict[str, float]]:
+    """Counters recorded per phase, in the order phases were first seen."""
+    return {name: dict(values) for name, values in _counters.items()}
+
+
+if __name__ == "__main__":
+    from charm.toolbox.pairinggroup import pair
+
+    with phase("disabled"):
+        group.hash("x")
+    assert counters() == {}
+
+    enable()
+    g1, g2 = group.random(G1), group.random(G2)
+    with phase("demo"):
+        exponent = group.init(ZR, 3)
+        pair(g1**exponent, g2)
+        group.serialize(group.hash("x"))
+    disable()
+
+    demo = counters()["demo"]
+    assert demo["pair"] == 1 and demo["exp_G1"] == 1
+    assert demo["hash"] == 1 and demo["serialize"] == 1 and demo["zr_init"] == 1
+    assert "hash" not in group.__dict__
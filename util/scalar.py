@@ -0,0 +1,67 @@
+from charm.toolbox.pairinggroup import ZR
+
+from util.util import group
+
+try:
+    from gmpy2 import mpz
+except ImportError:
+    mpz = int
+
+"""
+Bulk scalar-field reductions over plain integers modulo the group order.
+
+Values are converted from ZR (or int) once, reduced with Python/gmpy2 integer
+arithmetic, and only the result is converted back to ZR, instead of
+allocating a Charm ZR object per element and per intermediate.
+
+- sum_of_powers: Σ base^e
+- sum_of_derivatives: Σ e * base^(e-1)
+- inner_product: Σ a_i * b_i
+- shifted_product: ∏ (shift + x)
+"""
+
+ORDER = mpz(group.order())
+
+
+def to_int(value) -> int:
+    return mpz(int(value))
+
+
+def to_ZR(value) -> ZR:
+    return group.init(ZR, int(value % ORDER))
+
+
+def sum_of_powers(base, exponents: list) -> int:
+    """Σ base^e mod r."""
+    base = to_int(base)
+    total = 0
+    for exponent in exponents:
+        total += pow(base, to_int(exponent), ORDER)
+    return total % ORDER
+
+
+def sum_of_derivatives(base, exponents: list) -> int:
+    """Σ e * base^(e-1) mod r."""
+    base = to_int(base)
+    total = 0
+    for exponent in exponents:
+        exponent = to_int(exponent)
+        total += exponent * pow(base, exponent - 1, ORDER)
+    return total % ORDER
+
+
+def inner_product(a: list, b: list) -> int:
+    """Σ a_i * b_i mod r over the common prefix of a and b."""
+    total = 0
+    for a_i, b_i in zip(a, b):
+        total += to_int(a_i) * b_i
+    return total % ORDER
+
+
+def shifted_product(shift, values: list) -> int:
+    """∏ (shift + x) mod r."""
+    shift = to_int(shift)
+    product = 1
+    for value in values:
+        product = product * (shift + to_int(value)) % ORDER
+    return product
@@ -1,6 +1,6 @@
 import sys
 from enum import Enum
-from math import sqrt
+from math import isqrt
 from charm.toolbox.pairinggroup import PairingGroup, ZR, G1
 
 """
@@ -12,6 +12,8 @@ Utility helpers shared across the project.
 - hash_to_ZR: hash a G1 element into ZR using Charm's hash/serialize.
 - encode_pair/decode_pair: Cantor-style pairing functions for (row, col).
 - Aggregation: enumeration of supported aggregate operations.
+- ProverMode: strategies for computing value-correctness proofs.
+- ScalarBackend: arithmetic used for bulk ZR reductions.
 """
 
 group = PairingGroup("BN254")
@@ -36,7 +38,7 @@ def encode_pair(a: int, b: int) -> int:
 
 def decode_pair(z: int) -> list:
     """Decode an integer back into the paired (a, b) using the inverse mapping."""
-    sqrt_z = sqrt(z)
+    sqrt_z = isqrt(z)
     sqz = sqrt_z * sqrt_z
     return [sqrt_z, z - sqz - sqrt_z] if (z - sqz) >= sqrt_z else [z - sqz, sqrt_z]
 
@@ -47,3 +49,16 @@ class Aggregation(str, Enum):
     COUNT = "count"
     SUM = "sum"
     MIN = "min"
+
+
+class ProverMode(str, Enum):
+    """Strategies used by the prover to build value-correctness proofs."""
+    POINT = "point"  # one opening per row, then aggregate
+    SCALAR = "scalar"  # fold t_i and secret powers in ZR, O(1) exps per column
+    PUBLIC = "public"  # openings from the public parameters only, no secret powers
+
+
+class ScalarBackend(str, Enum):
+    """Arithmetic used for bulk scalar reductions (see util.scalar)."""
+    ZR = "zr"  # one Charm ZR element per value and intermediate
+    NATIVE = "native"  # Python/gmpy2 integers mod the group order
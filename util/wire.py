@@ -0,0 +1,311 @@
+import base64
+import struct
+from charm.toolbox.pairinggroup import ZR, G1, G2, GT
+
+from util.util import group, Aggregation
+from vector_commitments.sharded import ShardedCommitment
+
+"""
+Versioned binary wire format for commitments and proofs.
+
+Every message starts with MAGIC, VERSION and a one-byte kind, followed by
+fixed-width records:
+- group elements as the raw compressed encoding produced by group.serialize
+  (without its "<type>:" prefix and base64 armour), one width per group;
+- ZR elements (keys, hashes, values) as 32-byte big-endian integers;
+- counts as little-endian uint32.
+
+Decoders take any bytes-like object and walk it through a memoryview, so
+fields are sliced without copying the buffer.
+"""
+
+MAGIC = b"ZKVW"
+VERSION = 1
+
+COMMITMENTS = 1
+SHARDED_COMMITMENTS = 2
+CORRECTNESS = 3
+AGGREGATION = 4
+COMPLETENESS = 5
+ANSWER = 6
+RANGE = 7
+
+ZR_WIDTH = 32
+
+_HEADER = struct.Struct("<4sBB")
+_COUNT = struct.Struct("<I")
+_SHARD = struct.Struct("<IQ")
+
+# Group tags, as in the "<type>:" prefix of group.serialize.
+_TAGS = {ZR: 0, G1: 1, G2: 2, GT: 3}
+_NONE = 255
+_AGGREGATIONS = list(Aggregation)
+_widths = {}
+
+
+def width(group_type) -> int:
+    """Byte width of an encoded element of group_type."""
+    if group_type == ZR:
+        return ZR_WIDTH
+    if group_type not in _widths:
+        _widths[group_type] = len(_raw(group.random(group_type)))
+    return _widths[group_type]
+
+
+def _raw(element) -> bytes:
+    return base64.b64decode(group.serialize(element).split(b":", 1)[1])
+
+
+class Writer:
+    """Append-only encoder for one wire message."""
+    def __init__(self, kind: int):
+        self.parts = [_HEADER.pack(MAGIC, VERSION, kind)]
+
+    def pack(self, fields: struct.Struct, *values) -> None:
+        self.parts.append(fields.pack(*values))
+
+    def byte(self, value: int) -> None:
+        self.parts.append(bytes([value]))
+
+    def count(self, value: int) -> None:
+        self.pack(_COUNT, value)
+
+    def zr(self, value) -> None:
+        self.parts.append((int(value) % group.order()).to_bytes(ZR_WIDTH, "big"))
+
+    def point(self, element) -> None:
+        self.parts.append(_raw(element))
+
+    def element(self, element) -> None:
+        """Group tag followed by the element (ZR or point), or a None marker."""
+        if element is None:
+            self.byte(_NONE)
+            return
+        tag = int(group.serialize(element).split(b":", 1)[0])
+        self.byte(tag)
+        if tag == _TAGS[ZR]:
+            self.zr(element)
+        else:
+            self.point(element)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class Reader:
+    """Sequential decoder over a memoryview of one wire message."""
+    def __init__(self, data, kind: int):
+        self.view = memoryview(data)
+        magic, version, message_kind = _HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} wire message")
+        if message_kind != kind:
+            raise ValueError(f"expected message kind {kind}, got {message_kind}")
+        self.offset = _HEADER.size
+
+    def _take(self, size: int) -> memoryview:
+        if self.offset + size > len(self.view):
+            raise ValueError("truncated wire message")
+        field = self.view[self.offset : self.offset + size]
+        self.offset += size
+        return field
+
+    def unpack(self, fields: struct.Struct) -> tuple:
+        return fields.unpack(self._take(fields.size))
+
+    def byte(self) -> int:
+        return self._take(1)[0]
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def zr(self):
+        return group.init(ZR, int.from_bytes(self._take(ZR_WIDTH), "big"))
+
+    def point(self, group_type):
+        encoded = base64.b64encode(self._take(width(group_type)))
+        return group.deserialize(b"%d:" % _TAGS[group_type] + encoded)
+
+    def element(self):
+        tag = self.byte()
+        if tag == _NONE:
+            return None
+        group_type = next(t for t, t_tag in _TAGS.items() if t_tag == tag)
+        return self.zr() if group_type == ZR else self.point(group_type)
+
+
+def encode_answer(answer_indexes: list[int], transposed_answer: list[list[ZR]]) -> bytes:
+    """Encode the returned rows: their indexes, then the answer column by column."""
+    writer = Writer(ANSWER)
+    writer.count(len(answer_indexes))
+    for index in answer_indexes:
+        writer.count(index)
+    writer.count(len(transposed_answer))
+    for column in transposed_answer:
+        for value in column:
+            writer.zr(value)
+    return writer.getvalue()
+
+
+def decode_answer(data) -> tuple[list[int], list[list[ZR]]]:
+    reader = Reader(data, ANSWER)
+    answer_indexes = [reader.count() for _ in range(reader.count())]
+    transposed_answer = [
+        [reader.zr() for _ in answer_indexes] for _ in range(reader.count())
+    ]
+    return answer_indexes, transposed_answer
+
+
+def encode_commitments(commitments: list[G1]) -> bytes:
+    writer = Writer(COMMITMENTS)
+    writer.count(len(commitments))
+    for commitment in commitments:
+        writer.point(commitment)
+    return writer.getvalue()
+
+
+def decode_commitments(data) -> list[G1]:
+    reader = Reader(data, COMMITMENTS)
+    return [reader.point(G1) for _ in range(reader.count())]
+
+
+def encode_sharded_commitments(commitments: list) -> bytes:
+    """Encode a list of sharded.ShardedCommitment (one per column)."""
+    writer = Writer(SHARDED_COMMITMENTS)
+    writer.count(len(commitments))
+    for sharded in commitments:
+        writer.pack(_SHARD, sharded.block_size, sharded.length)
+        writer.count(len(sharded.commits))
+        for commitment in sharded.commits:
+            writer.point(commitment)
+    return writer.getvalue()
+
+
+def decode_sharded_commitments(data) -> list:
+    reader = Reader(data, SHARDED_COMMITMENTS)
+    commitments = []
+    for _ in range(reader.count()):
+        block_size, length = reader.unpack(_SHARD)
+        commits = [reader.point(G1) for _ in range(reader.count())]
+        commitments.append(ShardedCommitment(commits, block_size, length))
+    return commitments
+
+
+def encode_correctness(proofs) -> bytes:
+    """Encode value-correctness proofs: a list of G1 proofs or a single one."""
+    proofs = proofs if isinstance(proofs, list) else [proofs]
+    writer = Writer(CORRECTNESS)
+    writer.count(len(proofs))
+    for proof in proofs:
+        writer.point(proof)
+    return writer.getvalue()
+
+
+def decode_correctness(data) -> list[G1]:
+    reader = Reader(data, CORRECTNESS)
+    return [reader.point(G1) for _ in range(reader.count())]
+
+
+def encode_aggregation(aggregation: Aggregation, proof: list, value) -> bytes:
+    """Encode an aggregation proof as returned by prover.prove_aggr_correctness."""
+    writer = Writer(AGGREGATION)
+    writer.byte(_AGGREGATIONS.index(aggregation))
+    writer.count(len(proof))
+    for element in proof:
+        writer.element(element)
+    writer.element(value)
+    return writer.getvalue()
+
+
+def decode_aggregation(data) -> tuple[Aggregation, list, object]:
+    reader = Reader(data, AGGREGATION)
+    aggregation = _AGGREGATIONS[reader.byte()]
+    proof = [reader.element() for _ in range(reader.count())]
+    return aggregation, proof, reader.element()
+
+
+def encode_completeness(proofs: dict) -> bytes:
+    """Encode prover.prove_completeness output as fixed-width records.
+
+    Record: key, acc_hash (ZR) and vc, proofs_1, proofs_2 (G1).
+    """
+    writer = Writer(COMPLETENESS)
+    writer.count(len(proofs))
+    for key, proof in proofs.items():
+        writer.zr(key)
+        writer.zr(proof["acc_hash"])
+        writer.point(proof["vc"])
+        writer.point(proof["proofs_1"])
+        writer.point(proof["proofs_2"])
+    return writer.getvalue()
+
+
+def decode_completeness(data) -> dict:
+    reader = Reader(data, COMPLETENESS)
+    proofs = {}
+    for _ in range(reader.count()):
+        key = reader.zr()
+        proofs[key] = {
+            "acc_hash": reader.zr(),
+            "vc": reader.point(G1),
+            "proofs_1": reader.point(G1),
+            "proofs_2": reader.point(G1),
+        }
+    return proofs
+
+
+def encode_range(proof: dict) -> bytes:
+    """Encode prover.prove_range output: start, stop, the opened entries and the proof."""
+    writer = Writer(RANGE)
+    writer.count(proof["start"])
+    writer.count(proof["stop"])
+    writer.count(len(proof["entries"]))
+    for entry in proof["entries"]:
+        writer.zr(entry)
+    writer.point(proof["proof"])
+    return writer.getvalue()
+
+
+def decode_range(data) -> dict:
+    reader = Reader(data, RANGE)
+    start, stop = reader.count(), reader.count()
+    entries = [reader.zr() for _ in range(reader.count())]
+    return {"start": start, "stop": stop, "entries": entries, "proof": reader.point(G1)}
+
+
+if __name__ == "__main__":
+    answer = ([4, 1], [[group.random(ZR) for _ in range(2)] for _ in range(3)])
+    assert decode_answer(encode_answer(*answer)) == answer
+
+    commitments = [group.random(G1) for _ in range(3)]
+    assert decode_commitments(encode_commitments(commitments)) == commitments
+    assert len(encode_commitments(commitments)) == _HEADER.size + 4 + 3 * width(G1)
+
+    proof = [group.random(G2), group.random(ZR)]
+    value = group.random(ZR)
+    assert decode_aggregation(encode_aggregation(Aggregation.SUM, proof, value)) == (
+        Aggregation.SUM,
+        proof,
+        value,
+    )
+    encoded = encode_aggregation(Aggregation.MIN, [proof[0], None], None)
+    assert decode_aggregation(encoded) == (Aggregation.MIN, [proof[0], None], None)
+
+    completeness = {
+        group.random(ZR): {
+            "acc_hash": group.random(ZR),
+            "vc": group.random(G1),
+            "proofs_1": group.random(G1),
+            "proofs_2": group.random(G1),
+        }
+        for _ in range(2)
+    }
+    assert decode_completeness(encode_completeness(completeness)) == completeness
+
+    range_proof = {
+        "start": 3,
+        "stop": 5,
+        "entries": [group.random(ZR) for _ in range(4)],
+        "proof": group.random(G1),
+    }
+    assert decode_range(encode_range(range_proof)) == range_proof
@@ -1,7 +1,14 @@
-import math
+import secrets
+import weakref
+from collections import Counter, defaultdict
+from functools import lru_cache
 from charm.toolbox.pairinggroup import ZR, G1, G2, GT, pair
 
-from util.util import group
+from util.util import group, ScalarBackend
+from util import scalar, fft
+from util.msm import multi_exp
+from util.fixed_base import FixedBaseTable, DEFAULT_WINDOW, power
+from util.pairing import pairing_product
 
 """
 PointProofs vector commitment with point proofs and aggregation.
@@ -24,30 +31,85 @@ class PK:
         self.pk_gt = pk_gt
 
 
-def generate_keys(N: int) -> tuple[SK, PK]:
+def generate_keys(N: int, window: int = DEFAULT_WINDOW) -> tuple[SK, PK]:
     """Generate PointProofs keys for vector length N.
 
-    Returns secret powers and public elements in G1/G2/GT.
+    Returns secret powers and public elements in G1/G2/GT. The powers of g1 and
+    g2 are taken from fixed-base tables with the given window size.
     """
     g1 = group.random(G1)
     g2 = group.random(G2)
     alpha = group.random(ZR)
 
+    g1_table = FixedBaseTable(g1, window)
+    g2_table = FixedBaseTable(g2, window)
+
     sk = [(alpha**i) for i in range(1, 2 * N + 1)]
-    pk_g1 = [(g1**alpha) for idx, alpha in enumerate(sk) if idx is not N + 1]
-    pk_g2 = [(g2**alpha) for alpha in sk[:N]]
+    return assemble_keys(
+        N,
+        g1,
+        g2,
+        sk,
+        [g1_table.pow(alpha) for alpha in sk],
+        [g2_table.pow(alpha) for alpha in sk[:N]],
+    )
+
+
+def assemble_keys(
+    N: int, g1: G1, g2: G2, sk: list[ZR], g1_powers: list[G1], g2_powers: list[G2]
+) -> tuple[SK, PK]:
+    """Build the key pair from the secret powers and their images in G1 and G2.
+
+    g1_powers holds g1^{sk[i]} for all 2N powers, g2_powers the first N in G2.
+    g1^{alpha^{N+1}} (index N) is left out of pk_g1: it would open any position
+    to any value.
+    """
+    pk_g1 = [element for idx, element in enumerate(g1_powers) if idx != N]
     pk_gt = pair(g1, g2) ** sk[N]
 
-    return SK(sk), PK(g1, g2, pk_g1, pk_g2, pk_gt)
+    return SK(sk), PK(g1, g2, pk_g1, g2_powers, pk_gt)
 
 
-def commit(g1: G1, messages: list[ZR], sk: list[ZR]) -> G1:
+def commit(
+    g1: G1,
+    messages: list[ZR],
+    sk: list[ZR],
+    backend: ScalarBackend = ScalarBackend.ZR,
+) -> G1:
     """Commit to a vector of messages using powers of alpha in G1."""
-    return g1 ** (
-        sum(message * alpha for message, alpha in zip(messages, sk[: len(messages)]))
+    if backend == ScalarBackend.NATIVE:
+        exponent = scalar.inner_product(
+            messages, [scalar.to_int(alpha) for alpha in sk[: len(messages)]]
+        )
+        return power(g1, scalar.to_ZR(exponent))
+
+    return power(
+        g1, sum(message * alpha for message, alpha in zip(messages, sk[: len(messages)]))
     )
 
 
+# Weak references, so a registered cache can still be garbage collected.
+_update_listeners = []
+
+
+def add_update_listener(listener) -> None:
+    """Call listener(old_commit, new_commit) after every update_commit.
+
+    The listener is held weakly (bound methods through weakref.WeakMethod):
+    it is dropped once its owner is no longer referenced elsewhere.
+    """
+    if hasattr(listener, "__self__"):
+        _update_listeners.append(weakref.WeakMethod(listener))
+    else:
+        _update_listeners.append(weakref.ref(listener))
+
+
+def remove_update_listener(listener) -> None:
+    _update_listeners[:] = [
+        reference for reference in _update_listeners if reference() != listener
+    ]
+
+
 def update_commit(
     g1: G1,
     v_commit: G1,
@@ -57,24 +119,128 @@ def update_commit(
     new_messages: list[ZR],
 ) -> G1:
     """Update commitment in place given index-value changes (no recompute)."""
-    return v_commit * (
-        g1
-        ** sum(
+    new_commit = v_commit * power(
+        g1,
+        sum(
             (new_message - message) * sk[idx]
             for new_message, message, idx in zip(new_messages, messages, idxs)
-        )
+        ),
     )
+    for reference in list(_update_listeners):
+        listener = reference()
+        if listener is None:
+            _update_listeners.remove(reference)
+        else:
+            listener(v_commit, new_commit)
+    return new_commit
 
 
 def generate_proof(
     pk_g1: list[G1], sk: list[ZR], v_commit: G1, index: int, message: ZR
 ) -> G1:
     """Generate a point proof for value at position index."""
-    return (v_commit / (pk_g1[index] ** message)) ** sk[
+    return (v_commit / power(pk_g1[index], message)) ** sk[
         int((len(pk_g1) + 1) / 2) - (index + 1)
     ]
 
 
+# open_many computes every opening once the answer has more than this many
+# rows per log2(size)^2, roughly where one FFT pass gets cheaper than k MSMs.
+ALL_OPENINGS_FACTOR = 4
+# PublicProvers (and their key transforms) kept by public_prover.
+PUBLIC_PROVERS = 16
+
+
+class PublicProver:
+    """PointProofs commitments and openings from the public parameters only.
+
+    The opening of position i of a length-n vector m is
+    π_i = ∏_{j≠i} g1^{m_j α^{N-i+j+1}}, a multi-exponentiation over n - 1
+    pk_g1 elements (open). The n openings form the Toeplitz product
+    π_i = ∏_j H[N-i+j]^{m_j}, with H[k] = g1^{α^{k+1}} and H[N] the identity
+    (which drops the j = i term). open_all evaluates it as a cyclic convolution
+    of size M >= 2n - 1 with FFTs over ZR and G1, O(M log M) group operations;
+    the transform of the key elements depends only on n and is kept. Without
+    an M-th root of unity in ZR, open_all falls back to n calls of open.
+    """
+    def __init__(self, pk: PK, n: int):
+        self.pk = pk
+        self.N = len(pk.pk_g2)
+        self.n = n
+        self.size = 1 << (2 * n - 2).bit_length()
+        self.root = fft.root_of_unity(self.size)
+        self.key_transform = None
+
+    def key(self, k: int) -> G1:
+        """g1^{α^{k+1}} for k != N."""
+        return self.pk.pk_g1[k if k < self.N else k - 1]
+
+    def commit(self, messages: list[ZR]) -> G1:
+        """Same commitment as commit(), as a multi-exponentiation of pk_g1."""
+        return multi_exp([self.key(i) for i in range(len(messages))], messages)
+
+    def open(self, messages: list[ZR], index: int) -> G1:
+        """Opening of messages at index (equal to generate_proof's)."""
+        positions = [j for j in range(len(messages)) if j != index]
+        if not positions:
+            return self.pk.g1**0
+        return multi_exp(
+            [self.key(self.N - index + j) for j in positions],
+            [messages[j] for j in positions],
+        )
+
+    def _key_transform(self) -> list[G1]:
+        if self.key_transform is None:
+            n = self.n
+            identity = self.pk.g1**0
+            row = [
+                identity if s == n - 1 else self.key(self.N + s - n + 1)
+                for s in range(2 * n - 1)
+            ]
+            row += [identity] * (self.size - len(row))
+            self.key_transform = fft.group_fft(row, self.root)
+        return self.key_transform
+
+    def open_all(self, messages: list[ZR]) -> list[G1]:
+        """Openings of messages at every position."""
+        if len(messages) != self.n:
+            raise ValueError(f"expected {self.n} messages, got {len(messages)}")
+        if self.root is None:
+            return [self.open(messages, i) for i in range(self.n)]
+
+        order = int(scalar.ORDER)
+        values = [scalar.to_int(message) for message in reversed(messages)]
+        values += [0] * (self.size - self.n)
+        inverse_size = pow(self.size, -1, order)
+        exponents = [
+            scalar.to_ZR(value * inverse_size % order)
+            for value in fft.fft(values, self.root)
+        ]
+        products = fft.group_fft(
+            [
+                element**exponent
+                for element, exponent in zip(self._key_transform(), exponents)
+            ],
+            pow(self.root, -1, order),
+        )
+        return [products[2 * self.n - 2 - i] for i in range(self.n)]
+
+    def open_many(self, messages: list[ZR], indexes: list[int]) -> list[G1]:
+        """Openings at indexes, through open_all when the answer is large enough."""
+        log_size = max(1, self.size.bit_length() - 1)
+        if self.root is not None and len(indexes) > ALL_OPENINGS_FACTOR * log_size**2:
+            openings = self.open_all(messages)
+            return [openings[i] for i in indexes]
+        return [self.open(messages, i) for i in indexes]
+
+
+@lru_cache(maxsize=PUBLIC_PROVERS)
+def public_prover(pk: PK, n: int) -> PublicProver:
+    """PublicProver for length-n vectors under pk, shared across calls so the
+    key transform of open_all is computed once per (pk, n)."""
+    return PublicProver(pk, n)
+
+
 def verify_proof(
     g2: G2,
     pk_g2: list[G2],
@@ -85,9 +251,9 @@ def verify_proof(
     proof_i: G1,
 ) -> bool:
     """Verify a single point proof for the committed vector at index."""
-    return pair(v_commit, pk_g2[len(pk_g2) - (index + 1)]) == pair(proof_i, g2) * (
-        pk_gt**message
-    )
+    return pairing_product(
+        [v_commit, proof_i**-1], [pk_g2[len(pk_g2) - (index + 1)], g2]
+    ) == power(pk_gt, message)
 
 
 def compute_t(
@@ -109,7 +275,86 @@ def aggregate_proofs(
 ) -> G1:
     """Aggregate single proofs into one using Fiat-Shamir scalars t."""
     t = compute_t(v_commit, messages, indexes)
-    return math.prod(proof_i**t_i for proof_i, t_i in zip(proofs, t))
+    return multi_exp(proofs, t)
+
+
+def _aggregate_exponents(
+    sk: list[ZR], v_commit: G1, messages: list[ZR], indexes: list[int]
+) -> tuple[ZR, ZR]:
+    """Return (Σ t_i α^{N-i}, α^{N+1} Σ t_i m_i) for an aggregated proof."""
+    N = int(len(sk) / 2)
+    t = compute_t(v_commit, messages, indexes)
+    return (
+        sum(t_i * sk[N - (i + 1)] for i, t_i in zip(indexes, t)),
+        sk[N] * sum(message * t_i for message, t_i in zip(messages, t)),
+    )
+
+
+def generate_aggregate_proof(
+    g1: G1, sk: list[ZR], v_commit: G1, messages: list[ZR], indexes: list[int]
+) -> G1:
+    """Aggregated proof for indexes computed directly from the secret powers.
+
+    Equal to aggregate_proofs over the generate_proof openings, but t_i and the
+    powers of alpha are folded in ZR: C^{Σ t_i α^{N-i}} / g1^{α^{N+1} Σ t_i m_i}.
+    """
+    commit_exponent, g1_exponent = _aggregate_exponents(sk, v_commit, messages, indexes)
+    return (v_commit**commit_exponent) / power(g1, g1_exponent)
+
+
+def compute_t_prime(
+    v_commits: list[G1], messages: list[list[ZR]], indexes: list[list[int]]
+) -> list[ZR]:
+    """Fiat-Shamir scalars for aggregating proofs across commitments.
+
+    t'_j = H(j, D) where D hashes every commitment, position and message.
+    """
+    transcript = (
+        b"".join(group.serialize(v_commit) for v_commit in v_commits)
+        + b"".join(
+            group.serialize(group.init(ZR, i)) for indexes_j in indexes for i in indexes_j
+        )
+        + b"".join(
+            group.serialize(message) for messages_j in messages for message in messages_j
+        )
+    )
+    digest = group.serialize(group.hash(transcript))
+    return [
+        group.hash(group.serialize(group.init(ZR, j)) + digest)
+        for j in range(len(v_commits))
+    ]
+
+
+def aggregate_across_commits(
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    indexes: list[list[int]],
+    proofs: list[G1],
+) -> G1:
+    """Aggregate per-commitment aggregated proofs into a single proof."""
+    return multi_exp(proofs, compute_t_prime(v_commits, messages, indexes))
+
+
+def generate_cross_aggregate_proof(
+    g1: G1,
+    sk: list[ZR],
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    indexes: list[list[int]],
+) -> G1:
+    """Cross-commitment aggregated proof computed directly from the secret powers.
+
+    Equal to aggregate_across_commits over generate_aggregate_proof results,
+    at the cost of one multi-exponentiation over the commitments.
+    """
+    t_prime = compute_t_prime(v_commits, messages, indexes)
+    exponents = [
+        _aggregate_exponents(sk, v_commit, messages_j, indexes_j)
+        for v_commit, messages_j, indexes_j in zip(v_commits, messages, indexes)
+    ]
+    return multi_exp(
+        v_commits, [t_j * a_j for t_j, (a_j, _) in zip(t_prime, exponents)]
+    ) / power(g1, sum(t_j * b_j for t_j, (_, b_j) in zip(t_prime, exponents)))
 
 
 def verify_aggregate_proofs(
@@ -124,14 +369,138 @@ def verify_aggregate_proofs(
     """Verify an aggregated proof for a set of positions indexes."""
     t = compute_t(v_commit, messages, indexes)
 
-    return pair(
-        v_commit,
-        math.prod(pk_g2[len(pk_g2) - (i + 1)] ** t_i for i, t_i in zip(indexes, t)),
-    ) == pair(aggregate_proofs, g2) * (
-        pk_gt ** sum(message * t_i for message, t_i in zip(messages, t))
+    return pairing_product(
+        [v_commit, aggregate_proofs**-1],
+        [multi_exp([pk_g2[len(pk_g2) - (i + 1)] for i in indexes], t), g2],
+    ) == power(pk_gt, sum(message * t_i for message, t_i in zip(messages, t)))
+
+
+# Bit length of the random weights used by verify_batch.
+BATCH_WEIGHT_BITS = 128
+
+
+def verify_batch(
+    g2: G2,
+    pk_g2: list[G2],
+    pk_gt: GT,
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    indexes: list[list[int]],
+    coefficients: list[list[ZR]],
+    proofs: list[G1],
+    weights: list[ZR] = None,
+) -> bool:
+    """Verify many proofs with a single weighted pairing-product equation.
+
+    Statement s holds when e(C_s, ∏_i pk_g2[N-1-i]^{c_si}) == e(π_s, g2) * pk_gt^{Σ_i m_si c_si},
+    where c_s are its coefficients (compute_t for an aggregated proof, [1] for a
+    single point proof). The statements are raised to the weights r_s (random
+    BATCH_WEIGHT_BITS-bit scalars when not given) and multiplied together. Each
+    term is merged, by multi-exponentiation, with the other terms sharing its
+    commitment or its position, whichever group is larger, so the check costs one
+    pairing per group plus one for the proofs, all sharing one final exponentiation.
+    """
+    if weights is None:
+        weights = [
+            group.init(ZR, secrets.randbits(BATCH_WEIGHT_BITS)) for _ in v_commits
+        ]
+
+    return verify_weighted(
+        g2,
+        pk_g2,
+        pk_gt,
+        v_commits,
+        messages,
+        indexes,
+        coefficients,
+        weights,
+        multi_exp(proofs, weights),
     )
 
 
+def verify_across_commits(
+    g2: G2,
+    pk_g2: list[G2],
+    pk_gt: GT,
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    indexes: list[list[int]],
+    aggregate_proof: G1,
+) -> bool:
+    """Verify a proof produced by aggregate_across_commits."""
+    return verify_weighted(
+        g2,
+        pk_g2,
+        pk_gt,
+        v_commits,
+        messages,
+        indexes,
+        [
+            compute_t(v_commit, messages_j, indexes_j)
+            for v_commit, messages_j, indexes_j in zip(v_commits, messages, indexes)
+        ],
+        compute_t_prime(v_commits, messages, indexes),
+        aggregate_proof,
+    )
+
+
+def verify_weighted(
+    g2: G2,
+    pk_g2: list[G2],
+    pk_gt: GT,
+    v_commits: list[G1],
+    messages: list[list[ZR]],
+    indexes: list[list[int]],
+    coefficients: list[list[ZR]],
+    weights: list[ZR],
+    proof: G1,
+) -> bool:
+    """Check the weighted product of statements against the combined proof ∏ π_s^{r_s}.
+
+    See verify_batch for the equation and how terms are grouped into pairings.
+    """
+    terms = []
+    gt_exponent = 0
+    for v_commit, messages_s, indexes_s, coefficients_s, weight in zip(
+        v_commits, messages, indexes, coefficients, weights
+    ):
+        commit_id = group.serialize(v_commit)
+        for message, i, c_i in zip(messages_s, indexes_s, coefficients_s):
+            terms.append((commit_id, v_commit, i, weight * c_i))
+            gt_exponent += weight * message * c_i
+
+    commit_count = Counter(term[0] for term in terms)
+    index_count = Counter(term[2] for term in terms)
+
+    by_commit = defaultdict(list)
+    by_index = defaultdict(list)
+    for commit_id, v_commit, i, scalar in terms:
+        if commit_count[commit_id] > index_count[i]:
+            by_commit[commit_id].append((v_commit, i, scalar))
+        else:
+            by_index[i].append((v_commit, i, scalar))
+
+    lhs, rhs = [proof**-1], [g2]
+    for group_terms in by_commit.values():
+        lhs.append(group_terms[0][0])
+        rhs.append(
+            multi_exp(
+                [pk_g2[len(pk_g2) - (i + 1)] for _, i, _ in group_terms],
+                [scalar for _, _, scalar in group_terms],
+            )
+        )
+    for i, group_terms in by_index.items():
+        lhs.append(
+            multi_exp(
+                [v_commit for v_commit, _, _ in group_terms],
+                [scalar for _, _, scalar in group_terms],
+            )
+        )
+        rhs.append(pk_g2[len(pk_g2) - (i + 1)])
+
+    return pairing_product(lhs, rhs) == power(pk_gt, gt_exponent)
+
+
 if __name__ == "__main__":
     N = 4
     messages = [group.random(ZR) for _ in range(N)]
@@ -176,3 +545,49 @@ if __name__ == "__main__":
         aggregate_proofs,
     )
     assert check
+
+    assert aggregate_proofs == generate_aggregate_proof(
+        pk.g1, sk.sk, v_commit, [messages[1], messages[3]], [1, 3]
+    )
+
+    messages_2 = [group.random(ZR) for _ in range(N)]
+    v_commit_2 = commit(pk.g1, messages_2, sk.sk)
+    v_commits = [v_commit, v_commit_2]
+    cross_messages = [[messages[1], messages[3]], [messages_2[1], messages_2[3]]]
+    cross_indexes = [[1, 3], [1, 3]]
+
+    cross_proof = aggregate_across_commits(
+        v_commits,
+        cross_messages,
+        cross_indexes,
+        [
+            aggregate_proofs,
+            generate_aggregate_proof(pk.g1, sk.sk, v_commit_2, cross_messages[1], [1, 3]),
+        ],
+    )
+    check = verify_across_commits(
+        pk.g2, pk.pk_g2, pk.pk_gt, v_commits, cross_messages, cross_indexes, cross_proof
+    )
+    assert check
+    assert cross_proof == generate_cross_aggregate_proof(
+        pk.g1, sk.sk, v_commits, cross_messages, cross_indexes
+    )
+
+    assert len(pk.pk_g1) == 2 * N - 1
+    public = PublicProver(pk, N)
+    assert public.commit(messages_2) == v_commit_2
+    openings = [
+        generate_proof(pk.pk_g1, sk.sk, v_commit_2, i, message)
+        for i, message in enumerate(messages_2)
+    ]
+    assert [public.open(messages_2, i) for i in range(N)] == openings
+    assert public.open_all(messages_2) == openings
+    for n in [1, 3, 6]:
+        messages_n = [group.random(ZR) for _ in range(n)]
+        sk_n, pk_n = generate_keys(8)
+        public = PublicProver(pk_n, n)
+        v_commit_n = commit(pk_n.g1, messages_n, sk_n.sk)
+        assert public.open_all(messages_n) == [
+            generate_proof(pk_n.pk_g1, sk_n.sk, v_commit_n, i, m)
+            for i, m in enumerate(messages_n)
+        ]
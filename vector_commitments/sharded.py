@@ -0,0 +1,234 @@
+from charm.toolbox.pairinggroup import ZR, G1
+
+from util.util import group, ProverMode, ScalarBackend
+from util.fixed_base import DEFAULT_WINDOW
+
+from vector_commitments import pointproofs
+from vector_commitments.pointproofs import PK, SK
+
+"""
+Block-sharded PointProofs commitments.
+
+A vector is split into consecutive blocks of block_size positions and every
+block is committed on its own with one shared key of vector length
+block_size, so the public parameters no longer grow with the vector and an
+append only touches the tail block.
+
+- commit/append/update: build and maintain a ShardedCommitment.
+- split: group (index, message) pairs by block, as per-block statements.
+- generate_block_proof: aggregated proof for the positions of one block.
+- generate_proof/verify: one proof for positions spread over any blocks,
+  aggregated across the block commitments (pointproofs.aggregate_across_commits).
+"""
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class ShardedCommitment:
+    """Per-block commitments to a vector of length positions.
+
+    Block b commits to positions [b * block_size, (b + 1) * block_size); the
+    last block may be partial.
+    """
+    def __init__(self, commits: list[G1], block_size: int, length: int):
+        self.commits = commits
+        self.block_size = block_size
+        self.length = length
+
+    def locate(self, index: int) -> tuple[int, int]:
+        """(block, offset in block) of a vector position."""
+        return divmod(index, self.block_size)
+
+
+def generate_keys(
+    block_size: int = DEFAULT_BLOCK_SIZE, window: int = DEFAULT_WINDOW
+) -> tuple[SK, PK]:
+    """PointProofs keys shared by every block."""
+    return pointproofs.generate_keys(N=block_size, window=window)
+
+
+def check_block_size(block_size: int, sk: list[ZR]) -> None:
+    """Reject blocks longer than the key: sk holds the 2N powers of a length-N key.
+
+    A longer block would be committed with alpha^{N+1}.. and never open.
+    """
+    if block_size > len(sk) // 2:
+        raise ValueError(
+            f"block_size {block_size} exceeds the PointProofs key length {len(sk) // 2}"
+        )
+
+
+def commit(
+    g1: G1,
+    messages: list[ZR],
+    sk: list[ZR],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    backend: ScalarBackend = ScalarBackend.ZR,
+) -> ShardedCommitment:
+    """Commit to messages one block at a time."""
+    check_block_size(block_size, sk)
+    commits = [
+        pointproofs.commit(g1, messages[start : start + block_size], sk, backend)
+        for start in range(0, len(messages), block_size)
+    ]
+    return ShardedCommitment(commits, block_size, len(messages))
+
+
+def append(
+    g1: G1, sharded: ShardedCommitment, sk: list[ZR], messages: list[ZR]
+) -> None:
+    """Append messages in place: fill the tail block, then open new blocks."""
+    check_block_size(sharded.block_size, sk)
+    _, offset = sharded.locate(sharded.length)
+    if offset:
+        fill = messages[: sharded.block_size - offset]
+        sharded.commits[-1] = pointproofs.update_commit(
+            g1=g1,
+            v_commit=sharded.commits[-1],
+            sk=sk,
+            idxs=list(range(offset, offset + len(fill))),
+            messages=[group.init(ZR, 0)] * len(fill),
+            new_messages=fill,
+        )
+        sharded.length += len(fill)
+        messages = messages[len(fill) :]
+
+    tail = commit(g1, messages, sk, sharded.block_size)
+    sharded.commits += tail.commits
+    sharded.length += tail.length
+
+
+def update(
+    g1: G1,
+    sharded: ShardedCommitment,
+    sk: list[ZR],
+    idxs: list[int],
+    messages: list[ZR],
+    new_messages: list[ZR],
+) -> None:
+    """Update positions in place, touching only the blocks they fall in."""
+    check_block_size(sharded.block_size, sk)
+    blocks, old_blocks, offsets = split(sharded, messages, idxs)
+    _, new_blocks, _ = split(sharded, new_messages, idxs)
+    for block, old_block, new_block, block_offsets in zip(
+        blocks, old_blocks, new_blocks, offsets
+    ):
+        sharded.commits[block] = pointproofs.update_commit(
+            g1, sharded.commits[block], sk, block_offsets, old_block, new_block
+        )
+
+
+def split(
+    sharded: ShardedCommitment, messages: list[ZR], indexes: list[int]
+) -> tuple[list[int], list[list[ZR]], list[list[int]]]:
+    """Group messages by block: (blocks, per-block messages, per-block offsets)."""
+    groups = {}
+    for message, index in zip(messages, indexes):
+        block, offset = sharded.locate(index)
+        block_messages, block_offsets = groups.setdefault(block, ([], []))
+        block_messages.append(message)
+        block_offsets.append(offset)
+
+    blocks = sorted(groups)
+    return (
+        blocks,
+        [groups[block][0] for block in blocks],
+        [groups[block][1] for block in blocks],
+    )
+
+
+def generate_block_proof(
+    pk: PK,
+    sk: SK,
+    v_commit: G1,
+    messages: list[ZR],
+    offsets: list[int],
+    mode: ProverMode = ProverMode.POINT,
+) -> G1:
+    """Aggregated proof for positions of one block, as prover.prove_correctness builds it."""
+    if mode == ProverMode.PUBLIC:
+        raise ValueError("sharded blocks are proven with the secret key (POINT or SCALAR)")
+    if mode == ProverMode.SCALAR:
+        return pointproofs.generate_aggregate_proof(
+            pk.g1, sk.sk, v_commit, messages, offsets
+        )
+
+    proofs = [
+        pointproofs.generate_proof(pk.pk_g1, sk.sk, v_commit, offset, message)
+        for offset, message in zip(offsets, messages)
+    ]
+    return pointproofs.aggregate_proofs(v_commit, messages, offsets, proofs)
+
+
+def generate_proof(
+    pk: PK,
+    sk: SK,
+    sharded: ShardedCommitment,
+    messages: list[ZR],
+    indexes: list[int],
+    mode: ProverMode = ProverMode.POINT,
+) -> G1:
+    """One proof for messages at indexes, aggregated across the touched blocks."""
+    blocks, block_messages, offsets = split(sharded, messages, indexes)
+    v_commits = [sharded.commits[block] for block in blocks]
+    return pointproofs.aggregate_across_commits(
+        v_commits,
+        block_messages,
+        offsets,
+        [
+            generate_block_proof(pk, sk, v_commit, messages_b, offsets_b, mode)
+            for v_commit, messages_b, offsets_b in zip(v_commits, block_messages, offsets)
+        ],
+    )
+
+
+def verify(
+    pk: PK,
+    sharded: ShardedCommitment,
+    messages: list[ZR],
+    indexes: list[int],
+    proof: G1,
+) -> bool:
+    """Verify a proof produced by generate_proof with one pairing-product check."""
+    blocks, block_messages, offsets = split(sharded, messages, indexes)
+    return pointproofs.verify_across_commits(
+        pk.g2,
+        pk.pk_g2,
+        pk.pk_gt,
+        [sharded.commits[block] for block in blocks],
+        block_messages,
+        offsets,
+        proof,
+    )
+
+
+if __name__ == "__main__":
+    block_size = 4
+    messages = [group.random(ZR) for _ in range(10)]
+
+    sk, pk = generate_keys(block_size)
+    sharded = commit(pk.g1, messages, sk.sk, block_size)
+    assert len(sharded.commits) == 3
+
+    indexes = [1, 3, 6, 9]
+    selected = [messages[i] for i in indexes]
+    for mode in [ProverMode.POINT, ProverMode.SCALAR]:
+        proof = generate_proof(pk, sk, sharded, selected, indexes, mode)
+        assert verify(pk, sharded, selected, indexes, proof)
+    assert not verify(pk, sharded, selected[::-1], indexes, proof)
+
+    appended = [group.random(ZR) for _ in range(7)]
+    append(pk.g1, sharded, sk.sk, appended)
+    messages += appended
+    assert sharded.commits == commit(pk.g1, messages, sk.sk, block_size).commits
+
+    new_messages = [group.random(ZR) for _ in range(2)]
+    update(pk.g1, sharded, sk.sk, [2, 13], [messages[2], messages[13]], new_messages)
+    messages[2], messages[13] = new_messages
+    assert sharded.commits == commit(pk.g1, messages, sk.sk, block_size).commits
+
+    try:
+        commit(pk.g1, messages, sk.sk, block_size + 1)
+        assert False, "a block longer than the key was committed"
+    except ValueError:
+        pass
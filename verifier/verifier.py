@@ -1,12 +1,15 @@
 from charm.toolbox.pairinggroup import ZR, G1
 
-from vector_commitments import pointproofs
+from vector_commitments import pointproofs, sharded
 from set_accumulator import esa
 
 from vector_commitments.pointproofs import PK as VC_PK
 from set_accumulator.esa import PK as ESA_PK
+from inverted_index.inverted_index import CommittedIndex
+from inverted_index.sorted_index import decode_entry
+from vector_commitments.sharded import ShardedCommitment
 
-from util.util import Aggregation
+from util.util import group, Aggregation
 
 """
 Verifier module: checks proofs produced by the prover.
@@ -14,6 +17,7 @@ Verifier module: checks proofs produced by the prover.
 - Value correctness with vector commitments (PointProofs)
 - Aggregation correctness for COUNT/SUM/MIN (ESA)
 - Completeness of answer using the committed inverted index
+- Completeness of range answers using a sorted committed index
 """
 
 def verify_correctness(
@@ -49,6 +53,61 @@ def verify_correctness(
     return True
 
 
+def verify_correctness_cross(
+    vc_pk: VC_PK,
+    vc_cols: list[G1],
+    transposed_answer: list[list[ZR]],
+    answer_indexes: list[int],
+    proof: G1,
+) -> bool:
+    """Verify a single cross-column proof (see prover.prove_correctness_cross).
+
+    All columns are checked by one pairing-product equation.
+    """
+    return pointproofs.verify_across_commits(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commits=vc_cols,
+        messages=transposed_answer,
+        indexes=[answer_indexes] * len(vc_cols),
+        aggregate_proof=proof,
+    )
+
+
+def verify_correctness_sharded(
+    vc_pk: VC_PK,
+    vc_cols: list[ShardedCommitment],
+    transposed_answer: list[list[ZR]],
+    answer_indexes: list[int],
+    proofs,
+    cross: bool = False,
+) -> bool:
+    """Verify proofs of prover.prove_correctness_sharded (per column, or one with cross=True)."""
+    if not cross:
+        return all(
+            sharded.verify(vc_pk, vc, col, answer_indexes, proof)
+            for vc, col, proof in zip(vc_cols, transposed_answer, proofs)
+        )
+
+    v_commits, messages, offsets = [], [], []
+    for vc, col in zip(vc_cols, transposed_answer):
+        blocks, messages_c, offsets_c = sharded.split(vc, col, answer_indexes)
+        v_commits += [vc.commits[block] for block in blocks]
+        messages += messages_c
+        offsets += offsets_c
+
+    return pointproofs.verify_across_commits(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commits=v_commits,
+        messages=messages,
+        indexes=offsets,
+        aggregate_proof=proofs,
+    )
+
+
 def verify_aggr_correctness(
     aggregation: Aggregation,
     esa_pk: ESA_PK,
@@ -90,10 +149,10 @@ def verify_aggr_correctness(
 
 def verify_completeness(
     vc_pk: VC_PK,
-    inverted_index: dict[ZR, list[int]],
-    verified_inverted_index: G1,
+    verified_inverted_index: CommittedIndex,
     answer_inverted_index: dict[ZR, list[int]],
     proofs: dict[ZR, dict[str, object]],
+    batch: bool = False,
 ) -> bool:
     """Verify completeness: every key in the answer is present in the committed inverted index.
 
@@ -102,28 +161,148 @@ def verify_completeness(
     - "acc_hash": ZR hash of the accumulator for the answer's posting list
     - "proofs_1": aggregated proof for the pair [key, acc_hash]
     - "proofs_2": single proof that key appears at its position in verified_inverted_index
+
+    With batch=True all keys are checked at once, see verify_completeness_batch.
     """
-    for key, value in answer_inverted_index.items():
-        check_1 = pointproofs.verify_aggregate_proofs(
-            g2=vc_pk.g2,
-            pk_g2=vc_pk.pk_g2,
-            pk_gt=vc_pk.pk_gt,
-            v_commit=proofs[key]["vc"],
-            messages=[key, proofs[key]["acc_hash"]],
-            indexes=[0, 1],
-            aggregate_proofs=proofs[key]["proofs_1"],
-        )
-        check_2 = pointproofs.verify_proof(
-            g2=vc_pk.g2,
-            pk_g2=vc_pk.pk_g2,
-            pk_gt=vc_pk.pk_gt,
-            v_commit=verified_inverted_index,
-            message=key,
-            index=list(inverted_index.keys()).index(key),
-            proof_i=proofs[key]["proofs_2"],
+    if batch:
+        return not verify_completeness_batch(
+            vc_pk, verified_inverted_index, answer_inverted_index, proofs
         )
 
-        if not (check_1 and check_2):
+    for key in answer_inverted_index:
+        if not _verify_completeness_key(vc_pk, verified_inverted_index, key, proofs[key]):
             return False
 
     return True
+
+
+def verify_completeness_batch(
+    vc_pk: VC_PK,
+    verified_inverted_index: CommittedIndex,
+    answer_inverted_index: dict[ZR, list[int]],
+    proofs: dict[ZR, dict[str, object]],
+) -> list[ZR]:
+    """Batch-verify the completeness proofs of all answer keys.
+
+    Both equations of every key are combined with random weights into one
+    pairing-product check (pointproofs.verify_batch). Only if it fails are the
+    keys checked one by one, to locate the invalid proofs.
+
+    Returns the keys whose proofs do not verify (empty if the answer is complete).
+    """
+    one = group.init(ZR, 1)
+    v_commits, messages, indexes, coefficients, batch_proofs = [], [], [], [], []
+    for key in answer_inverted_index:
+        pair_messages = [key, proofs[key]["acc_hash"]]
+        index_commit, position = verified_inverted_index.locate(key)
+
+        v_commits += [proofs[key]["vc"], index_commit]
+        messages += [pair_messages, [key]]
+        indexes += [[0, 1], [position]]
+        coefficients += [
+            pointproofs.compute_t(proofs[key]["vc"], pair_messages, [0, 1]),
+            [one],
+        ]
+        batch_proofs += [proofs[key]["proofs_1"], proofs[key]["proofs_2"]]
+
+    if not v_commits or pointproofs.verify_batch(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commits=v_commits,
+        messages=messages,
+        indexes=indexes,
+        coefficients=coefficients,
+        proofs=batch_proofs,
+    ):
+        return []
+
+    return [
+        key
+        for key in answer_inverted_index
+        if not _verify_completeness_key(vc_pk, verified_inverted_index, key, proofs[key])
+    ]
+
+
+def _verify_completeness_key(
+    vc_pk: VC_PK,
+    verified_inverted_index: CommittedIndex,
+    key: ZR,
+    proof: dict[str, object],
+) -> bool:
+    """Check both completeness equations for a single answer key."""
+    check_1 = pointproofs.verify_aggregate_proofs(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commit=proof["vc"],
+        messages=[key, proof["acc_hash"]],
+        indexes=[0, 1],
+        aggregate_proofs=proof["proofs_1"],
+    )
+    index_commit, position = verified_inverted_index.locate(key)
+    check_2 = pointproofs.verify_proof(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commit=index_commit,
+        message=key,
+        index=position,
+        proof_i=proof["proofs_2"],
+    )
+
+    return check_1 and check_2
+
+
+def verify_range(
+    vc_pk: VC_PK,
+    commitment: G1 | ShardedCommitment,
+    n_row: int,
+    low: int,
+    high: int,
+    answer_indexes: list[int],
+    proof: dict[str, object],
+) -> bool:
+    """Verify that answer_indexes are exactly the rows with low <= value <= high.
+
+    commitment is the sorted index of the column (inverted_index.sorted_index),
+    possibly a sharded.ShardedCommitment, and n_row its length. proof is prover.prove_range's: the entries at
+    positions [start - 1, stop] opened by one aggregated proof. Entries in
+    [start, stop) must lie in the range and hold the answer rows; the entry
+    before start (if any) must be below low and the one at stop (if any)
+    above high, so no other entry of the sorted vector is in the range.
+    """
+    start, stop, entries = proof["start"], proof["stop"], proof["entries"]
+    if not 0 <= start <= stop <= n_row:
+        return False
+    positions = list(range(max(start - 1, 0), min(stop + 1, n_row)))
+    if len(entries) != len(positions):
+        return False
+
+    rows = []
+    for position, entry in zip(positions, entries):
+        value, row = decode_entry(int(entry))
+        if position < start:
+            valid = low is not None and value < low
+        elif position >= stop:
+            valid = high is not None and value > high
+        else:
+            valid = (low is None or low <= value) and (high is None or value <= high)
+            rows.append(row)
+        if not valid:
+            return False
+
+    if sorted(rows) != sorted(answer_indexes):
+        return False
+
+    if isinstance(commitment, ShardedCommitment):
+        return sharded.verify(vc_pk, commitment, entries, positions, proof["proof"])
+    return pointproofs.verify_aggregate_proofs(
+        g2=vc_pk.g2,
+        pk_g2=vc_pk.pk_g2,
+        pk_gt=vc_pk.pk_gt,
+        v_commit=commitment,
+        messages=entries,
+        indexes=positions,
+        aggregate_proofs=proof["proof"],
+    )